@@ -0,0 +1,349 @@
+"""Benchmark of the teleinfo codec: decoders, encoders and error paths.
+
+``decode``, ``decode_standard``, ``decode_lenient``, ``decode_info_group``, ``encode``
+and ``FrameEncoder`` are run on frames taken from ``captured_frames.bin`` (a Tempo
+meter) and generated for each tariff option (BASE, HC, EJP, Tempo), for long
+Linky-style frames (HT separator, ~60 info groups) and for Linky frames in standard
+mode (horodates, spaces in data, checksum method 2). Each benchmark reports:
+
+* ``ops_per_second``: frames processed per second, best of the runs,
+* ``ns_per_info_group``: time per info group processed,
+* ``peak_bytes_per_frame``/``allocated_blocks_per_frame``: peak memory and number of
+  memory blocks still allocated (the results) after processing the frames, measured
+  with ``tracemalloc`` in a separate run,
+* ``line_rate_ports``: number of meters whose frames one core processes as fast as
+  they are received (at 9600 bauds for Linky frames, 1200 bauds otherwise).
+
+Usage::
+
+    python benchmarks/bench_codec.py --output codec.json
+    python benchmarks/bench_codec.py --filter decode --compare codec.json
+
+Results are written as JSON, and ``--compare`` prints the speedup of each benchmark
+against a previous results file.
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+
+import teleinfo
+from teleinfo.codec import FrameEncoder, decode, decode_info_group, decode_lenient, encode, encode_info_group
+from teleinfo.const import DATA_KEY, ETX_TOKEN, HT_TOKEN, LABEL_KEY, SP_TOKEN, STX_TOKEN
+from teleinfo.exceptions import TeleinfoDecodingError
+from teleinfo.standard import STANDARD_BAUDRATE, StandardInfoGroupCache, decode_standard
+
+
+CAPTURED_FRAMES_PATH = Path(__file__).parents[1] / "captured_frames.bin"
+NUM_OF_SYNTHETIC_FRAMES = 32
+HISTORIC_BAUDRATE = 1200
+# 1 start bit + 7 data bits + 1 parity bit + 1 stop bit
+BITS_PER_CHAR = 10
+
+
+def _historic_info_groups(rng: random.Random, option: str) -> list[tuple[str, str]]:
+    index = rng.randrange(10**8)
+    indexes = {
+        "BASE": ["BASE"],
+        "HC..": ["HCHC", "HCHP"],
+        "EJP.": ["EJPHN", "EJPHPM"],
+        "BBR(": ["BBRHCJB", "BBRHPJB", "BBRHCJW", "BBRHPJW", "BBRHCJR", "BBRHPJR"],
+    }[option]
+    info_groups = [("ADCO", "021861348497"), ("OPTARIF", option), ("ISOUSC", "30")]
+    info_groups += [(label, f"{index + rng.randrange(10**6):09d}") for label in indexes]
+    if option == "EJP.":
+        info_groups.append(("PEJP", "30"))
+    info_groups.append(("PTEC", {"BASE": "TH..", "HC..": "HC..", "EJP.": "HN..", "BBR(": "HPJB"}[option]))
+    if option == "BBR(":
+        info_groups.append(("DEMAIN", "BLEU"))
+    info_groups += [
+        ("IINST", f"{rng.randrange(60):03d}"),
+        ("IMAX", "090"),
+        ("PAPP", f"{rng.randrange(12000):05d}"),
+        ("HHPHC", "A"),
+        ("MOTDETAT", "000000"),
+    ]
+    return info_groups
+
+
+def _linky_info_groups(rng: random.Random) -> list[tuple[str, str]]:
+    # Spaces in data are replaced, decode() rejects info groups mixing SP and HT
+    info_groups = [
+        ("ADSC", "041876097138"),
+        ("VTIC", "02"),
+        ("NGTF", "TEMPO"),
+        ("LTARF", "HP_BLEU"),
+        ("EAST", f"{rng.randrange(10**9):09d}"),
+    ]
+    info_groups += [(f"EASF{index:02d}", f"{rng.randrange(10**9):09d}") for index in range(1, 11)]
+    info_groups += [(f"EASD{index:02d}", f"{rng.randrange(10**9):09d}") for index in range(1, 5)]
+    info_groups += [("IRMS1", f"{rng.randrange(60):03d}"), ("URMS1", f"{rng.randrange(220, 245):03d}")]
+    info_groups += [("PREF", "09"), ("PCOUP", "09"), ("SINSTS", f"{rng.randrange(12000):05d}")]
+    info_groups += [(f"SMAXSN{suffix}", f"{rng.randrange(12000):05d}") for suffix in ("", "-1")]
+    info_groups += [(f"CCASN{suffix}", f"{rng.randrange(12000):05d}") for suffix in ("", "-1")]
+    info_groups += [(f"UMOY{index}", f"{rng.randrange(220, 245):03d}") for index in range(1, 4)]
+    info_groups += [("STGE", "003A4401"), ("MSG1", "PAS_DE_MESSAGE"), ("PRM", "21459367218479")]
+    info_groups += [("RELAIS", "000"), ("NTARF", "02"), ("NJOURF", "00"), ("NJOURF+1", "00")]
+    info_groups += [(f"PJOURF{day}", "00004001_06004002_22004001") for day in ("+1", "+2")]
+    info_groups += [(f"DPM{index}", "00") for index in range(1, 4)]
+    info_groups += [(f"FPM{index}", "00") for index in range(1, 4)]
+    info_groups += [(f"EAIT{index}", f"{rng.randrange(10**9):09d}") for index in range(1, 3)]
+    info_groups += [(f"ERQ{index}", f"{rng.randrange(10**9):09d}") for index in range(1, 5)]
+    info_groups += [(f"SINSTS{index}", f"{rng.randrange(12000):05d}") for index in range(1, 4)]
+    info_groups += [(f"SMAXSN{index}", f"{rng.randrange(12000):05d}") for index in range(1, 4)]
+    return info_groups
+
+
+def _standard_info_groups(rng: random.Random) -> list[tuple[str, str | None, str]]:
+    # Linky in standard mode: horodates, spaces in data and checksum method 2
+    horodate = f"H2401{rng.randrange(1, 29):02d}{rng.randrange(24):02d}{rng.randrange(60):02d}{rng.randrange(60):02d}"
+    info_groups = [(label, None, data.replace("_", " ")) for label, data in _linky_info_groups(rng)]
+    info_groups.insert(1, ("DATE", horodate, ""))
+    info_groups += [(f"SMAXSN{suffix}", horodate, f"{rng.randrange(12000):05d}") for suffix in ("1", "2", "3")]
+    info_groups += [(f"CCASN{suffix}", horodate, f"{rng.randrange(12000):05d}") for suffix in ("", "-1")]
+    info_groups += [(f"UMOY{index}", horodate, f"{rng.randrange(220, 245):03d}") for index in range(1, 4)]
+    return info_groups
+
+
+def _encode_frame(info_groups: list[tuple[str, str]], sep: str) -> bytes:
+    encoded_info_groups = [encode_info_group(label, data, sep) for label, data in info_groups]
+    if sep == HT_TOKEN:
+        # decode() sees a SP checksum as a separator mixed with HT: skip these info groups
+        encoded_info_groups = [info_group for info_group in encoded_info_groups if info_group[-2] != SP_TOKEN]
+    encoded_info_groups = "".join(encoded_info_groups)
+    return f"{STX_TOKEN}{encoded_info_groups}{ETX_TOKEN}".encode()
+
+
+def _encode_standard_frame(encoder: FrameEncoder, info_groups: list[tuple[str, str | None, str]]) -> bytes:
+    return encoder.encode(
+        (label, data if horodate is None else f"{horodate}{HT_TOKEN}{data}") for label, horodate, data in info_groups
+    )
+
+
+def load_datasets() -> dict[str, list[bytes]]:
+    """Return the frames of each dataset, by name."""
+    rng = random.Random(20190101)
+    data = CAPTURED_FRAMES_PATH.read_bytes()
+    datasets = {"captured": [frame + ETX_TOKEN.encode() for frame in data.split(ETX_TOKEN.encode())[:-1]]}
+    for name, option in (("base", "BASE"), ("hc", "HC.."), ("ejp", "EJP."), ("tempo", "BBR(")):
+        datasets[name] = [
+            _encode_frame(_historic_info_groups(rng, option), SP_TOKEN) for _ in range(NUM_OF_SYNTHETIC_FRAMES)
+        ]
+    datasets["linky"] = [_encode_frame(_linky_info_groups(rng), HT_TOKEN) for _ in range(NUM_OF_SYNTHETIC_FRAMES)]
+    encoder = FrameEncoder(HT_TOKEN)
+    datasets["linky_standard"] = [
+        _encode_standard_frame(encoder, _standard_info_groups(rng)) for _ in range(NUM_OF_SYNTHETIC_FRAMES)
+    ]
+    return datasets
+
+
+def _corrupt_checksums(frames: list[bytes]) -> list[bytes]:
+    # Replace the checksum of the last info group with a character that never matches
+    return [frame[:-3] + (b"~" if frame[-3:-2] != b"~" else b"}") + frame[-2:] for frame in frames]
+
+
+def _decode_errors(frames: list[bytes]) -> int:
+    errors = 0
+    for frame in frames:
+        try:
+            decode(frame)
+        except TeleinfoDecodingError:
+            errors += 1
+    return errors
+
+
+def build_benchmarks(datasets: dict[str, list[bytes]]) -> dict[str, tuple[Callable[[], object], int, int]]:
+    """Return, by name, the function to time and the number of frames and info groups it processes."""
+    benchmarks = {}
+    standard_frames = datasets["linky_standard"]
+    num_of_info_groups = sum(frame.count(b"\r") for frame in standard_frames)
+    benchmarks["decode_standard/linky_standard"] = (
+        lambda: [decode_standard(frame) for frame in standard_frames],
+        len(standard_frames),
+        num_of_info_groups,
+    )
+    cache = StandardInfoGroupCache(maxsize=4096)
+    benchmarks["decode_standard_cached/linky_standard"] = (
+        lambda: [decode_standard(frame, cache=cache) for frame in standard_frames],
+        len(standard_frames),
+        num_of_info_groups,
+    )
+
+    for name, frames in datasets.items():
+        if name == "linky_standard":
+            # Standard frames (data with spaces, horodates) are only decoded by decode_standard()
+            continue
+        num_of_info_groups = sum(frame.count(b"\r") for frame in frames)
+        benchmarks[f"decode/{name}"] = (
+            lambda frames=frames: [decode(frame) for frame in frames],
+            len(frames),
+            num_of_info_groups,
+        )
+        json_frames = [
+            [{LABEL_KEY: label, DATA_KEY: data} for label, data in decode(frame).items()] for frame in frames
+        ]
+        benchmarks[f"encode/{name}"] = (
+            lambda json_frames=json_frames: [encode(json_frame) for json_frame in json_frames],
+            len(frames),
+            num_of_info_groups,
+        )
+        encoder = FrameEncoder(HT_TOKEN if name == "linky" else SP_TOKEN, checksum_method=1)
+        decoded_frames = [decode(frame) for frame in frames]
+        buffer = bytearray(sum(len(frame) for frame in frames))
+        benchmarks[f"frame_encoder/{name}"] = (
+            lambda encoder=encoder, decoded_frames=decoded_frames, buffer=buffer: encoder.encode_many(
+                decoded_frames, buffer
+            ),
+            len(frames),
+            num_of_info_groups,
+        )
+
+    captured = datasets["captured"]
+    info_groups = [f"\n{info_group}\r" for frame in captured for info_group in frame.decode()[2:-2].split("\r\n")]
+    benchmarks["decode_info_group/captured"] = (
+        lambda: [decode_info_group(info_group) for info_group in info_groups],
+        len(captured),
+        len(info_groups),
+    )
+    corrupted = _corrupt_checksums(captured)
+    benchmarks["decode_checksum_error/captured"] = (
+        lambda: _decode_errors(corrupted),
+        len(captured),
+        len(info_groups),
+    )
+    benchmarks["decode_lenient/captured"] = (
+        lambda: [decode_lenient(frame) for frame in captured],
+        len(captured),
+        len(info_groups),
+    )
+    benchmarks["decode_lenient_checksum_error/captured"] = (
+        lambda: [decode_lenient(frame) for frame in corrupted],
+        len(captured),
+        len(info_groups),
+    )
+    malformed = [frame[:-1] for frame in captured]
+    benchmarks["decode_format_error/captured"] = (
+        lambda: _decode_errors(malformed),
+        len(captured),
+        len(info_groups),
+    )
+    return benchmarks
+
+
+def _time(function: Callable[[], object], repeat: int, min_time: float) -> float:
+    """Return the best time of one call of ``function``, each run lasting at least ``min_time``."""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number *= 2
+    best = elapsed / number
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def _allocations(function: Callable[[], object]) -> tuple[int, int]:
+    """Return the peak memory (bytes) and number of blocks allocated by one call of ``function``."""
+    function()  # warm up caches
+    tracemalloc.start()
+    try:
+        blocks_before = sum(stat.count for stat in tracemalloc.take_snapshot().statistics("filename"))
+        result = function()
+        _, peak = tracemalloc.get_traced_memory()
+        blocks_after = sum(stat.count for stat in tracemalloc.take_snapshot().statistics("filename"))
+    finally:
+        tracemalloc.stop()
+    del result
+    return peak, blocks_after - blocks_before
+
+
+def _line_rate_ports(frames: list[bytes], dataset: str, ops_per_second: float) -> float:
+    """Return the number of meters whose frames are processed by one core as fast as they are received."""
+    baudrate = STANDARD_BAUDRATE if dataset.startswith("linky") else HISTORIC_BAUDRATE
+    frames_per_second = baudrate / BITS_PER_CHAR / (sum(len(frame) for frame in frames) / len(frames))
+    return ops_per_second / frames_per_second
+
+
+def run(name_filter: str | None, repeat: int, min_time: float) -> list[dict]:
+    results = []
+    datasets = load_datasets()
+    for name, (function, num_of_frames, num_of_info_groups) in build_benchmarks(datasets).items():
+        if name_filter and name_filter not in name:
+            continue
+        elapsed = _time(function, repeat, min_time)
+        peak, blocks = _allocations(function)
+        dataset = name.partition("/")[2]
+        results.append(
+            {
+                "name": name,
+                "frames": num_of_frames,
+                "info_groups": num_of_info_groups,
+                "ops_per_second": round(num_of_frames / elapsed, 1),
+                "ns_per_info_group": round(1e9 * elapsed / num_of_info_groups, 1),
+                "peak_bytes_per_frame": round(peak / num_of_frames),
+                "allocated_blocks_per_frame": round(blocks / num_of_frames, 1),
+                "line_rate_ports": round(_line_rate_ports(datasets[dataset], dataset, num_of_frames / elapsed)),
+            }
+        )
+        print(
+            f"{name:<40} {results[-1]['ops_per_second']:>12,.0f} frames/s"
+            f" {results[-1]['ns_per_info_group']:>10,.1f} ns/group"
+            f" {results[-1]['peak_bytes_per_frame']:>8,} B/frame"
+            f" {results[-1]['line_rate_ports']:>8,} ports",
+            file=sys.stderr,
+        )
+    return results
+
+
+def compare(results: list[dict], baseline_path: Path) -> None:
+    baseline = {result["name"]: result for result in json.loads(baseline_path.read_text())["results"]}
+    print(f"\nSpeedup against {baseline_path}:", file=sys.stderr)
+    for result in results:
+        if result["name"] in baseline:
+            speedup = result["ops_per_second"] / baseline[result["name"]]["ops_per_second"]
+            print(f"{result['name']:<40} x{speedup:.2f}", file=sys.stderr)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--filter", help="only run the benchmarks whose name contains this string")
+    parser.add_argument("--repeat", type=int, default=5, help="number of timed runs, the best one is kept")
+    parser.add_argument("--min-time", type=float, default=0.2, help="min duration of a timed run in seconds")
+    parser.add_argument("--output", type=Path, help="JSON file to write the results to")
+    parser.add_argument("--compare", type=Path, help="JSON results file of a previous run to compare with")
+    args = parser.parse_args()
+
+    results = run(args.filter, args.repeat, args.min_time)
+    report = {
+        "benchmark": "codec",
+        "pyteleinfo_version": teleinfo.__version__,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+    if args.compare:
+        compare(results, args.compare)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+    else:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
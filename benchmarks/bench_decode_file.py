@@ -0,0 +1,84 @@
+"""Benchmark of the parallel decoding of a capture file, against a sequential decode.
+
+A capture file of frames generated by :class:`~teleinfo.simulator.SimulatedMeter` is
+decoded to NDJSON by :func:`~teleinfo.parallel.decode_file` with an increasing number of
+worker processes, and by a single loop over :class:`~teleinfo.replay.CaptureReader`.
+The speedup is bounded by the number of CPUs of the machine.
+
+Usage::
+
+    python benchmarks/bench_decode_file.py --frames 200000 --workers 1 2 4 --output decode_file.json
+"""
+
+import argparse
+import io
+import json
+import os
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from teleinfo.codec import InfoGroupCache, decode
+from teleinfo.labels import TariffOption
+from teleinfo.parallel import DEFAULT_SHARD_SIZE, decode_file
+from teleinfo.replay import CaptureReader
+from teleinfo.simulator import SimulatedMeter
+
+
+def decode_sequentially(path: Path) -> int:
+    cache = InfoGroupCache()
+    output = io.BytesIO()
+    with CaptureReader(path) as capture:
+        for frame in capture:
+            output.write(f"{json.dumps(decode(frame, cache=cache))}\n".encode())
+            frame.release()
+    return len(output.getvalue())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=200_000, help="number of frames of the capture file")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="numbers of processes to run")
+    parser.add_argument("--shard_size", type=int, default=DEFAULT_SHARD_SIZE, help="size of the shards, in bytes")
+    parser.add_argument("--output", type=Path, help="JSON file to write the results to")
+    args = parser.parse_args()
+
+    meter = SimulatedMeter(TariffOption.OFF_PEAK, seed=1, start=datetime(2024, 1, 1))
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "capture.bin"
+        with open(path, "wb") as capture:
+            for _ in range(args.frames):
+                capture.write(meter.next_frame())
+        size = path.stat().st_size
+
+        start = time.perf_counter()
+        decode_sequentially(path)
+        sequential_time = time.perf_counter() - start
+        runs = []
+        for workers in args.workers:
+            stats = decode_file(path, io.BytesIO(), shard_size=args.shard_size, workers=workers)
+            runs.append(
+                {
+                    "workers": workers,
+                    "frames_per_second": round(stats.frames / stats.elapsed),
+                    "megabytes_per_second": round(size / 1e6 / stats.elapsed, 1),
+                    "speedup": round(sequential_time / stats.elapsed, 2),
+                }
+            )
+
+    results = {
+        "benchmark": "decode_file",
+        "cpus": os.cpu_count(),
+        "frames": args.frames,
+        "megabytes": round(size / 1e6, 1),
+        "sequential_frames_per_second": round(args.frames / sequential_time),
+        "results": runs,
+    }
+    print(json.dumps(results, indent=2))
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""Benchmark of TeleinfoMultiStream reading many serial ports on a single event loop.
+
+Pseudo-terminal pairs stand in for serial ports (Linux only): a child process writes
+the frames of ``captured_frames.bin`` (historic mode, 1200 bauds by default) or Linky
+frames in standard mode (9600 bauds by default) on the master side of each pair at
+the line rate (optionally accelerated), while this process reads all the slave sides
+with one :class:`~teleinfo.stream.TeleinfoMultiStream`, and decodes each frame with
+``--decode``. With ``--metrics``, frames are reported to a
+:class:`~teleinfo.metrics.TeleinfoMetrics` hook, to measure the cost of the metrics.
+
+Usage::
+
+    python benchmarks/bench_multiport.py --ports 100 --duration 20 --output multiport.json
+    python benchmarks/bench_multiport.py --mode standard --decode --ports 200
+    python benchmarks/bench_multiport.py --decode --metrics --speedup 10
+
+Pseudo-terminals do not support 7 bits/even parity, so ports are read in 8N1.
+"""
+
+import argparse
+import asyncio
+import functools
+import json
+import multiprocessing
+import os
+import time
+import tty
+from pathlib import Path
+
+import serial
+from bench_codec import load_datasets
+
+from teleinfo import metrics
+from teleinfo.codec import InfoGroupCache, decode
+from teleinfo.settings import MODE_BAUDRATES, TeleinfoSettings
+from teleinfo.standard import StandardInfoGroupCache, decode_standard
+from teleinfo.stream import TeleinfoMultiStream
+
+
+CAPTURED_FRAMES_PATH = Path(__file__).parents[1] / "captured_frames.bin"
+# 1 start bit + 7 data bits + 1 parity bit + 1 stop bit
+BITS_PER_CHAR = 10
+STARTUP_DELAY = 1.0
+
+
+def _write_frames(master_fds: list[int], frames: list[bytes], chars_per_second: float, duration: float, sent):
+    async def write_port(master_fd: int, offset: int) -> int:
+        os.set_blocking(master_fd, False)
+        count = 0
+        start = time.monotonic()
+        while time.monotonic() - start < duration:
+            frame = frames[(count + offset) % len(frames)]
+            try:
+                os.write(master_fd, frame)
+                count += 1
+            except BlockingIOError:
+                pass
+            await asyncio.sleep(len(frame) / chars_per_second)
+        return count
+
+    async def write_all() -> list[int]:
+        # Leave time to the reader to open all the ports: opening flushes their input
+        await asyncio.sleep(STARTUP_DELAY)
+        return await asyncio.gather(*(write_port(fd, index) for index, fd in enumerate(master_fds)))
+
+    sent.value = sum(asyncio.run(write_all()))
+
+
+async def _read_ports(
+    ports: list[str], settings: TeleinfoSettings, duration: float, decode_frames: bool, with_metrics: bool
+) -> tuple[dict, int]:
+    received = dict.fromkeys(ports, 0)
+    if settings.mode == "standard":
+        caches = {port: StandardInfoGroupCache() for port in ports}
+        decode_frame = decode_standard
+    else:
+        caches = {port: InfoGroupCache() for port in ports}
+        decode_frame = decode
+    async with TeleinfoMultiStream(ports, settings) as streams:
+        try:
+            async with asyncio.timeout(duration):
+                async for port, frame in streams:
+                    if decode_frames and with_metrics:
+                        metrics.observe_decode(port, functools.partial(decode_frame, cache=caches[port]), frame)
+                    elif decode_frames:
+                        decode_frame(frame, cache=caches[port])
+                    received[port] += 1
+        except TimeoutError:
+            pass
+    return received, len(streams.errors)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ports", type=int, default=100, help="number of pseudo-terminal pairs")
+    parser.add_argument("--duration", type=float, default=10.0, help="duration of the run in seconds")
+    parser.add_argument("--mode", choices=sorted(MODE_BAUDRATES), default="historic", help="teleinfo mode")
+    parser.add_argument("--baudrate", type=int, help="simulated line rate, defaults to the rate of the mode")
+    parser.add_argument("--decode", action="store_true", help="decode the frames received")
+    parser.add_argument("--metrics", action="store_true", help="collect the metrics of the ports")
+    parser.add_argument("--speedup", type=float, default=1.0, help="multiple of the line rate to write at")
+    parser.add_argument("--output", type=Path, help="JSON file to write the results to")
+    args = parser.parse_args()
+    if args.baudrate is None:
+        args.baudrate = MODE_BAUDRATES[args.mode]
+
+    if args.mode == "standard":
+        frames = load_datasets()["linky_standard"]
+    else:
+        data = CAPTURED_FRAMES_PATH.read_bytes()
+        frames = [frame + b"\x03" for frame in data.split(b"\x03")[:-1]]
+    pairs = [os.openpty() for _ in range(args.ports)]
+    for _, slave_fd in pairs:
+        tty.setraw(slave_fd)
+    ports = [os.ttyname(slave_fd) for _, slave_fd in pairs]
+    settings = TeleinfoSettings(
+        mode=args.mode,
+        baudrate=args.baudrate,
+        bytesize=serial.EIGHTBITS,
+        parity=serial.PARITY_NONE,
+        rtscts=0,
+        timeout=max(5.0, 10 * len(max(frames, key=len)) * BITS_PER_CHAR / args.baudrate),
+    )
+
+    sent = multiprocessing.Value("q", 0)
+    writer = multiprocessing.Process(
+        target=_write_frames,
+        args=([master_fd for master_fd, _ in pairs], frames, args.speedup * args.baudrate / BITS_PER_CHAR),
+        kwargs={"duration": args.duration, "sent": sent},
+    )
+    writer.start()
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    if args.metrics:
+        metrics.add_hook(metrics.TeleinfoMetrics())
+    received, errors = asyncio.run(
+        _read_ports(ports, settings, args.duration + STARTUP_DELAY + 1.0, args.decode, args.metrics)
+    )
+    wall, cpu = time.perf_counter() - wall_start, time.process_time() - cpu_start
+    writer.join()
+
+    total_received = sum(received.values())
+    results = {
+        "benchmark": "multiport",
+        "ports": args.ports,
+        "mode": args.mode,
+        "baudrate": args.baudrate,
+        "decode": args.decode,
+        "metrics": args.metrics,
+        "speedup": args.speedup,
+        "duration_s": round(wall, 3),
+        "frames_sent": sent.value,
+        "frames_received": total_received,
+        "frames_lost_ratio": round(1 - total_received / sent.value, 4) if sent.value else None,
+        "ports_without_frames": sum(1 for count in received.values() if not count),
+        "port_errors": errors,
+        "frames_per_second": round(total_received / wall, 1),
+        "reader_cpu_percent": round(100 * cpu / wall, 1),
+        "reader_cpu_us_per_frame": round(1e6 * cpu / total_received, 1) if total_received else None,
+    }
+    print(json.dumps(results, indent=2))
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Benchmark of the columnar recorder: size on disk, append and read-back throughput.
+
+Frames are generated by :class:`~teleinfo.simulator.SimulatedMeter` for each tariff
+option, decoded, and appended to a :class:`~teleinfo.recorder.FrameRecorder`. The size
+of the recording is compared with the JSON lines printed by the ``port`` command.
+
+Usage::
+
+    python benchmarks/bench_recorder.py --frames 100000 --output recorder.json
+"""
+
+import argparse
+import json
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from teleinfo.codec import decode
+from teleinfo.labels import TariffOption
+from teleinfo.recorder import FrameRecorder, Recording
+from teleinfo.simulator import SimulatedMeter
+
+
+def run(option: TariffOption, num_of_frames: int) -> dict:
+    meter = SimulatedMeter(option, seed=1, start=datetime(2024, 1, 1))
+    frames = [decode(meter.next_frame()) for _ in range(num_of_frames)]
+    json_size = sum(len(json.dumps(frame)) + 1 for frame in frames)
+
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        with FrameRecorder(directory) as recorder:
+            for index, frame in enumerate(frames):
+                recorder.append(frame, timestamp=1.7e9 + index)
+        append_time = time.perf_counter() - start
+        size = sum(path.stat().st_size for path in Path(directory).iterdir())
+
+        with Recording(directory) as recording:
+            start = time.perf_counter()
+            recording.column("PAPP")
+            column_time = time.perf_counter() - start
+            start = time.perf_counter()
+            for _ in recording.frames():
+                pass
+            frames_time = time.perf_counter() - start
+
+    return {
+        "option": option.name,
+        "frames": num_of_frames,
+        "bytes_per_frame": round(size / num_of_frames, 1),
+        "json_bytes_per_frame": round(json_size / num_of_frames, 1),
+        "append_frames_per_second": round(num_of_frames / append_time),
+        "read_frames_per_second": round(num_of_frames / frames_time),
+        "read_column_values_per_second": round(num_of_frames / column_time),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=100_000, help="number of frames recorded per tariff option")
+    parser.add_argument("--output", type=Path, help="JSON file to write the results to")
+    args = parser.parse_args()
+
+    results = {"benchmark": "recorder", "results": [run(option, args.frames) for option in TariffOption]}
+    print(json.dumps(results, indent=2))
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
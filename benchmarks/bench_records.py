@@ -0,0 +1,75 @@
+"""Benchmark of the memory used by retained decoded frames, and of their decoding time.
+
+Frames generated by :class:`~teleinfo.simulator.SimulatedMeter` for each tariff
+option are decoded and kept in a list, as dicts (:func:`~teleinfo.codec.decode`, with
+and without :class:`~teleinfo.codec.InfoGroupCache`, and
+:func:`~teleinfo.labels.decode_typed`) or as records
+(:func:`~teleinfo.records.decode_record`). The memory allocated by the list and its
+frames is measured with :mod:`tracemalloc`.
+
+Usage::
+
+    python benchmarks/bench_records.py --frames 10000 --output records.json
+"""
+
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+from teleinfo.codec import InfoGroupCache, decode
+from teleinfo.labels import TariffOption, decode_typed
+from teleinfo.records import decode_record
+from teleinfo.simulator import SimulatedMeter
+
+
+DECODERS = {
+    "decode": lambda frame, cache: decode(frame),
+    "decode with cache": decode,
+    "decode_typed": lambda frame, cache: decode_typed(frame),
+    "decode_record": lambda frame, cache: decode_record(frame),
+    "decode_record with cache": decode_record,
+}
+
+
+def measure(frames: list[bytes], decoder) -> tuple[float, float]:
+    """Bytes allocated per retained frame, and decoding time per frame in microseconds."""
+    cache = InfoGroupCache()
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    retained = [decoder(frame, cache) for frame in frames]
+    elapsed = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del retained
+    return size / len(frames), elapsed / len(frames) * 1e6
+
+
+def run(option: TariffOption, num_of_frames: int) -> dict:
+    meter = SimulatedMeter(option, seed=1, start=datetime(2024, 1, 1))
+    frames = [meter.next_frame() for _ in range(num_of_frames)]
+    results = {"option": option.name, "frames": num_of_frames}
+    for name, decoder in DECODERS.items():
+        bytes_per_frame, microseconds_per_frame = measure(frames, decoder)
+        results[name] = {"bytes_per_frame": round(bytes_per_frame), "decode_us": round(microseconds_per_frame, 1)}
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=10_000, help="number of frames retained per tariff option")
+    parser.add_argument("--output", type=Path, help="JSON file to write the results to")
+    args = parser.parse_args()
+
+    results = {"benchmark": "records", "results": [run(option, args.frames) for option in TariffOption]}
+    print(json.dumps(results, indent=2))
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
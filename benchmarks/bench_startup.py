@@ -0,0 +1,105 @@
+"""Benchmark of the import and startup time of the package and of the command line.
+
+Each scenario runs in a fresh interpreter with ``python -X importtime``, several times,
+and reports the median wall time of the process, the median time spent importing
+modules (excluding the interpreter startup), the slowest top-level imports, and which
+of the heavy optional modules (pyserial, pydantic-settings...) were loaded.
+
+Usage::
+
+    python benchmarks/bench_startup.py --repeat 20 --output startup.json
+
+Module bytecode should be cached (no ``PYTHONDONTWRITEBYTECODE``), as in an installed
+package, for the timings to be representative.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+
+SCENARIOS = {
+    "import teleinfo": ["-c", "import teleinfo"],
+    "from teleinfo import decode": ["-c", "from teleinfo import decode"],
+    "from teleinfo import TeleinfoStream": ["-c", "from teleinfo import TeleinfoStream"],
+    "teleinfo --help": ["-m", "teleinfo", "--help"],
+    "teleinfo port --help": ["-m", "teleinfo", "port", "--help"],
+}
+HEAVY_MODULES = ["serial", "serial_asyncio", "serial.tools.list_ports", "pydantic", "pydantic_settings", "numpy"]
+
+
+def parse_importtime(stderr: str) -> list[tuple[int, int, str]]:
+    """``(depth, cumulative microseconds, module)`` of each import reported by ``-X importtime``."""
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        imports.append((depth, int(cumulative), name.strip()))
+    return imports
+
+
+def run_once(arguments: list[str], startup_modules: set[str]) -> dict:
+    start = time.perf_counter()
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", *arguments], capture_output=True, text=True, check=False
+    )
+    wall_time = time.perf_counter() - start
+    top_level = [
+        (cumulative, name)
+        for depth, cumulative, name in parse_importtime(process.stderr)
+        if depth == 0 and name not in startup_modules
+    ]
+    return {
+        "wall_time": wall_time,
+        "import_time": sum(cumulative for cumulative, _ in top_level) / 1e6,
+        "top_level": top_level,
+        "modules": {name for _, _, name in parse_importtime(process.stderr)},
+    }
+
+
+def run(name: str, arguments: list[str], repeat: int, startup_modules: set[str]) -> dict:
+    runs = [run_once(arguments, startup_modules) for _ in range(repeat)]
+    slowest = sorted(runs[-1]["top_level"], reverse=True)[:5]
+    return {
+        "scenario": name,
+        "runs": repeat,
+        "wall_time_ms": round(statistics.median(result["wall_time"] for result in runs) * 1e3, 1),
+        "import_time_ms": round(statistics.median(result["import_time"] for result in runs) * 1e3, 1),
+        "slowest_imports_ms": {module: round(cumulative / 1e3, 1) for cumulative, module in slowest},
+        "heavy_modules": [module for module in HEAVY_MODULES if module in runs[-1]["modules"]],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10, help="number of runs of each scenario")
+    parser.add_argument("--output", type=Path, help="JSON file to write the results to")
+    args = parser.parse_args()
+
+    if os.environ.get("PYTHONDONTWRITEBYTECODE"):
+        print("Warning: PYTHONDONTWRITEBYTECODE is set, modules are compiled at each run", file=sys.stderr)
+    # Modules imported by the interpreter itself, before running the scenario
+    startup_modules = run_once(["-c", "pass"], set())["modules"]
+    for arguments in SCENARIOS.values():
+        # Cache the bytecode of the modules
+        subprocess.run([sys.executable, *arguments], capture_output=True, check=False)
+
+    results = {
+        "benchmark": "startup",
+        "python": sys.version.split()[0],
+        "results": [run(name, arguments, args.repeat, startup_modules) for name, arguments in SCENARIOS.items()],
+    }
+    print(json.dumps(results, indent=2))
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,73 @@
 """Top-level module for pyteleinfo.
 
-This module import the version of the package
+This module import the version of the package. The rest of its API is imported on
+first access, so that decoding does not load pyserial and pydantic-settings, and the
+command line does not load the decoders it does not use.
 
 """
 
+import importlib
+
 from .__version__ import __version__  # noqa
-from .codec import decode  # noqa
-from .exceptions import (  # noqa
-    BaseFormatError,
-    ChecksumError,
-    FrameFormatError,
-    InfoGroupFormatError,
-    TeleinfoDecodingError,
-    TeleinfoError,
-)
-from .serial_reader import read_frame  # noqa
+
+
+# typing.TYPE_CHECKING, recognized by type checkers, without importing typing
+TYPE_CHECKING = False
+
+if TYPE_CHECKING:
+    from .codec import DecodeErrorCode, DecodeResult, decode, decode_lenient  # noqa
+    from .exceptions import (  # noqa
+        BaseFormatError,
+        ChecksumError,
+        FrameFormatError,
+        InfoGroupFormatError,
+        LabelValueError,
+        TeleinfoDecodingError,
+        TeleinfoError,
+    )
+    from .frame import TeleinfoFrame  # noqa
+    from .framing import FrameParser  # noqa
+    from .labels import decode_typed  # noqa
+    from .records import decode_record  # noqa
+    from .serial_reader import BackgroundReader, TeleinfoReader, read_frame  # noqa
+    from .standard import decode_standard  # noqa
+    from .stream import TeleinfoMultiStream, TeleinfoStream  # noqa
+
+# Module of each attribute imported on first access
+_LAZY_ATTRIBUTES = {
+    "DecodeErrorCode": ".codec",
+    "DecodeResult": ".codec",
+    "decode": ".codec",
+    "decode_lenient": ".codec",
+    "BaseFormatError": ".exceptions",
+    "ChecksumError": ".exceptions",
+    "FrameFormatError": ".exceptions",
+    "InfoGroupFormatError": ".exceptions",
+    "LabelValueError": ".exceptions",
+    "TeleinfoDecodingError": ".exceptions",
+    "TeleinfoError": ".exceptions",
+    "TeleinfoFrame": ".frame",
+    "FrameParser": ".framing",
+    "decode_typed": ".labels",
+    "decode_record": ".records",
+    "BackgroundReader": ".serial_reader",
+    "TeleinfoReader": ".serial_reader",
+    "read_frame": ".serial_reader",
+    "decode_standard": ".standard",
+    "TeleinfoMultiStream": ".stream",
+    "TeleinfoStream": ".stream",
+}
+
+__all__ = ["__version__", *_LAZY_ATTRIBUTES]
+
+
+def __getattr__(name: str):
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted({*globals(), *_LAZY_ATTRIBUTES})
@@ -0,0 +1,290 @@
+"""Rolling statistics of the instantaneous values of decoded frames.
+
+Meters send about one frame per second. :class:`WindowAggregator` downsamples them to
+one :class:`WindowSummary` per window of ``window`` seconds, with the min, max, mean
+and percentiles of the instantaneous values (apparent power and currents by default).
+Each frame is folded in constant time and memory: percentiles are estimated with the P²
+algorithm (:class:`P2Quantile`), which keeps 5 markers per percentile instead of the
+values of the window.
+
+.. code-block:: python
+
+    aggregator = WindowAggregator(window=60)
+    for timestamp, frame in frames:
+        summary = aggregator.add(frame, timestamp)
+        if summary is not None:
+            publish(summary.to_dict())
+    publish(aggregator.flush().to_dict())
+
+Windows are aligned on multiples of ``window`` seconds since the epoch, so that the
+summaries of several meters line up.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from typing import Any, NamedTuple
+
+
+#: Labels aggregated by default: apparent power, current and max current (historic mode).
+DEFAULT_LABELS = ("PAPP", "IINST", "IMAX")
+#: Equivalent labels of standard mode frames: apparent power, current of phase 1, and
+#: max apparent power of the day.
+STANDARD_LABELS = ("SINSTS", "IRMS1", "SMAXSN")
+#: Percentiles estimated by default.
+DEFAULT_PERCENTILES = (0.5, 0.95)
+
+
+class P2Quantile:
+    """Streaming estimate of a quantile, in constant memory (P² algorithm).
+
+    Five markers track the min, the max, the quantile and two intermediate quantiles.
+    Their heights are adjusted with a piecewise-parabolic interpolation as values are
+    added (R. Jain and I. Chlamtac, "The P² algorithm for dynamic calculation of
+    quantiles and histograms without storing observations", 1985). The first five
+    values are kept as is, and the quantile is exact until then.
+    """
+
+    __slots__ = ("quantile", "_heights", "_positions", "_desired", "_increments")
+
+    def __init__(self, quantile: float) -> None:
+        if not 0 < quantile < 1:
+            raise ValueError(f"quantile should be between 0 and 1, not {quantile}")
+        self.quantile = quantile
+        self._heights: list[float] = []
+        self._positions = [1, 2, 3, 4, 5]
+        self._desired = [1, 1 + 2 * quantile, 1 + 4 * quantile, 3 + 2 * quantile, 5]
+        self._increments = [0, quantile / 2, quantile, (1 + quantile) / 2, 1]
+
+    def add(self, value: float) -> None:
+        """Add a value to the estimate."""
+        heights = self._heights
+        if len(heights) < 5:
+            heights.append(value)
+            if len(heights) == 5:
+                heights.sort()
+            return
+        cell = self._cell(value)
+        positions = self._positions
+        for marker in range(cell + 1, 5):
+            positions[marker] += 1
+        desired = self._desired
+        for marker in range(5):
+            desired[marker] += self._increments[marker]
+        for marker in (1, 2, 3):
+            delta = desired[marker] - positions[marker]
+            if (delta >= 1 and positions[marker + 1] - positions[marker] > 1) or (
+                delta <= -1 and positions[marker - 1] - positions[marker] < -1
+            ):
+                step = 1 if delta > 0 else -1
+                height = self._parabolic(marker, step)
+                if not heights[marker - 1] < height < heights[marker + 1]:
+                    height = heights[marker] + step * (heights[marker + step] - heights[marker]) / (
+                        positions[marker + step] - positions[marker]
+                    )
+                heights[marker] = height
+                positions[marker] += step
+
+    def _cell(self, value: float) -> int:
+        # Index of the markers surrounding the value, extending the min or the max
+        heights = self._heights
+        if value < heights[0]:
+            heights[0] = value
+            return 0
+        if value >= heights[4]:
+            heights[4] = value
+            return 3
+        cell = 0
+        while value >= heights[cell + 1]:
+            cell += 1
+        return cell
+
+    def _parabolic(self, marker: int, step: int) -> float:
+        heights, positions = self._heights, self._positions
+        below = positions[marker] - positions[marker - 1]
+        above = positions[marker + 1] - positions[marker]
+        return heights[marker] + step / (positions[marker + 1] - positions[marker - 1]) * (
+            (below + step) * (heights[marker + 1] - heights[marker]) / above
+            + (above - step) * (heights[marker] - heights[marker - 1]) / below
+        )
+
+    def value(self) -> float:
+        """Return the estimate of the quantile, NaN without values."""
+        heights = self._heights
+        if len(heights) == 5:
+            return heights[2]
+        if not heights:
+            return math.nan
+        ordered = sorted(heights)
+        position = self.quantile * (len(ordered) - 1)
+        lower = int(position)
+        upper = min(lower + 1, len(ordered) - 1)
+        return ordered[lower] + (position - lower) * (ordered[upper] - ordered[lower])
+
+
+class LabelSummary(NamedTuple):
+    """Statistics of the values of a label over a window."""
+
+    #: Number of frames with a value for the label.
+    num_of_values: int
+    min: float
+    max: float
+    mean: float
+    #: Estimated percentile (between 0 and 1) to value.
+    percentiles: dict[float, float]
+
+    def to_dict(self) -> dict[str, float]:
+        """Return the statistics, with percentiles as ``p50``, ``p95``... keys."""
+        statistics = {"num_of_values": self.num_of_values, "min": self.min, "max": self.max, "mean": self.mean}
+        for quantile, value in self.percentiles.items():
+            statistics[f"p{quantile * 100:g}"] = value
+        return statistics
+
+
+class WindowSummary(NamedTuple):
+    """Summary of the frames received over a window."""
+
+    #: Start of the window, in seconds since the epoch.
+    start: float
+    #: End of the window (excluded).
+    end: float
+    #: Number of frames received during the window.
+    frames: int
+    #: Statistics of each label with values during the window.
+    labels: dict[str, LabelSummary]
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the summary as a JSON serializable dict, with a key per label."""
+        return {
+            "start": self.start,
+            "end": self.end,
+            "frames": self.frames,
+            **{label: summary.to_dict() for label, summary in self.labels.items()},
+        }
+
+
+class _LabelStatistics:
+    __slots__ = ("num_of_values", "min", "max", "total", "quantiles")
+
+    def __init__(self, percentiles: Sequence[float]) -> None:
+        self.num_of_values = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self.total = 0.0
+        self.quantiles = [P2Quantile(quantile) for quantile in percentiles]
+
+    def add(self, value: float) -> None:
+        self.num_of_values += 1
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        self.total += value
+        for quantile in self.quantiles:
+            quantile.add(value)
+
+    def summary(self) -> LabelSummary:
+        percentiles = {quantile.quantile: quantile.value() for quantile in self.quantiles}
+        return LabelSummary(self.num_of_values, self.min, self.max, self.total / self.num_of_values, percentiles)
+
+
+class WindowAggregator:
+    """Aggregate decoded frames into one summary per window.
+
+    Args:
+        window: Duration of the windows, in seconds.
+        labels: Labels to aggregate. Their values may be strings
+            (:func:`~teleinfo.codec.decode`) or numbers
+            (:func:`~teleinfo.labels.decode_typed`); values that are not numbers are
+            ignored.
+        percentiles: Percentiles to estimate, between 0 and 1.
+    """
+
+    def __init__(
+        self,
+        window: float = 60.0,
+        labels: Sequence[str] = DEFAULT_LABELS,
+        percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+    ) -> None:
+        if window <= 0:
+            raise ValueError(f"window should be positive, not {window}")
+        for quantile in percentiles:
+            if not 0 < quantile < 1:
+                raise ValueError(f"percentiles should be between 0 and 1, not {quantile}")
+        self.window = window
+        self.labels = tuple(labels)
+        self.percentiles = tuple(percentiles)
+        self._start: float | None = None
+        self._frames = 0
+        self._statistics: dict[str, _LabelStatistics] = {}
+
+    def add(self, frame: Mapping[str, Any], timestamp: float | None = None) -> WindowSummary | None:
+        """Add a decoded frame.
+
+        Args:
+            frame: Decoded frame.
+            timestamp: Reception time of the frame. Defaults to the current time.
+                Frames older than the current window are counted in it.
+
+        Returns:
+            The summary of the previous window, when the frame is the first of a new
+            window, else ``None``.
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        summary = None
+        if self._start is None or timestamp >= self._start + self.window:
+            summary = self.flush()
+            self._start = timestamp - timestamp % self.window
+        self._frames += 1
+        for label in self.labels:
+            value = frame.get(label)
+            if value is None:
+                continue
+            try:
+                value = float(value)
+            except (TypeError, ValueError):
+                continue
+            statistics = self._statistics.get(label)
+            if statistics is None:
+                statistics = self._statistics[label] = _LabelStatistics(self.percentiles)
+            statistics.add(value)
+        return summary
+
+    def flush(self) -> WindowSummary | None:
+        """Return the summary of the current window, and start a new one.
+
+        Returns:
+            The summary, or ``None`` if no frame was added since the last summary.
+        """
+        if self._start is None or not self._frames:
+            return None
+        summary = WindowSummary(
+            self._start,
+            self._start + self.window,
+            self._frames,
+            {label: statistics.summary() for label, statistics in self._statistics.items()},
+        )
+        self._frames = 0
+        self._statistics = {}
+        return summary
+
+
+def aggregate(
+    frames: Iterable[tuple[float, Mapping[str, Any]]],
+    window: float = 60.0,
+    labels: Sequence[str] = DEFAULT_LABELS,
+    percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+) -> Iterator[WindowSummary]:
+    """Aggregate ``(timestamp, frame)`` pairs with a :class:`WindowAggregator`.
+
+    Yields:
+        The summary of each window, including the last, incomplete, one.
+    """
+    aggregator = WindowAggregator(window, labels, percentiles)
+    for timestamp, frame in frames:
+        summary = aggregator.add(frame, timestamp)
+        if summary is not None:
+            yield summary
+    summary = aggregator.flush()
+    if summary is not None:
+        yield summary
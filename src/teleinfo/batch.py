@@ -0,0 +1,204 @@
+"""
+Vectorized decoding of buffers of concatenated teleinfo frames, such as raw capture files.
+
+All frame and info group boundaries (STX/ETX/LF/CR) of the buffer are located, and all
+info group checksums (method 1 and method 2) are computed, with NumPy array operations
+instead of a Python loop per frame. Only the extraction of the label and data strings
+of valid info groups remains in Python.
+
+This module requires NumPy, available through the ``numpy`` extra
+(``pip install pyteleinfo[numpy]``):
+
+.. code-block:: python
+
+    from pathlib import Path
+
+    from teleinfo.batch import decode_many
+
+    batch = decode_many(Path("captured_frames.bin").read_bytes())
+    valid_frames = [frame for frame in batch.frames if frame is not None]
+
+Frames are decoded exactly as :func:`teleinfo.codec.decode` would: frames that are not
+accepted by the vectorized checks are decoded one by one with
+:func:`teleinfo.codec.decode` to decide whether they are really invalid.
+"""
+
+from typing import List, NamedTuple, Optional
+
+from teleinfo.codec import decode
+from teleinfo.const import CR_TOKEN, ETX_TOKEN, HT_TOKEN, LF_TOKEN, SP_TOKEN, STX_TOKEN
+from teleinfo.exceptions import TeleinfoDecodingError
+
+
+try:
+    import numpy as np
+except ImportError as exception:  # pragma: no cover
+    raise ImportError("teleinfo.batch requires NumPy, install it with 'pip install pyteleinfo[numpy]'") from exception
+
+
+_STX = ord(STX_TOKEN)
+_ETX = ord(ETX_TOKEN)
+_LF = ord(LF_TOKEN)
+_CR = ord(CR_TOKEN)
+_SP = ord(SP_TOKEN)
+_HT = ord(HT_TOKEN)
+
+#: Default size of the slices of the buffer processed at once, to bound memory usage.
+DEFAULT_CHUNK_SIZE = 1 << 23
+
+
+class DecodedBatch(NamedTuple):
+    """Result of :func:`decode_many`."""
+
+    #: Decoded frames, in buffer order (``None`` for frames that could not be decoded).
+    frames: List[Optional[dict]]
+    #: Boolean mask, True for frames that could not be decoded.
+    errors: "np.ndarray"
+    #: ``(start, end)`` offsets of each frame in the buffer (end excluded).
+    spans: "np.ndarray"
+
+
+def decode_many(buffer, chunk_size: int = DEFAULT_CHUNK_SIZE) -> DecodedBatch:
+    """
+    Decodes all the frames of a buffer of concatenated raw frames.
+
+    A frame starts at each STX and ends at the first following ETX. A frame with no
+    ETX before the next STX (or the end of the buffer) is reported as an error. Bytes
+    before the first STX and between an ETX and the next STX are ignored.
+
+    :param buffer: bytes-like object (bytes, bytearray, memoryview, mmap...)
+    :param chunk_size: approximate number of bytes processed at once
+    :return: the decoded frames, the error mask and the frame spans
+    """
+    raw = np.frombuffer(buffer, dtype=np.uint8)
+    view = memoryview(buffer).cast("B")
+    stx_positions = np.flatnonzero(raw == _STX)
+
+    frames: List[Optional[dict]] = []
+    errors = []
+    spans = []
+    chunk_start = 0
+    while chunk_start < len(stx_positions):
+        chunk_end = int(np.searchsorted(stx_positions, stx_positions[chunk_start] + chunk_size))
+        chunk_end = max(chunk_end, chunk_start + 1)
+        stx = stx_positions[chunk_start:chunk_end]
+        end = int(stx_positions[chunk_end]) if chunk_end < len(stx_positions) else len(raw)
+        chunk_frames, chunk_errors, chunk_spans = _decode_chunk(raw, view, stx, end)
+        frames.extend(chunk_frames)
+        errors.append(chunk_errors)
+        spans.append(chunk_spans)
+        chunk_start = chunk_end
+
+    if not spans:
+        return DecodedBatch(frames, np.zeros(0, dtype=bool), np.zeros((0, 2), dtype=np.int64))
+    return DecodedBatch(frames, np.concatenate(errors), np.concatenate(spans))
+
+
+def _decode_chunk(raw: "np.ndarray", view: memoryview, stx: "np.ndarray", end: int):
+    """
+    Decodes the frames starting at the ``stx`` positions, all located before ``end``.
+
+    :return: (frames, errors, spans) for these frames
+    """
+    begin = int(stx[0])
+    chunk = raw[begin:end]
+    num_of_frames = len(stx)
+    frame_starts = stx - begin
+
+    # Frame boundaries: each frame ends at the first ETX, if found before the next STX
+    etx = np.flatnonzero(chunk == _ETX)
+    next_stx = np.append(frame_starts[1:], len(chunk))
+    next_etx_index = np.searchsorted(etx, frame_starts)
+    has_etx = next_etx_index < len(etx)
+    frame_ends = next_stx.copy()
+    frame_ends[has_etx] = np.minimum(etx[next_etx_index[has_etx]] + 1, next_stx[has_etx])
+    complete = np.zeros(num_of_frames, dtype=bool)
+    complete[has_etx] = etx[next_etx_index[has_etx]] < next_stx[has_etx]
+
+    # Frames with non ASCII characters are left to the reference decoding
+    needs_fallback = np.zeros(num_of_frames, dtype=bool)
+    non_ascii = np.flatnonzero(chunk >= 0x80)
+    needs_fallback[np.searchsorted(frame_starts, non_ascii, side="right") - 1] = True
+
+    # LF/CR events belonging to a frame must strictly alternate, starting with LF
+    events = np.flatnonzero((chunk == _LF) | (chunk == _CR))
+    event_frames = np.searchsorted(frame_starts, events, side="right") - 1
+    inside = events < frame_ends[event_frames]
+    events, event_frames = events[inside], event_frames[inside]
+    is_cr = chunk[events] == _CR
+    ranks = np.arange(len(events)) - np.searchsorted(event_frames, np.arange(num_of_frames))[event_frames]
+    misplaced = is_cr != (ranks % 2 == 1)
+    needs_fallback[event_frames[misplaced]] = True
+    needs_fallback[np.bincount(event_frames, minlength=num_of_frames) % 2 == 1] = True
+
+    # Info groups of the frames with well placed LF/CR: content between LF and CR
+    lf_indices = np.flatnonzero(~is_cr)
+    lf_indices = lf_indices[~needs_fallback[event_frames[lf_indices]]]
+    group_frames = event_frames[lf_indices]
+    content_starts = events[lf_indices] + 1
+    content_ends = events[lf_indices + 1]
+
+    valid_groups = content_ends - content_starts >= 3
+    sp_counts = _segment_sums(chunk == _SP, content_starts, content_ends)
+    ht_counts = _segment_sums(chunk == _HT, content_starts, content_ends)
+    content_sums = _segment_sums(chunk, content_starts, content_ends)
+    valid_groups &= ((sp_counts == 0) | (ht_counts == 0)) & (sp_counts + ht_counts >= 2)
+
+    # Checksums, method 1 (last separator excluded) and method 2 (last separator included)
+    checksums = chunk[np.maximum(content_ends - 1, 0)].astype(np.int64)
+    last_seps = chunk[np.maximum(content_ends - 2, 0)].astype(np.int64)
+    sums_method_2 = content_sums - checksums
+    sums_method_1 = sums_method_2 - last_seps
+    valid_groups &= (checksums == (sums_method_1 & 0x3F) + 0x20) | (checksums == (sums_method_2 & 0x3F) + 0x20)
+
+    # The label must be followed by the separator found at the end of the group
+    sep_counts = np.where(last_seps == _SP, sp_counts, ht_counts) - 1 - (checksums == last_seps)
+    valid_groups &= ((last_seps == _SP) | (last_seps == _HT)) & (sep_counts >= 1)
+    needs_fallback[group_frames[~valid_groups]] = True
+
+    # Label/data extraction, on the chunk decoded once (latin-1 never fails, and is the
+    # same as ASCII for the frames kept here)
+    text = str(view[begin:end], "latin-1")
+    kept = ~needs_fallback[group_frames]
+    separators = np.flatnonzero((chunk == _SP) | (chunk == _HT))
+    label_starts = content_starts[kept].tolist()
+    label_ends = separators[np.searchsorted(separators, content_starts[kept])].tolist()
+    data_ends = (content_ends[kept] - 2).tolist()
+    labels = [text[start:stop] for start, stop in zip(label_starts, label_ends, strict=True)]
+    data = [text[start + 1 : stop] for start, stop in zip(label_ends, data_ends, strict=True)]
+    first_groups = np.searchsorted(group_frames[kept], np.arange(num_of_frames + 1)).tolist()
+
+    frames: List[Optional[dict]] = []
+    errors = np.zeros(num_of_frames, dtype=bool)
+    for index, (is_complete, is_fallback) in enumerate(zip(complete.tolist(), needs_fallback.tolist(), strict=True)):
+        if not is_complete:
+            frames.append(None)
+            errors[index] = True
+        elif not is_fallback:
+            first_group, last_group = first_groups[index], first_groups[index + 1]
+            frames.append(dict(zip(labels[first_group:last_group], data[first_group:last_group], strict=True)))
+        else:
+            frame_start, frame_end = begin + int(frame_starts[index]), begin + int(frame_ends[index])
+            try:
+                frames.append(decode(view[frame_start:frame_end]))
+            except (TeleinfoDecodingError, UnicodeDecodeError, IndexError):
+                frames.append(None)
+                errors[index] = True
+
+    spans = np.column_stack((frame_starts + begin, frame_ends + begin)).astype(np.int64)
+    return frames, errors, spans
+
+
+def _segment_sums(values: "np.ndarray", starts: "np.ndarray", ends: "np.ndarray") -> "np.ndarray":
+    """
+    Sums ``values`` over each ``[starts[i], ends[i])`` segment.
+
+    :param values: array to sum
+    :param starts: first index of each segment, in increasing order
+    :param ends: index following the last one of each segment, with ``ends[i] <= starts[i + 1]``
+    :return: the sum of each segment (meaningless for empty segments)
+    """
+    if not len(starts):
+        return np.zeros(0, dtype=np.int64)
+    # reduceat sums from each index up to the next one: keep the (start, end) segments only
+    return np.add.reduceat(values, np.column_stack((starts, ends)).ravel(), dtype=np.int64)[0::2]
@@ -0,0 +1,179 @@
+"""Change detection over consecutive frames of a meter.
+
+Most info groups of a frame repeat those of the previous frame byte for byte
+(``ADCO``, ``OPTARIF``, ``ISOUSC``...). :class:`ChangeDetector` compares the raw bytes of
+each info group with the groups of the previous frame, and only decodes the groups
+that differ: an unchanged group costs a dict lookup. It returns a :class:`ChangeEvent`
+with the info groups whose value changed, ignoring changes smaller than the deadband
+of their label, and a full state at each heartbeat:
+
+.. code-block:: python
+
+    detector = ChangeDetector(deadbands={"PAPP": 50, "IINST": 1}, heartbeat=300)
+    for frame in frames:
+        event = detector.feed(frame)
+        if event is not None:
+            publish(event.to_dict())
+
+Changes are detected on the frames of a single meter, in historic mode.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Mapping
+from typing import Any, NamedTuple
+
+from .codec import _decode_info_group_bytes, _extract_info_groups, decode, decode_info_group
+from .const import CR_TOKEN, DEFAULT_DEADBANDS, DEFAULT_HEARTBEAT, ENCODING, ETX_TOKEN, LF_TOKEN, STX_TOKEN
+
+
+_STX = ord(STX_TOKEN)
+_ETX = ord(ETX_TOKEN)
+_LF_BYTES = LF_TOKEN.encode(ENCODING)
+_CR_BYTES = CR_TOKEN.encode(ENCODING)
+
+
+class ChangeEvent(NamedTuple):
+    """Info groups changed since the previous event."""
+
+    #: Reception time of the frame.
+    timestamp: float
+    #: Label to data of the info groups that changed, or of all the info groups of the
+    #: frame for a heartbeat.
+    changes: dict[str, str]
+    #: Labels of the previous frame missing from this one (e.g. ``ADPS`` after an
+    #: overrun).
+    removed: tuple[str, ...] = ()
+    #: Whether ``changes`` holds the full state of the meter.
+    heartbeat: bool = False
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the event as a JSON serializable dict."""
+        event = {"timestamp": self.timestamp, "heartbeat": self.heartbeat, "changes": self.changes}
+        if self.removed:
+            event["removed"] = list(self.removed)
+        return event
+
+
+class ChangeDetector:
+    """Detect the info groups that change from one frame to the next.
+
+    Args:
+        deadbands: Label to the smallest change of its numeric value that is reported.
+            Smaller changes are compared with the last reported value, so that slow
+            drifts are reported once they exceed the deadband.
+        heartbeat: Interval between two events with the full state of the meter, in
+            seconds, or ``None`` for no heartbeat. The first frame is always a
+            heartbeat.
+    """
+
+    def __init__(
+        self, deadbands: Mapping[str, float] | None = None, heartbeat: float | None = DEFAULT_HEARTBEAT
+    ) -> None:
+        self.deadbands = dict(DEFAULT_DEADBANDS if deadbands is None else deadbands)
+        self.heartbeat = heartbeat
+        #: Current data of each label.
+        self.state: dict[str, str] = {}
+        self._reported: dict[str, str] = {}
+        # Raw info groups of the previous frame (bytes between LF and CR) to their label
+        self._info_groups: dict[bytes, str] = {}
+        self._last_heartbeat: float | None = None
+
+    def reset(self) -> None:
+        """Forget the state, so that the next frame is a heartbeat."""
+        self.state = {}
+        self._reported = {}
+        self._info_groups = {}
+        self._last_heartbeat = None
+
+    def feed(self, frame, timestamp: float | None = None) -> ChangeEvent | None:
+        """Compare a frame with the previous one.
+
+        Args:
+            frame: Raw frame, as bytes-like.
+            timestamp: Reception time of the frame. Defaults to the current time.
+
+        Returns:
+            The changes, or ``None`` if no change exceeds its deadband and no heartbeat
+            is due.
+
+        Raises:
+            TeleinfoDecodingError: The frame is invalid, as raised by
+                :func:`~teleinfo.codec.decode`. The state is unchanged.
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        changed = self._changed_info_groups(frame)
+        state = self.state
+        state.update(changed)
+        removed: tuple[str, ...] = ()
+        if len(state) > len(self._info_groups):
+            labels = set(self._info_groups.values())
+            removed = tuple(label for label in state if label not in labels)
+            for label in removed:
+                del state[label]
+                self._reported.pop(label, None)
+
+        if self.heartbeat is not None and (
+            self._last_heartbeat is None or timestamp - self._last_heartbeat >= self.heartbeat
+        ):
+            self._last_heartbeat = timestamp
+            self._reported = dict(state)
+            return ChangeEvent(timestamp, dict(state), removed, heartbeat=True)
+
+        changes = {label: data for label, data in changed.items() if self._exceeds_deadband(label, data)}
+        self._reported.update(changes)
+        if not changes and not removed:
+            return None
+        return ChangeEvent(timestamp, changes, removed)
+
+    def _changed_info_groups(self, frame) -> dict[str, str]:
+        # Label to data of the info groups of the frame missing from the previous frame
+        if isinstance(frame, (bytearray, memoryview)):
+            frame = bytes(frame)
+        previous_info_groups = self._info_groups
+        state = self.state
+        info_groups = {}
+        changed = {}
+        end = len(frame) - 1
+        if isinstance(frame, bytes) and end > 0 and frame[0] == _STX and frame[end] == _ETX and frame.isascii():
+            find = frame.find
+            position = 1
+            while (beginning := find(_LF_BYTES, position, end)) >= 0:
+                ending = find(_CR_BYTES, beginning + 1, end)
+                # Info groups follow each other, without bytes in between
+                if beginning != position or ending < 0 or find(_LF_BYTES, beginning + 1, ending) >= 0:
+                    break
+                info_group = frame[beginning + 1 : ending]
+                label = previous_info_groups.get(info_group)
+                if label is None:
+                    label_and_data = _decode_info_group_bytes(info_group)
+                    if label_and_data is None:
+                        break
+                    label, data = label_and_data
+                    if state.get(label) != data:
+                        changed[label] = data
+                info_groups[info_group] = label
+                position = ending + 1
+            else:
+                if position == end:
+                    self._info_groups = info_groups
+                    return changed
+        # Not strictly well formed: decode raises the detailed error, or accepts the frame
+        decoded_frame = decode(frame)
+        frame_string = frame.decode(ENCODING) if isinstance(frame, bytes) else frame
+        self._info_groups = {
+            info_group[1:-1].encode(ENCODING): decode_info_group(info_group, verify_well_formed=False)[0]
+            for info_group in _extract_info_groups(frame_string)
+        }
+        return {label: data for label, data in decoded_frame.items() if state.get(label) != data}
+
+    def _exceeds_deadband(self, label: str, data: str) -> bool:
+        deadband = self.deadbands.get(label)
+        reported = self._reported.get(label)
+        if deadband is None or reported is None:
+            return reported != data
+        try:
+            return abs(float(data) - float(reported)) >= deadband
+        except ValueError:
+            return True
@@ -34,7 +34,11 @@ Definitions:
 """
 
 import re
-from typing import List, Tuple
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Iterable, Mapping
+from enum import IntEnum
+from typing import Generic, List, NamedTuple, Optional, Tuple, TypeVar
 
 from teleinfo.const import (
     CR_TOKEN,
@@ -50,6 +54,16 @@ from teleinfo.const import (
 from teleinfo.exceptions import ChecksumError, FrameFormatError, InfoGroupFormatError
 
 
+_STX = ord(STX_TOKEN)
+_ETX = ord(ETX_TOKEN)
+_STX_BYTES = STX_TOKEN.encode(ENCODING)
+_ETX_BYTES = ETX_TOKEN.encode(ENCODING)
+_LF_BYTES = LF_TOKEN.encode(ENCODING)
+_CR_BYTES = CR_TOKEN.encode(ENCODING)
+_SP_BYTES = SP_TOKEN.encode(ENCODING)
+_HT_BYTES = HT_TOKEN.encode(ENCODING)
+
+
 def encode(info_groups: dict) -> str:
     """
     Encodes a teleinfo frame in json format to string format.
@@ -63,18 +77,141 @@ def encode(info_groups: dict) -> str:
     return f"{STX_TOKEN}{encoded_info_groups}{ETX_TOKEN}"
 
 
-def decode(frame, verify_well_formed: bool = True) -> dict:
+_DecodedInfoGroup = TypeVar("_DecodedInfoGroup")
+
+
+class _BoundedInfoGroupCache(ABC, Generic[_DecodedInfoGroup]):
+    """
+    Bounded LRU cache of decoded info groups, keyed by their raw bytes.
+
+    Each subclass decodes the info groups not found in the cache for one decode
+    function, which only accepts that subclass.
+
+    :param maxsize: max number of info groups kept
+    """
+
+    __slots__ = ("maxsize", "hits", "misses", "_entries")
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        #: number of info groups found in the cache
+        self.hits = 0
+        #: number of info groups decoded and added to the cache
+        self.misses = 0
+        self._entries: "OrderedDict[bytes, _DecodedInfoGroup]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self):
+        """
+        Empties the cache and resets its counters.
+        """
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    @abstractmethod
+    def _decode(self, info_group_core: bytes) -> Optional[_DecodedInfoGroup]:
+        # Decoder of the info groups not found in the cache
+        ...
+
+    def decode_info_group_bytes(self, info_group_core: bytes) -> Optional[_DecodedInfoGroup]:
+        """
+        Cached version of the decoder of the info groups.
+
+        :param info_group_core: bytes between the LF and the CR of the info group
+        :return: the decoded info group, or None if the info group is malformed or its
+                 checksum does not match
+        """
+        entries = self._entries
+        decoded_info_group = entries.get(info_group_core)
+        if decoded_info_group is not None:
+            self.hits += 1
+            entries.move_to_end(info_group_core)
+            return decoded_info_group
+        decoded_info_group = self._decode(info_group_core)
+        if decoded_info_group is not None:
+            self.misses += 1
+            entries[info_group_core] = decoded_info_group
+            if len(entries) > self.maxsize:
+                entries.popitem(last=False)
+        return decoded_info_group
+
+
+class InfoGroupCache(_BoundedInfoGroupCache[Tuple[str, str]]):
+    """
+    Bounded LRU cache of the info groups decoded by :func:`decode`, keyed by their raw
+    bytes.
+
+    Consecutive frames of a meter repeat most of their info groups byte for byte (ADCO,
+    OPTARIF, ISOUSC...): passing the same cache to each :func:`decode` call skips the
+    verification and extraction of the groups already seen. Only valid info groups are
+    cached.
+
+    .. code-block:: python
+
+        cache = InfoGroupCache()
+        for frame in frames:
+            decoded_frame = decode(frame, cache=cache)
+
+    :param maxsize: max number of info groups kept
+    """
+
+    __slots__ = ()
+
+    def _decode(self, info_group_core: bytes) -> Optional[Tuple[str, str]]:
+        return _decode_info_group_bytes(info_group_core)
+
+
+def _verify_cache(cache) -> None:
+    """
+    Verifies that a cache given to :func:`decode` or :func:`decode_lenient` is an
+    :class:`InfoGroupCache`, and not the cache of another decode function.
+
+    :param cache: cache, or None
+    :raises TypeError: if the cache is not an :class:`InfoGroupCache`
+    """
+    if cache is not None and not isinstance(cache, InfoGroupCache):
+        raise TypeError(f"cache should be an InfoGroupCache, not {type(cache).__name__}")
+
+
+def decode(frame, verify_well_formed: bool = True, cache: Optional[InfoGroupCache] = None) -> dict:
     """
     Decodes a teleinfo frame from string or bytes format to json format.
 
-    :param frame: str or bytes, teleinfo frame in string or bytes format
+    Well formed frames are decoded in a single pass over the raw bytes (see
+    :func:`_decode_single_pass`). Anything the single pass does not accept is handed
+    over to the reference implementation (:func:`_decode_reference`), so that the
+    result and the exception raised are exactly the same as before.
+
+    :param frame: str or bytes-like, teleinfo frame in string or bytes format
+    :param verify_well_formed: if True, verifies that the frame is well formed
+    :param cache: if given, info groups already decoded with this cache are not
+                  verified and extracted again (used for well formed frames only)
+    :return: a json dict of (label, data) key/value pair extracted from the frame
+    :raises TypeError: if the cache is not an :class:`InfoGroupCache`
+    """
+    _verify_cache(cache)
+    if verify_well_formed:
+        decoded_frame = _decode_single_pass(frame, cache)
+        if decoded_frame is not None:
+            return decoded_frame
+    return _decode_reference(frame, verify_well_formed)
+
+
+def _decode_reference(frame, verify_well_formed: bool = True) -> dict:
+    """
+    Reference implementation of :func:`decode`, working on the frame as a string.
+
+    :param frame: str or bytes-like, teleinfo frame in string or bytes format
     :param verify_well_formed: if True, verifies that the frame is well formed
     :return: a json dict of (label, data) key/value pair extracted from the frame
     """
     # TODO: check that there is not EOT character in the frame. If there is, handle it
     # Encode frame in ENCODING (normally ascii) if frame is still in bytes
-    if isinstance(frame, bytes):
-        frame = frame.decode(ENCODING)
+    if isinstance(frame, (bytes, bytearray, memoryview)):
+        frame = bytes(frame).decode(ENCODING)
 
     if verify_well_formed:
         _verify_frame_well_formed(frame)
@@ -86,6 +223,293 @@ def decode(frame, verify_well_formed: bool = True) -> dict:
     return decoded_frame
 
 
+def _decode_single_pass(frame, cache: Optional[InfoGroupCache] = None) -> Optional[dict]:
+    """
+    Decodes a well formed frame walking its raw bytes once: LF/CR boundaries are
+    located, each info group is verified and its label and data extracted on the fly.
+
+    :param frame: str or bytes-like, teleinfo frame
+    :param cache: optional cache of the info groups already decoded
+    :return: the decoded frame, or None if the frame is not strictly well formed (in
+             which case :func:`_decode_reference` must be used to report the error)
+    """
+    if isinstance(frame, str):
+        if not frame.isascii():
+            return None
+        frame = frame.encode(ENCODING)
+    elif isinstance(frame, memoryview):
+        frame = frame.tobytes()
+    elif isinstance(frame, bytearray):
+        if cache is not None:
+            # Slices are used as cache keys, and must be hashable
+            frame = bytes(frame)
+    elif not isinstance(frame, bytes):
+        return None
+
+    end = len(frame) - 1
+    if end < 1 or frame[0] != _STX or frame[end] != _ETX or not frame.isascii():
+        return None
+    decode_info_group_bytes = _decode_info_group_bytes if cache is None else cache.decode_info_group_bytes
+    return _decode_info_groups_single_pass(frame, end, decode_info_group_bytes)
+
+
+def _decode_info_groups_single_pass(frame: bytes, end: int, decode_info_group_bytes) -> Optional[dict]:
+    """
+    Loop of :func:`_decode_single_pass` over the info groups of a frame.
+
+    :param frame: frame starting with STX and ending with ETX, at ``end``
+    :param decode_info_group_bytes: decoder of the core of an info group
+    :return: the decoded frame, or None if the frame is not strictly well formed
+    """
+    find = frame.find
+    decoded_frame = {}
+    position = 1
+    while True:
+        beginning = find(_LF_BYTES, position, end)
+        if beginning < 0:
+            break
+        ending = find(_CR_BYTES, beginning + 1, end)
+        if ending < 0 or find(_CR_BYTES, position, beginning) >= 0 or find(_LF_BYTES, beginning + 1, ending) >= 0:
+            return None
+        label_and_data = decode_info_group_bytes(frame[beginning + 1 : ending])
+        if label_and_data is None:
+            return None
+        decoded_frame[label_and_data[0]] = label_and_data[1]
+        position = ending + 1
+    if find(_CR_BYTES, position, end) >= 0:
+        return None
+    return decoded_frame
+
+
+def _decode_info_group_bytes(info_group_core: bytes) -> Optional[Tuple[str, str]]:
+    """
+    Verifies and decodes the core of an info group (without its LF and CR).
+
+    :param info_group_core: bytes between the LF and the CR of the info group
+    :return: (label, data), or None if the info group is malformed or its checksum
+             does not match
+    """
+    num_of_sp_sep = info_group_core.count(_SP_BYTES)
+    num_of_ht_sep = info_group_core.count(_HT_BYTES)
+    if (num_of_sp_sep and num_of_ht_sep) or num_of_sp_sep + num_of_ht_sep < 2:
+        return None
+    label_data_and_separators, checksum = info_group_core[:-1], info_group_core[-1]
+    sum_ = sum(label_data_and_separators)
+    if checksum != (sum_ & 0x3F) + 0x20 and checksum != ((sum_ - label_data_and_separators[-1]) & 0x3F) + 0x20:
+        return None
+    label, sep, data = label_data_and_separators[:-1].partition(label_data_and_separators[-1:])
+    if not sep:
+        return None
+    return label.decode(ENCODING), data.decode(ENCODING)
+
+
+class DecodeErrorCode(IntEnum):
+    """
+    Code of the errors found by :func:`decode_lenient`.
+    """
+
+    #: the frame does not start with STX
+    MISSING_STX = 1
+    #: the frame does not end with ETX
+    MISSING_ETX = 2
+    #: an info group (LF) has no end (CR) before the next info group or the end of the frame
+    UNTERMINATED_INFO_GROUP = 3
+    #: an info group has less than 2 separators, mixes SP and HT, or has no separator
+    #: before its checksum
+    INFO_GROUP_FORMAT = 4
+    #: the checksum of an info group matches neither method 1 nor method 2
+    CHECKSUM = 5
+    #: an info group contains non ASCII bytes
+    NON_ASCII = 6
+    #: a CR is found outside of an info group
+    STRAY_CR = 7
+    #: non ASCII bytes are found outside of the info groups
+    STRAY_NON_ASCII = 8
+
+
+_ERROR_MESSAGES = {
+    DecodeErrorCode.MISSING_STX: "First char should be STX",
+    DecodeErrorCode.MISSING_ETX: "Last char should be ETX",
+    DecodeErrorCode.UNTERMINATED_INFO_GROUP: "Info group should end with CR",
+    DecodeErrorCode.INFO_GROUP_FORMAT: (
+        "Info group should contain at least 2 separators, either SP or HT, the last one before the checksum"
+    ),
+    DecodeErrorCode.CHECKSUM: "Info group checksum should match method 1 or method 2",
+    DecodeErrorCode.NON_ASCII: "Info group should only contain ASCII characters",
+    DecodeErrorCode.STRAY_CR: "CR should end an info group",
+    DecodeErrorCode.STRAY_NON_ASCII: "Bytes outside of info groups should be ASCII characters",
+}
+
+
+class DecodeError(NamedTuple):
+    """
+    Error found by :func:`decode_lenient`, located in the raw frame.
+    """
+
+    #: what is wrong
+    code: DecodeErrorCode
+    #: position of the faulty part of the frame (the LF of an info group)
+    start: int
+    #: position following the faulty part of the frame
+    end: int
+
+
+class DecodeResult:
+    """
+    Result of :func:`decode_lenient`: the valid info groups of a frame, and the errors
+    found in the rest of it.
+
+    Errors are kept as codes and positions in the raw frame; their messages are only
+    formatted when :attr:`error_messages` is read.
+
+    :param frame: raw frame
+    :param info_groups: (label, data) of the valid info groups
+    :param errors: errors found, in the order of the frame
+    """
+
+    __slots__ = ("frame", "info_groups", "errors")
+
+    def __init__(self, frame: bytes, info_groups: dict, errors: List[DecodeError]):
+        self.frame = frame
+        self.info_groups = info_groups
+        self.errors = errors
+
+    def __repr__(self) -> str:
+        return f"DecodeResult(info_groups={self.info_groups!r}, errors={self.errors!r})"
+
+    @property
+    def valid(self) -> bool:
+        """
+        True if no error was found, in which case :attr:`info_groups` is what
+        :func:`decode` returns.
+        """
+        return not self.errors
+
+    @property
+    def error_codes(self) -> List[DecodeErrorCode]:
+        """
+        Codes of the errors found, in the order of the frame.
+        """
+        return [error.code for error in self.errors]
+
+    @property
+    def error_messages(self) -> List[str]:
+        """
+        Messages describing the errors found, with the faulty part of the frame.
+        """
+        return [
+            f"{_ERROR_MESSAGES[error.code]}: {self.frame[error.start : error.end]!r} at {error.start}"
+            for error in self.errors
+        ]
+
+
+def decode_lenient(frame, cache: Optional[InfoGroupCache] = None) -> DecodeResult:
+    """
+    Decodes a teleinfo frame, salvaging its valid info groups instead of raising on the
+    first error.
+
+    Info groups are located as by :func:`decode` (LF through CR); an info group without
+    CR is skipped up to the next LF. Each invalid info group, a missing STX or ETX and a
+    CR or non ASCII bytes outside of info groups are reported as a :class:`DecodeError`
+    in the result, so the result is valid whenever :func:`decode` would not raise. No
+    exception is built, so decoding a frame with errors costs about the same as decoding
+    a valid one.
+
+    .. code-block:: python
+
+        result = decode_lenient(frame)
+        store(result.info_groups)
+        if not result.valid:
+            logger.warning("Invalid info groups: %s", result.error_messages)
+
+    :param frame: str or bytes-like, teleinfo frame in string or bytes format
+    :param cache: if given, valid info groups already decoded with this cache are not
+                  verified and extracted again
+    :return: the valid info groups and the errors found
+    :raises TypeError: if the cache is not an :class:`InfoGroupCache`
+    """
+    _verify_cache(cache)
+    if isinstance(frame, str):
+        # Non ASCII characters are kept non ASCII, and reported below
+        frame = frame.encode("utf-8")
+    elif not isinstance(frame, bytes):
+        frame = bytes(frame)
+
+    errors = []
+    end = len(frame)
+    position = 0
+    if frame[:1] == _STX_BYTES:
+        position = 1
+    else:
+        errors.append(DecodeError(DecodeErrorCode.MISSING_STX, 0, min(end, 1)))
+    missing_etx = frame[-1:] != _ETX_BYTES
+    if not missing_etx:
+        end -= 1
+
+    decode_info_group_bytes = _decode_info_group_bytes if cache is None else cache.decode_info_group_bytes
+    info_groups = _salvage_info_groups(frame, position, end, decode_info_group_bytes, errors)
+
+    if missing_etx:
+        errors.append(DecodeError(DecodeErrorCode.MISSING_ETX, max(len(frame) - 1, 0), len(frame)))
+    return DecodeResult(frame, info_groups, errors)
+
+
+def _salvage_info_groups(frame: bytes, position: int, end: int, decode_info_group_bytes, errors: list) -> dict:
+    """
+    Loop of :func:`decode_lenient` over the info groups of a frame, from ``position`` to
+    ``end``.
+
+    :param decode_info_group_bytes: decoder of the core of an info group
+    :param errors: list the errors found are appended to
+    :return: the valid info groups
+    """
+    find = frame.find
+    is_ascii = frame.isascii()
+    info_groups = {}
+    beginning = find(_LF_BYTES, position, end)
+    while beginning >= 0:
+        _verify_gap(frame, position, beginning, is_ascii, errors)
+        ending = find(_CR_BYTES, beginning + 1, end)
+        next_beginning = find(_LF_BYTES, beginning + 1, end)
+        if ending < 0 or 0 <= next_beginning < ending:
+            position = next_beginning if next_beginning >= 0 else end
+            errors.append(DecodeError(DecodeErrorCode.UNTERMINATED_INFO_GROUP, beginning, position))
+            beginning = next_beginning
+            continue
+        info_group_core = frame[beginning + 1 : ending]
+        if is_ascii or info_group_core.isascii():
+            label_and_data = decode_info_group_bytes(info_group_core)
+            if label_and_data is not None:
+                info_groups[label_and_data[0]] = label_and_data[1]
+            else:
+                errors.append(DecodeError(_info_group_error_code(info_group_core), beginning, ending + 1))
+        else:
+            errors.append(DecodeError(DecodeErrorCode.NON_ASCII, beginning, ending + 1))
+        position = ending + 1
+        beginning = next_beginning
+    _verify_gap(frame, position, end, is_ascii, errors)
+    return info_groups
+
+
+def _verify_gap(frame: bytes, position: int, end: int, is_ascii: bool, errors: list) -> None:
+    # Bytes between info groups: decode() rejects a CR, and fails to decode non ASCII bytes
+    stray_cr = frame.find(_CR_BYTES, position, end)
+    if stray_cr >= 0:
+        errors.append(DecodeError(DecodeErrorCode.STRAY_CR, stray_cr, stray_cr + 1))
+    if not is_ascii and not frame[position:end].isascii():
+        errors.append(DecodeError(DecodeErrorCode.STRAY_NON_ASCII, position, end))
+
+
+def _info_group_error_code(info_group_core: bytes) -> DecodeErrorCode:
+    num_of_sp_sep = info_group_core.count(_SP_BYTES)
+    num_of_ht_sep = info_group_core.count(_HT_BYTES)
+    if (num_of_sp_sep and num_of_ht_sep) or num_of_sp_sep + num_of_ht_sep < 2:
+        return DecodeErrorCode.INFO_GROUP_FORMAT
+    if info_group_core[-2:-1] not in (_SP_BYTES, _HT_BYTES):
+        return DecodeErrorCode.INFO_GROUP_FORMAT
+    return DecodeErrorCode.CHECKSUM
+
+
 def decode_from_list(frame_list: list, verify_well_formed: bool = True) -> dict:
     """
     Same as decode, but receives a list as parameter. (probably should be deprecated)
@@ -119,6 +543,162 @@ def encode_info_group(label: str, data: str, sep: str = SP_TOKEN) -> str:
     return f"{LF_TOKEN}{encoded_info_group}{checksum}{CR_TOKEN}"
 
 
+class FrameEncoder:
+    """
+    Bulk encoder of teleinfo frames to bytes, for meter simulators and load generators.
+
+    Frames are given as mappings (or iterables of pairs) of label to data, and rendered
+    straight to bytes, ready to be written to a serial port. The encoded bytes of each
+    (label, data) pair are cached, so that the info groups which do not change from one
+    frame to the next (most of them) are not encoded and checksummed again.
+
+    .. code-block:: python
+
+        encoder = FrameEncoder()
+        buffer = bytearray(1 << 16)
+        frames = encoder.encode_many([{"ADCO": "050022120078", "PAPP": "02160"}] * 100, buffer)
+        serial_port.write(frames)
+
+    :param sep: separator of the info groups, SP (historic mode) or HT (standard mode)
+    :param checksum_method: 1 (last separator excluded) or 2 (last separator included).
+                            Defaults to method 1 with SP and method 2 with HT, as the
+                            meters do.
+    :param cache_size: max number of encoded info groups kept
+    """
+
+    __slots__ = ("sep", "checksum_method", "cache_size", "_cache")
+
+    def __init__(self, sep: str = SP_TOKEN, checksum_method: Optional[int] = None, cache_size: int = 4096):
+        if sep not in (SP_TOKEN, HT_TOKEN):
+            raise ValueError(f"Separator should be SP or HT, not {sep!r}")
+        if checksum_method is None:
+            checksum_method = 1 if sep == SP_TOKEN else 2
+        if checksum_method not in (1, 2):
+            raise ValueError(f"Checksum method should be 1 or 2, not {checksum_method!r}")
+        self.sep = sep
+        self.checksum_method = checksum_method
+        self.cache_size = cache_size
+        self._cache: dict = {}
+
+    def encode_info_group(self, label: str, data: str) -> bytes:
+        """
+        Encodes an info group, from LF to CR.
+
+        :param label: info group label
+        :param data: info group data
+        :return: info group in bytes format
+        """
+        key = (label, data)
+        encoded_info_group = self._cache.get(key)
+        if encoded_info_group is None:
+            label_data_and_separators = f"{label}{self.sep}{data}{self.sep}".encode(ENCODING)
+            sum_ = sum(label_data_and_separators)
+            if self.checksum_method == 1:
+                sum_ -= label_data_and_separators[-1]
+            encoded_info_group = b"%b%b%c%b" % (_LF_BYTES, label_data_and_separators, (sum_ & 0x3F) + 0x20, _CR_BYTES)
+            if len(self._cache) >= self.cache_size:
+                # Evict the oldest entry
+                del self._cache[next(iter(self._cache))]
+            self._cache[key] = encoded_info_group
+        return encoded_info_group
+
+    def encode(self, info_groups) -> bytes:
+        """
+        Encodes a frame, from STX to ETX.
+
+        :param info_groups: mapping of label to data, or iterable of (label, data) tuples
+        :return: frame in bytes format
+        """
+        return b"".join(self._encode_parts(info_groups))
+
+    def _encode_parts(self, info_groups) -> list:
+        """
+        Encodes a frame without joining its parts.
+
+        :param info_groups: mapping of label to data, or iterable of (label, data) tuples
+        :return: STX, each encoded info group and ETX, in bytes format
+        """
+        if isinstance(info_groups, Mapping):
+            info_groups = info_groups.items()
+        cache_get = self._cache.get
+        encoded_parts = [_STX_BYTES]
+        for key in info_groups:
+            encoded_info_group = cache_get(key)
+            if encoded_info_group is None:
+                encoded_info_group = self.encode_info_group(*key)
+            encoded_parts.append(encoded_info_group)
+        encoded_parts.append(_ETX_BYTES)
+        return encoded_parts
+
+    def encode_into(self, info_groups, buffer, offset: int = 0) -> int:
+        """
+        Encodes a frame into a preallocated buffer, each info group being copied in place.
+
+        :param info_groups: mapping of label to data, or iterable of (label, data) tuples
+        :param buffer: writable bytes-like object (bytearray, memoryview, mmap...)
+        :param offset: position to write the frame at
+        :return: the position following the frame in the buffer
+        :raises ValueError: if the frame does not fit in the buffer
+        """
+        encoded_parts = self._encode_parts(info_groups)
+        size = sum(map(len, encoded_parts))
+        if offset + size > len(buffer):
+            raise ValueError(f"Buffer too small: {size} bytes needed at offset {offset}, {len(buffer)} available")
+        with memoryview(buffer) as view:
+            return _write_parts(view, offset, encoded_parts)
+
+    def encode_many(self, frames: Iterable, buffer=None) -> memoryview:
+        """
+        Encodes frames one after the other into a buffer, reused from call to call.
+
+        The frames are copied in place, overwriting the frames of the previous call:
+        the view returned by the previous call then holds the new frames. A bytearray
+        cannot be enlarged while such views are alive, release them first
+        (``view.release()``) when the frames may not fit.
+
+        :param frames: iterable of frames, each being a mapping of label to data or an
+                       iterable of (label, data) tuples
+        :param buffer: writable bytes-like object to write the frames to. A bytearray
+                       is enlarged if needed. A new bytearray is used if None.
+        :return: view on the part of the buffer holding the frames
+        :raises ValueError: if the frames do not fit in a buffer that cannot be enlarged
+        :raises BufferError: if the bytearray must be enlarged while views on it are alive
+        """
+        encoded_parts = [part for info_groups in frames for part in self._encode_parts(info_groups)]
+        size = sum(map(len, encoded_parts))
+        if buffer is None:
+            buffer = bytearray(size)
+        elif len(buffer) < size:
+            if not isinstance(buffer, bytearray):
+                raise ValueError(f"Buffer too small: {size} bytes needed, {len(buffer)} available")
+            try:
+                buffer.extend(bytes(size - len(buffer)))
+            except BufferError as exception:
+                raise BufferError(
+                    f"Buffer too small: {size} bytes needed, {len(buffer)} available, and cannot be enlarged "
+                    "while views on it are alive"
+                ) from exception
+        view = memoryview(buffer)[:size]
+        _write_parts(view, 0, encoded_parts)
+        return view
+
+
+def _write_parts(view: memoryview, position: int, parts: list) -> int:
+    """
+    Copies bytes one after the other into a view.
+
+    :param view: writable view, large enough for all the parts
+    :param position: position to write the first part at
+    :param parts: bytes to write
+    :return: the position following the last part
+    """
+    for part in parts:
+        end = position + len(part)
+        view[position:end] = part
+        position = end
+    return position
+
+
 def decode_info_group(
     encoded_info_group: str,
     verify_well_formed: bool = True,
@@ -180,7 +760,7 @@ def _verify_frame_well_formed(frame: str):
         )
         errors = _append_error(errors, error)
     else:
-        results = [i > j for (i, j) in zip(beginnings, ends)]
+        results = [i > j for (i, j) in zip(beginnings, ends, strict=True)]
         if any(results):
             indices = [i for i, x in enumerate(results) if x is True]
             faulty_pairs = [(beginnings[i], ends[i]) for i in indices]
@@ -202,7 +782,7 @@ def _extract_info_groups_positions(frame: str) -> Tuple[List[int], List[int]]:
 
 def _extract_info_groups(frame: str) -> list:
     beginnings, ends = _extract_info_groups_positions(frame)
-    info_groups = [frame[beginning : end + 1] for (beginning, end) in zip(beginnings, ends)]
+    info_groups = [frame[beginning : end + 1] for (beginning, end) in zip(beginnings, ends, strict=False)]
     return info_groups
 
 
@@ -296,7 +876,5 @@ def _checksum_method_2(label_data_and_separators: str) -> str:
 
 
 def _checksum(label_data_and_separators: str) -> str:
-    sum_ = 0
-    for cks in label_data_and_separators:
-        sum_ = sum_ + ord(cks)
-    return chr((sum_ & int("111111", 2)) + 0x20)
+    sum_ = sum(map(ord, label_data_and_separators))
+    return chr((sum_ & 0x3F) + 0x20)
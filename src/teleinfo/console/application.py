@@ -1,6 +1,7 @@
+from pydantic import Field
 from pydantic_settings import BaseSettings, CliApp, CliSubCommand, SettingsConfigDict
 
-from .commands import DiscoverCommand, PortCommand
+from .commands import DecodeFileCommand, DiscoverCommand, PortCommand, SimulateCommand
 
 
 class Application(BaseSettings):
@@ -10,6 +11,8 @@ class Application(BaseSettings):
 
     port: CliSubCommand[PortCommand]
     discover: CliSubCommand[DiscoverCommand]
+    simulate: CliSubCommand[SimulateCommand]
+    decode_file: CliSubCommand[DecodeFileCommand] = Field(alias="decode-file")
 
     def cli_cmd(self) -> None:
         CliApp.run_subcommand(self)
@@ -1,18 +1,13 @@
-import asyncio
-import json
+# The modules implementing the commands are imported when a command runs, so that
+# parsing the command line (or printing the help) does not load pyserial
 import sys
+from pathlib import Path
+from typing import Literal
 
-import termios
-
-import serial_asyncio
 from pydantic import BaseModel, Field
 from pydantic_settings import CliImplicitFlag, CliPositionalArg
-from serial.tools import list_ports
 
-from ..codec import decode
-from ..const import ENCODING, ETX_TOKEN
-from ..exceptions import TeleinfoError
-from ..settings import TeleinfoSettings
+from ..const import DEFAULT_CONCURRENCY, DEFAULT_DEADBANDS, DEFAULT_HEARTBEAT
 
 
 class PortCommand(BaseModel):
@@ -20,75 +15,189 @@ class PortCommand(BaseModel):
 
     port: CliPositionalArg[str]
     raw: CliImplicitFlag[bool] = Field(default=False, description="Print raw bytes instead of decoded JSON")
+    follow: CliImplicitFlag[bool] = Field(
+        default=False, description="Stream frames until the port closes, as JSON lines with their receive timestamp"
+    )
+    flush_interval: float = Field(
+        default=1.0, ge=0, description="Max seconds frames stay in the output buffer with --follow (0: every frame)"
+    )
+    aggregate: float | None = Field(
+        default=None,
+        gt=0,
+        description="With --follow, print the statistics of the instantaneous values over windows of this many secs",
+    )
+    changes: CliImplicitFlag[bool] = Field(
+        default=False, description="With --follow, print only the info groups that changed (historic mode)"
+    )
+    deadband: dict[str, float] = Field(
+        default_factory=lambda: dict(DEFAULT_DEADBANDS),
+        description="Smallest change reported by --changes for numeric labels, as LABEL=VALUE",
+    )
+    heartbeat: float = Field(
+        default=DEFAULT_HEARTBEAT, gt=0, description="Secs between two events with all the info groups with --changes"
+    )
+    metrics_port: int | None = Field(
+        default=None, ge=0, le=65535, description="Serve Prometheus metrics on this port of localhost"
+    )
+    metrics_file: Path | None = Field(
+        default=None, description="Write Prometheus metrics to this file, every 15 secs and on exit"
+    )
 
     async def cli_cmd(self) -> None:
+        # pylint: disable=import-outside-toplevel
+        from ..settings import TeleinfoSettings
+        from .port import check_port, follow_port, start_metrics
+
+        if self.aggregate is not None and (self.raw or not self.follow):
+            sys.exit("--aggregate requires --follow, without --raw")
+        if self.changes and (self.raw or not self.follow or self.aggregate is not None):
+            sys.exit("--changes requires --follow, without --raw or --aggregate")
         settings = TeleinfoSettings()
-        await _check_port_for_teleinfo(self.port, settings, raw_flag=self.raw)
+        if self.changes and settings.mode != "historic":
+            sys.exit("--changes only supports historic mode")
+        metrics_writer = start_metrics(self.metrics_port, self.metrics_file)
+        try:
+            if self.follow:
+                aggregator = None
+                if self.aggregate is not None:
+                    from ..aggregate import DEFAULT_LABELS, STANDARD_LABELS, WindowAggregator
+
+                    labels = STANDARD_LABELS if settings.mode == "standard" else DEFAULT_LABELS
+                    aggregator = WindowAggregator(self.aggregate, labels)
+                detector = None
+                if self.changes:
+                    from ..changes import ChangeDetector
+
+                    detector = ChangeDetector(self.deadband, self.heartbeat)
+                success = await follow_port(
+                    self.port,
+                    settings,
+                    raw_flag=self.raw,
+                    flush_interval=self.flush_interval,
+                    aggregator=aggregator,
+                    detector=detector,
+                )
+            else:
+                success = await check_port(self.port, settings, raw_flag=self.raw)
+        finally:
+            if metrics_writer is not None:
+                metrics_writer.stop()
+        if not success:
+            sys.exit(1)
 
 
 class DiscoverCommand(BaseModel):
     """Auto-discover a serial port receiving teleinfo data."""
 
+    find_all: CliImplicitFlag[bool] = Field(
+        default=False, alias="all", description="Probe all ports instead of stopping at the first teleinfo port"
+    )
+    concurrency: int = Field(default=DEFAULT_CONCURRENCY, ge=1, description="Max number of ports probed at once")
+    json_output: CliImplicitFlag[bool] = Field(
+        default=False, alias="json", description="Print the discovery result as JSON"
+    )
+
     async def cli_cmd(self) -> None:
-        settings = TeleinfoSettings()
-        print("Looking for serial ports...")
-        ports_found = list_ports.comports()
-        ports = [port.device for port in ports_found]
-        print(f"List of ports found: {ports}")
-        print("Checking port until a teleinfo port is found...")
-        success = False
-        for port in ports:
-            success = await _check_port_for_teleinfo(port, settings)
-            if success:
-                print(f"Port {port} receives valid teleinfo frames! Search stopped.")
-                break
+        # pylint: disable=import-outside-toplevel
+        from ..discovery import discover_ports
+        from ..settings import TeleinfoSettings
 
-        if not success:
+        settings = TeleinfoSettings()
+        if not self.json_output:
+            print(f"Probing serial ports, {self.concurrency} at a time...")
+        result = await discover_ports(settings=settings, concurrency=self.concurrency, find_all=self.find_all)
+        if self.json_output:
+            print(result.model_dump_json())
+            return
+
+        print(f"List of ports found: {result.ports}")
+        for probe in result.probes:
+            status = "valid teleinfo frames" if probe.success else probe.error
+            print(f"Port '{probe.port}': {status} ({probe.elapsed:.1f} secs)")
+        if not result.teleinfo_ports:
             print("All com ports scanned. No port with teleinfo found.")
+        elif self.find_all:
+            print(f"Ports receiving valid teleinfo frames: {result.teleinfo_ports}")
+        else:
+            print(f"Port {result.teleinfo_ports[0]} receives valid teleinfo frames! Search stopped.")
 
 
-async def _check_port_for_teleinfo(port: str, settings: TeleinfoSettings, raw_flag: bool = False) -> bool:
-    success = True
-    print(
-        f"Trying to read port '{port}' for {settings.timeout} secs... Will print a max of {settings.max_frames} frames..."
-    )
-    try:
-        await _discard_potentially_incomplete_first_frame(port, settings)
-        for _ in range(settings.max_frames):
-            print(await _extract_frame_to_print(port, raw_flag, settings))
-    except (OSError, termios.error) as exception:
-        print(f"Error opening port '{port}': {exception}", file=sys.stderr)
-        success = False
-    except TeleinfoError as exception:
-        print(f"Error: {repr(exception)}", file=sys.stderr)
-        success = False
-    except asyncio.TimeoutError:
-        print("Timeout!")
-        success = False
-    # Add a sleep so that output buffer can be flushed
-    await asyncio.sleep(0)
-    return success
-
-
-async def _discard_potentially_incomplete_first_frame(port: str, settings: TeleinfoSettings):
-    return await asyncio.wait_for(async_receive_frame(port, settings), timeout=settings.timeout)
-
-
-async def _extract_frame_to_print(port: str, raw_flag: bool, settings: TeleinfoSettings) -> str:
-    frame_to_print = await asyncio.wait_for(async_receive_frame(port, settings), timeout=settings.timeout)
-    if raw_flag:
-        return f"{frame_to_print}"
-    return json.dumps(decode(frame_to_print))
-
-
-async def async_receive_frame(port: str, settings: TeleinfoSettings):
-    slave_reader, _ = await serial_asyncio.open_serial_connection(
-        url=port,
-        baudrate=settings.baudrate,
-        bytesize=settings.bytesize,
-        parity=settings.parity,
-        stopbits=settings.stopbits,
-        rtscts=settings.rtscts,
+class SimulateCommand(BaseModel):
+    """Simulate teleinfo meters on pseudo-terminals, for tests without hardware."""
+
+    meters: int = Field(default=1, ge=1, description="Number of meters to simulate")
+    tariff: Literal["base", "hc", "ejp", "tempo"] = Field(default="hc", description="Tariff option of the meters")
+    replay: Path | None = Field(default=None, description="Replay the frames of this capture file instead")
+    speedup: float = Field(default=1.0, gt=0, description="Multiple of the line rate to write frames at")
+    duration: float | None = Field(default=None, gt=0, description="Duration in seconds, until interrupted if unset")
+
+    async def cli_cmd(self) -> None:
+        # pylint: disable=import-outside-toplevel
+        from ..labels import TariffOption
+        from ..settings import TeleinfoSettings
+
+        # POSIX only (pseudo-terminals)
+        from ..simulator import MeterSimulator, ReplayMeter, SimulatedMeter
+
+        settings = TeleinfoSettings()
+        if self.replay is not None:
+            data = self.replay.read_bytes()
+            meters: list[SimulatedMeter | ReplayMeter] = [
+                ReplayMeter.from_capture(data, offset=index) for index in range(self.meters)
+            ]
+        else:
+            option = {
+                "base": TariffOption.BASE,
+                "hc": TariffOption.OFF_PEAK,
+                "ejp": TariffOption.EJP,
+                "tempo": TariffOption.TEMPO,
+            }[self.tariff]
+            meters = [SimulatedMeter(option, seed=index, baudrate=settings.baudrate) for index in range(self.meters)]
+        with MeterSimulator(meters, baudrate=settings.baudrate, speedup=self.speedup) as simulator:
+            for port in simulator.ports:
+                print(port)
+            # Let the ports be printed before frames are written
+            sys.stdout.flush()
+            await simulator.run(self.duration)
+        print(f"{simulator.frames_sent} frames sent, {simulator.frames_dropped} dropped", file=sys.stderr)
+
+
+class DecodeFileCommand(BaseModel):
+    """Decode a raw capture file in parallel, to NDJSON or to a columnar recording."""
+
+    path: CliPositionalArg[Path]
+    output: Path | None = Field(
+        default=None, description="NDJSON file, stdout if unset, or recording directory with --format columnar"
     )
-    # TODO make sure this stops after a timeout
-    return await slave_reader.readuntil(separator=ETX_TOKEN.encode(ENCODING))
+    output_format: Literal["ndjson", "columnar"] = Field(default="ndjson", alias="format", description="Output format")
+    workers: int | None = Field(default=None, ge=1, description="Number of processes, the number of CPUs if unset")
+    shard_size: int = Field(default=4, ge=1, description="Size of the shards decoded by each process, in MB")
+    progress: CliImplicitFlag[bool] = Field(default=False, description="Print the progress on stderr")
+
+    def cli_cmd(self) -> None:
+        # pylint: disable=import-outside-toplevel
+        from ..parallel import decode_file, print_progress
+        from ..settings import TeleinfoSettings
+
+        if self.output_format == "columnar" and self.output is None:
+            sys.exit("--output is required with --format columnar")
+        settings = TeleinfoSettings()
+        stats = decode_file(
+            self.path,
+            self.output if self.output is not None else sys.stdout.buffer,
+            output_format=self.output_format,
+            mode=settings.mode,
+            shard_size=self.shard_size << 20,
+            workers=self.workers,
+            progress=print_progress if self.progress else None,
+        )
+        if self.output is None:
+            sys.stdout.flush()
+        if self.progress:
+            print(file=sys.stderr)
+        # The clock may not tick while decoding a tiny file
+        megabytes_per_second = stats.bytes / 1e6 / max(stats.elapsed, 1e-9)
+        print(
+            f"{stats.frames} frames decoded, {stats.errors} invalid frames skipped, {megabytes_per_second:.1f} MB/s",
+            file=sys.stderr,
+        )
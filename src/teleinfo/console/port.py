@@ -0,0 +1,185 @@
+"""Implementation of the ``port`` command, imported when the command runs."""
+
+import asyncio
+import json
+import os
+import sys
+import termios
+import time
+from pathlib import Path
+from typing import BinaryIO
+
+from .. import metrics
+from ..aggregate import WindowAggregator
+from ..changes import ChangeDetector
+from ..codec import decode
+from ..exceptions import TeleinfoError
+from ..settings import TeleinfoSettings
+from ..standard import decode_standard
+from ..stream import TeleinfoStream
+
+
+def start_metrics(metrics_port: int | None, metrics_file: Path | None) -> metrics.TextfileWriter | None:
+    """Collect metrics if they are exported to ``metrics_port`` or ``metrics_file``.
+
+    Returns:
+        The writer of the metrics file, to stop at exit, if any.
+    """
+    if metrics_port is None and metrics_file is None:
+        return None
+    teleinfo_metrics = metrics.TeleinfoMetrics()
+    metrics.add_hook(teleinfo_metrics)
+    if metrics_port is not None:
+        metrics.start_http_server(teleinfo_metrics.registry, metrics_port)
+    if metrics_file is None:
+        return None
+    metrics_writer = metrics.TextfileWriter(teleinfo_metrics.registry, metrics_file)
+    metrics_writer.start()
+    return metrics_writer
+
+
+async def check_port(port: str, settings: TeleinfoSettings, raw_flag: bool = False) -> bool:
+    success = True
+    print(
+        f"Trying to read port '{port}' for {settings.timeout} secs... Will print a max of {settings.max_frames} frames..."
+    )
+    try:
+        async with TeleinfoStream(port, settings) as stream:
+            for _ in range(settings.max_frames):
+                print(_format_frame(port, await stream.read_frame(), raw_flag, settings.mode))
+    except TimeoutError:
+        print("Timeout!")
+        success = False
+    except (OSError, termios.error) as exception:
+        print(f"Error opening port '{port}': {exception}", file=sys.stderr)
+        success = False
+    except (TeleinfoError, EOFError) as exception:
+        print(f"Error: {repr(exception)}", file=sys.stderr)
+        success = False
+    # Add a sleep so that output buffer can be flushed
+    await asyncio.sleep(0)
+    return success
+
+
+async def follow_port(
+    port: str,
+    settings: TeleinfoSettings,
+    raw_flag: bool = False,
+    flush_interval: float = 1.0,
+    output: BinaryIO | None = None,
+    aggregator: WindowAggregator | None = None,
+    detector: ChangeDetector | None = None,
+) -> bool:
+    """Stream the frames of a port to ``output`` (stdout by default) until the port closes.
+
+    Frames are written as JSON lines, with their receive time as ``timestamp``, or
+    verbatim with ``raw_flag``, into a buffer flushed every ``flush_interval`` seconds.
+    With an ``aggregator``, the summary of each window is written instead of the frames,
+    and with a change ``detector``, the changes of each frame.
+    Frames that cannot be decoded and read timeouts are reported on stderr, without
+    stopping the stream. A closed output (e.g. the reader of a pipe exited) stops it.
+    """
+    output = sys.stdout.buffer if output is None else output
+    success = True
+    try:
+        try:
+            async with TeleinfoStream(port, settings) as stream, asyncio.TaskGroup() as tasks:
+                flusher = tasks.create_task(_flush_periodically(output, flush_interval)) if flush_interval else None
+                await _write_frames(stream, output, raw_flag, flush_interval, settings, aggregator, detector)
+                if flusher is not None:
+                    flusher.cancel()
+        finally:
+            output.flush()
+    except* BrokenPipeError:
+        # Python flushes stdout again at exit: redirect it so that it exits quietly
+        if output is sys.stdout.buffer:
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+    except* (OSError, termios.error) as exception_group:
+        print(f"Error on port '{port}': {exception_group.exceptions[0]}", file=sys.stderr)
+        success = False
+    return success
+
+
+async def _write_frames(
+    stream: TeleinfoStream,
+    output: BinaryIO,
+    raw_flag: bool,
+    flush_interval: float,
+    settings: TeleinfoSettings,
+    aggregator: WindowAggregator | None = None,
+    detector: ChangeDetector | None = None,
+) -> None:
+    while True:
+        try:
+            frame = await stream.read_frame()
+        except TimeoutError:
+            print(f"No frame received for {settings.timeout} secs", file=sys.stderr)
+            continue
+        except EOFError:
+            if aggregator is not None and (summary := aggregator.flush()) is not None:
+                output.write(f"{json.dumps(summary.to_dict())}\n".encode())
+            return
+        received = time.time()
+        if raw_flag:
+            output.write(frame)
+        else:
+            if detector is not None:
+                line = _change_line(detector, frame, received)
+            else:
+                line = _frame_line(stream.port, frame, received, settings.mode, aggregator)
+            if line is None:
+                continue
+            output.write(line)
+        if not flush_interval:
+            output.flush()
+
+
+def _change_line(detector: ChangeDetector, frame: bytes, received: float) -> bytes | None:
+    # JSON line of the changes of the frame, None if there is nothing to write
+    try:
+        event = detector.feed(frame, received)
+    except (TeleinfoError, UnicodeDecodeError) as exception:
+        print(f"Error: {repr(exception)}", file=sys.stderr)
+        return None
+    if event is None:
+        return None
+    return f"{json.dumps(event.to_dict())}\n".encode()
+
+
+def _frame_line(
+    port: str, frame: bytes, received: float, mode: str, aggregator: WindowAggregator | None
+) -> bytes | None:
+    # JSON line of the frame, or of the window it completes, None if there is nothing to write
+    try:
+        data = _frame_data(port, frame, mode)
+    except (TeleinfoError, UnicodeDecodeError) as exception:
+        print(f"Error: {repr(exception)}", file=sys.stderr)
+        return None
+    if aggregator is None:
+        return f"{json.dumps({'timestamp': received, **data})}\n".encode()
+    if mode == "standard":
+        data = {label: info_group["data"] for label, info_group in data.items()}
+    if (summary := aggregator.add(data, received)) is None:
+        return None
+    return f"{json.dumps(summary.to_dict())}\n".encode()
+
+
+async def _flush_periodically(output: BinaryIO, flush_interval: float) -> None:
+    while True:
+        await asyncio.sleep(flush_interval)
+        output.flush()
+
+
+def _format_frame(port: str, frame: bytes, raw_flag: bool, mode: str = "historic") -> str:
+    if raw_flag:
+        return repr(frame)
+    return json.dumps(_frame_data(port, frame, mode))
+
+
+def _frame_data(port: str, frame: bytes, mode: str) -> dict:
+    if mode == "standard":
+        return {
+            label: {"horodate": info_group.horodate, "data": info_group.data}
+            for label, info_group in metrics.observe_decode(port, decode_standard, frame).items()
+        }
+    return metrics.observe_decode(port, decode, frame)
@@ -21,6 +21,14 @@ EOT_TOKEN = "\x04"
 LF_TOKEN = "\n"
 CR_TOKEN = "\r"
 
+#: Default max number of ports probed at the same time by port discovery.
+DEFAULT_CONCURRENCY = 8
+#: Default smallest reported change of numeric labels by change detection: apparent
+#: power (VA) and current (A).
+DEFAULT_DEADBANDS = {"PAPP": 50.0, "IINST": 1.0}
+#: Default interval between two full states sent by change detection, in seconds.
+DEFAULT_HEARTBEAT = 300.0
+
 # Dict keys for info groups
 LABEL_KEY = "label"
 DATA_KEY = "data"
@@ -0,0 +1,134 @@
+"""Discovery of the serial ports receiving teleinfo frames, probing ports concurrently."""
+
+from __future__ import annotations
+
+import asyncio
+import termios
+import time
+from collections.abc import Iterable
+
+from pydantic import BaseModel, Field, computed_field
+
+from .codec import decode
+from .const import DEFAULT_CONCURRENCY
+from .exceptions import TeleinfoError
+from .settings import TeleinfoSettings
+from .standard import decode_standard
+from .stream import TeleinfoStream
+
+
+class PortProbe(BaseModel):
+    """Result of the probing of one serial port."""
+
+    port: str = Field(description="Serial device path")
+    success: bool = Field(description="Whether the port received valid teleinfo frames")
+    frames: list[dict[str, str]] = Field(default_factory=list, description="Frames decoded while probing")
+    error: str | None = Field(default=None, description="Why the probing failed")
+    elapsed: float = Field(description="Probing duration in seconds")
+
+
+class DiscoveryResult(BaseModel):
+    """Result of :func:`discover_ports`."""
+
+    ports: list[str] = Field(description="Serial ports to probe")
+    probes: list[PortProbe] = Field(description="Completed probes, in completion order")
+    elapsed: float = Field(description="Discovery duration in seconds")
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def teleinfo_ports(self) -> list[str]:
+        """Ports found receiving valid teleinfo frames."""
+        return [probe.port for probe in self.probes if probe.success]
+
+
+async def probe_port(port: str, settings: TeleinfoSettings) -> PortProbe:
+    """Check whether a serial port receives valid teleinfo frames.
+
+    The port is successful once ``settings.max_frames`` frames are received and
+    decoded (according to ``settings.mode``), each within ``settings.timeout`` seconds.
+
+    Args:
+        port: Serial device path (e.g. ``"/dev/ttyUSB0"``).
+        settings: Serial, timeout and number of frames configuration.
+
+    Returns:
+        The probe result; errors are reported in it rather than raised.
+    """
+    start = time.monotonic()
+    frames = []
+    error = None
+    try:
+        async with TeleinfoStream(port, settings) as stream:
+            for _ in range(settings.max_frames):
+                frames.append(_decode_data(await stream.read_frame(), settings.mode))
+    except TimeoutError:
+        error = f"No frame received within {settings.timeout} secs"
+    except (OSError, termios.error) as exception:
+        error = f"Error opening port: {exception}"
+    except (TeleinfoError, UnicodeDecodeError, EOFError) as exception:
+        error = repr(exception)
+    return PortProbe(port=port, success=error is None, frames=frames, error=error, elapsed=time.monotonic() - start)
+
+
+def _decode_data(frame: bytes, mode: str) -> dict[str, str]:
+    if mode == "standard":
+        return {label: info_group.data for label, info_group in decode_standard(frame).items()}
+    return decode(frame)
+
+
+async def discover_ports(
+    ports: Iterable[str] | None = None,
+    settings: TeleinfoSettings | None = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    find_all: bool = False,
+) -> DiscoveryResult:
+    """Probe serial ports concurrently to find the ones receiving teleinfo frames.
+
+    At most ``concurrency`` ports are probed at the same time. Unless ``find_all`` is
+    set, the remaining probes are cancelled as soon as a port succeeds, so discovery
+    lasts about as long as the probing of the first teleinfo port.
+
+    Args:
+        ports: Serial device paths. Defaults to all the ports of the system
+            (``serial.tools.list_ports.comports()``) when ``None``.
+        settings: Serial, timeout and number of frames configuration. Defaults to
+            :class:`~teleinfo.settings.TeleinfoSettings` when ``None``.
+        concurrency: Max number of ports probed at the same time.
+        find_all: Probe all ports instead of stopping at the first teleinfo port.
+
+    Returns:
+        The ports and the completed probes. Cancelled probes are not reported.
+
+    Raises:
+        ValueError: ``concurrency`` is lower than 1.
+    """
+    if concurrency < 1:
+        raise ValueError(f"concurrency must be at least 1, got {concurrency}")
+    start = time.monotonic()
+    settings = settings if settings is not None else TeleinfoSettings()
+    if ports is None:
+        # Imported on demand, to keep the startup of the CLI fast
+        from serial.tools import list_ports  # pylint: disable=import-outside-toplevel
+
+        ports = [port.device for port in list_ports.comports()]
+    else:
+        ports = list(ports)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def limited_probe(port: str) -> PortProbe:
+        async with semaphore:
+            return await probe_port(port, settings)
+
+    probes = []
+    tasks = [asyncio.create_task(limited_probe(port)) for port in ports]
+    try:
+        for next_probe in asyncio.as_completed(tasks):
+            probe = await next_probe
+            probes.append(probe)
+            if probe.success and not find_all:
+                break
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    return DiscoveryResult(ports=ports, probes=probes, elapsed=time.monotonic() - start)
@@ -43,6 +43,7 @@ class ChecksumError(TeleinfoDecodingError):
     """The checksum of a group of information within a frame is invalid"""
 
     def __init__(self, label_data_and_separators, checksums, msg=None):
+        self.label_data_and_separators = label_data_and_separators
         if msg is None:
             msg = (
                 f"Needed checksum '{checksums[0]}' "
@@ -51,3 +52,12 @@ class ChecksumError(TeleinfoDecodingError):
                 f"nor by method 2 checksum (= '{checksums[2]}')"
             )
         super().__init__(msg)
+
+
+class LabelValueError(TeleinfoDecodingError):
+    """The data of an info group is not a valid value for its label"""
+
+    def __init__(self, label: str, data: str):
+        self.label = label
+        self.data = data
+        super().__init__(f"Invalid value '{data}' for label '{label}'")
@@ -0,0 +1,158 @@
+"""Lazily decoded teleinfo frame, backed by the raw frame bytes."""
+
+from __future__ import annotations
+
+import re
+from array import array
+from collections.abc import Iterator, Mapping
+
+from .codec import (
+    _decode_info_group_bytes,
+    _extract_info_groups_positions,
+    _verify_frame_well_formed,
+    decode,
+    decode_info_group,
+)
+from .const import CR_TOKEN, ENCODING, ETX_TOKEN, HT_TOKEN, LF_TOKEN, SP_TOKEN, STX_TOKEN
+
+
+_SP = ord(SP_TOKEN)
+_HT = ord(HT_TOKEN)
+_LF_BYTES = LF_TOKEN.encode(ENCODING)
+_CR_BYTES = CR_TOKEN.encode(ENCODING)
+_SP_BYTES = SP_TOKEN.encode(ENCODING)
+_HT_BYTES = HT_TOKEN.encode(ENCODING)
+# STX, info groups (LF, anything but LF/CR, CR), ETX
+_INFO_GROUP = re.compile(re.escape(_LF_BYTES) + b"[^" + re.escape(_LF_BYTES + _CR_BYTES) + b"]*" + re.escape(_CR_BYTES))
+_FRAME = re.compile(
+    re.escape(STX_TOKEN.encode(ENCODING)) + b"(?:" + _INFO_GROUP.pattern + b")*" + re.escape(ETX_TOKEN.encode(ENCODING))
+)
+
+
+class TeleinfoFrame(Mapping):
+    """Read-only mapping of the (label, data) info groups of a frame, decoded on access.
+
+    Only the structure of the frame (STX, ETX and LF/CR pairs) is verified on creation,
+    with the rules of :func:`~teleinfo.codec.decode`.
+    An info group is located, verified (format and checksum) and decoded the first
+    time its label is looked up, so reading a couple of labels of a frame costs a
+    fraction of a full :func:`~teleinfo.codec.decode`. The offset table of the info
+    groups is only built when iterating over the labels.
+
+    Example:
+        >>> frame = TeleinfoFrame(b"\\x02\\nIINST 009  \\r\\nPAPP 02160 *\\r\\x03")
+        >>> frame["PAPP"]
+        '02160'
+        >>> frame.to_dict()
+        {'IINST': '009', 'PAPP': '02160'}
+
+    Since info groups are verified lazily, looking up the label of an invalid info
+    group raises :class:`~teleinfo.exceptions.InfoGroupFormatError` or
+    :class:`~teleinfo.exceptions.ChecksumError` (not :class:`KeyError`), even through
+    :meth:`get`, while the other labels of the frame remain readable.
+
+    Args:
+        raw: Frame bytes, from STX through ETX (inclusive).
+
+    Raises:
+        FrameFormatError: The frame is not well formed.
+        UnicodeDecodeError: The frame is not well formed and contains non ASCII bytes.
+    """
+
+    __slots__ = ("raw", "_offsets", "_values", "_strict")
+
+    def __init__(self, raw: bytes | bytearray | memoryview) -> None:
+        #: Raw frame bytes.
+        self.raw = bytes(raw)
+        self._offsets: array | None = None
+        self._values: dict[str, str] | None = None
+        # Strictly well formed: each LF is followed by its CR, before the next LF
+        self._strict = _FRAME.fullmatch(self.raw) is not None
+        if not self._strict:
+            # decode() accepts any frame passing this verification, and pairs the nth LF
+            # with the nth CR
+            frame_string = self.raw.decode(ENCODING)
+            _verify_frame_well_formed(frame_string)
+            beginnings, endings = _extract_info_groups_positions(frame_string)
+            self._offsets = array(
+                "I", [position for pair in zip(beginnings, endings, strict=True) for position in (pair[0], pair[1] + 1)]
+            )
+
+    def __getitem__(self, label: str) -> str:
+        if self._values is not None and label in self._values:
+            return self._values[label]
+        beginning, ending = self._find_info_group(label)
+        if beginning < 0:
+            raise KeyError(label)
+        label_and_data = _decode_info_group_bytes(self.raw[beginning + 1 : ending])
+        if label_and_data is None:
+            # Raise the exact error decode() would raise, or decode as it does
+            label_and_data = decode_info_group(self.raw[beginning : ending + 1].decode(ENCODING))
+        if label_and_data[0] != label:
+            raise KeyError(label)
+        if self._values is None:
+            self._values = {}
+        self._values[label] = label_and_data[1]
+        return label_and_data[1]
+
+    def _find_info_group(self, label: str) -> tuple[int, int]:
+        """Return the positions of the LF and CR of the last info group labelled ``label``, or -1."""
+        if not isinstance(label, str) or not label.isascii():
+            return -1, -1
+        key = _LF_BYTES + label.encode(ENCODING)
+        raw = self.raw
+        offsets = self._offsets
+        if not self._strict and offsets is not None:
+            # Info groups as paired by decode(), which may contain LFs
+            for index in range(len(offsets) - 2, -1, -2):
+                beginning, ending = offsets[index], offsets[index + 1] - 1
+                separator = beginning + len(key)
+                if separator < ending and raw.startswith(key, beginning) and raw[separator] in (_SP, _HT):
+                    return beginning, ending
+            return -1, -1
+        # An LF can only begin an info group, and the label is followed by a separator
+        position = raw.rfind(key)
+        while position >= 0 and raw[position + len(key)] not in (_SP, _HT):
+            position = raw.rfind(key, 0, position)
+        if position < 0:
+            return -1, -1
+        return position, raw.find(_CR_BYTES, position)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.labels())
+
+    def __len__(self) -> int:
+        return len(self.labels())
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.raw!r})"
+
+    def labels(self) -> list[str]:
+        """Labels of the frame, in order, without verifying the info groups.
+
+        Returns:
+            Label of each info group (the first occurrence of duplicated labels only).
+        """
+        raw = self.raw
+        if self._offsets is None:
+            # Spans of the info groups (LF, after CR), interleaved
+            self._offsets = array("I", [position for match in _INFO_GROUP.finditer(raw) for position in match.span()])
+        labels: dict[str, None] = {}
+        for beginning, ending in zip(self._offsets[::2], self._offsets[1::2], strict=True):
+            # The label ends at the first separator (SP, or HT if there is no SP)
+            separator = raw.find(_SP_BYTES, beginning, ending)
+            if separator < 0:
+                separator = raw.find(_HT_BYTES, beginning, ending)
+            labels[raw[beginning + 1 : ending - 1 if separator < 0 else separator].decode(ENCODING)] = None
+        return list(labels)
+
+    def to_dict(self) -> dict[str, str]:
+        """Decode the whole frame, as :func:`~teleinfo.codec.decode` does.
+
+        Returns:
+            A dict of (label, data) key/value pairs extracted from the frame.
+
+        Raises:
+            TeleinfoDecodingError: An info group of the frame is invalid.
+        """
+        return decode(self.raw)
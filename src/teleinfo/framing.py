@@ -0,0 +1,118 @@
+"""Incremental Teleinfo framing: split a raw byte stream into frames."""
+
+from __future__ import annotations
+
+import re
+
+from .const import ENCODING, EOT_TOKEN, ETX_TOKEN, STX_TOKEN
+
+
+_STX = STX_TOKEN.encode(ENCODING)
+_ETX = ETX_TOKEN.encode(ENCODING)
+_EOT = EOT_TOKEN.encode(ENCODING)
+_CONTROL_CHARS = re.compile(b"[" + re.escape(_STX + _ETX + _EOT) + b"]")
+
+
+class FrameParser:
+    """Push parser extracting complete frames from arbitrary chunks of a byte stream.
+
+    Chunks are fed as they are read (one byte, or everything waiting on the serial
+    port), and complete frames, from STX through ETX (inclusive), are returned as soon
+    as their ETX is received. Bytes received outside of a frame are discarded. A frame
+    in progress is dropped (a *resync*) when:
+
+    * an STX is received before its ETX: the frame restarts at the new STX,
+    * an EOT is received: the meter interrupted its transmission,
+    * it grows beyond ``max_frame_size`` bytes without an ETX.
+
+    Example:
+        >>> parser = FrameParser()
+        >>> parser.feed(b"junk\\x02\\nADCO 050022120078 2")
+        []
+        >>> parser.feed(b"\\r\\x03\\x02")
+        [b'\\x02\\nADCO 050022120078 2\\r\\x03']
+        >>> parser.in_frame
+        True
+
+    Args:
+        max_frame_size: Maximum size of a frame in bytes, STX and ETX included.
+            ``None`` for no limit.
+    """
+
+    __slots__ = ("max_frame_size", "discarded_bytes", "resyncs", "_buffer", "_in_frame", "_scanned")
+
+    def __init__(self, max_frame_size: int | None = None) -> None:
+        self.max_frame_size = max_frame_size
+        #: Number of bytes received outside of a frame.
+        self.discarded_bytes = 0
+        #: Number of incomplete frames dropped.
+        self.resyncs = 0
+        self._buffer = bytearray()
+        self._in_frame = False
+        self._scanned = 0
+
+    @property
+    def in_frame(self) -> bool:
+        """Whether an STX was received and the parser is waiting for the frame's ETX."""
+        return self._in_frame
+
+    def reset(self) -> None:
+        """Drop any frame in progress, e.g. after reopening the port."""
+        self._buffer.clear()
+        self._in_frame = False
+        self._scanned = 0
+
+    def feed(self, data: bytes) -> list[bytes]:
+        """Push a chunk of received bytes.
+
+        Args:
+            data: Bytes received, of any length.
+
+        Returns:
+            The frames completed by this chunk, in order (usually none or one).
+        """
+        buffer = self._buffer
+        buffer += data
+        frames = []
+        while buffer:
+            if not self._in_frame:
+                stx = buffer.find(_STX)
+                if stx < 0:
+                    self.discarded_bytes += len(buffer)
+                    buffer.clear()
+                    break
+                if stx:
+                    self.discarded_bytes += stx
+                    del buffer[:stx]
+                self._in_frame = True
+                self._scanned = 1
+
+            match = _CONTROL_CHARS.search(buffer, self._scanned)
+            if match is None:
+                self._scanned = len(buffer)
+                if self.max_frame_size is not None and len(buffer) > self.max_frame_size:
+                    self._drop(len(buffer))
+                break
+
+            position = match.start()
+            token = buffer[position : position + 1]
+            if token == _ETX:
+                if self.max_frame_size is None or position < self.max_frame_size:
+                    frames.append(bytes(buffer[: position + 1]))
+                    del buffer[: position + 1]
+                    self._in_frame = False
+                else:
+                    self._drop(position + 1)
+            elif token == _STX:
+                self.resyncs += 1
+                del buffer[:position]
+                self._scanned = 1
+            else:
+                self._drop(position + 1)
+        return frames
+
+    def _drop(self, length: int) -> None:
+        """Drop the frame in progress, made of the first ``length`` bytes of the buffer."""
+        self.resyncs += 1
+        del self._buffer[:length]
+        self._in_frame = False
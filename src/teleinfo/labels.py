@@ -0,0 +1,265 @@
+"""Registry of the labels of historic teleinfo frames, with their typed converters.
+
+:func:`~teleinfo.codec.decode` returns the data of every info group as a string.
+:func:`decode_typed` converts it once, at decode time, with the converter registered
+for its label in :data:`LABELS`: indexes and currents become ``int``, tariff options
+and periods become enums, and identifiers (``ADCO``, ``MOTDETAT``...) stay strings.
+
+.. code-block:: python
+
+    >>> decode_typed(b"\\x02\\nPTEC HP..  \\r\\nPAPP 02160 *\\r\\x03")
+    {'PTEC': <TariffPeriod.PEAK: 'HP..'>, 'PAPP': 2160}
+    >>> LABELS["PAPP"].unit
+    'VA'
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from enum import StrEnum
+from typing import Any, NamedTuple
+
+from .codec import InfoGroupCache, decode
+from .exceptions import LabelValueError
+
+
+class TariffOption(StrEnum):
+    """Tariff option of the meter (``OPTARIF``)."""
+
+    BASE = "BASE"
+    OFF_PEAK = "HC.."
+    EJP = "EJP."
+    #: ``BBRx``, ``x`` encoding the Tempo program of the meter
+    TEMPO = "BBR"
+
+    @classmethod
+    def _missing_(cls, value: object) -> TariffOption | None:
+        if isinstance(value, str) and value.startswith(cls.TEMPO.value):
+            return cls.TEMPO
+        return None
+
+
+class TariffPeriod(StrEnum):
+    """Current tariff period (``PTEC``)."""
+
+    ALL_HOURS = "TH.."
+    OFF_PEAK = "HC.."
+    PEAK = "HP.."
+    NORMAL = "HN.."
+    MOBILE_PEAK = "PM.."
+    OFF_PEAK_BLUE_DAY = "HCJB"
+    OFF_PEAK_WHITE_DAY = "HCJW"
+    OFF_PEAK_RED_DAY = "HCJR"
+    PEAK_BLUE_DAY = "HPJB"
+    PEAK_WHITE_DAY = "HPJW"
+    PEAK_RED_DAY = "HPJR"
+
+
+class TomorrowColor(StrEnum):
+    """Color of the next day for the Tempo option (``DEMAIN``)."""
+
+    UNKNOWN = "----"
+    BLUE = "BLEU"
+    WHITE = "BLAN"
+    RED = "ROUG"
+
+
+def _enum_converter(enum_type: type[StrEnum]) -> Callable[[str], StrEnum]:
+    """Return a converter to ``enum_type`` looking up its members by value first (faster
+    than calling ``enum_type``), and remembering the other values accepted by ``enum_type``."""
+    members = {member.value: member for member in enum_type}
+
+    def convert(data: str) -> StrEnum:
+        member = members.get(data)
+        if member is None:
+            member = members[data] = enum_type(data)
+        return member
+
+    return convert
+
+
+class LabelSpec(NamedTuple):
+    """Specification of a label of teleinfo frames."""
+
+    #: Label, as found in the frames.
+    label: str
+    #: Callable converting the data string of the label.
+    converter: Callable[[str], Any]
+    #: Unit of the converted value, if any.
+    unit: str | None
+    #: Designation of the label.
+    description: str
+
+
+def _specs(*specs: LabelSpec) -> dict[str, LabelSpec]:
+    return {spec.label: spec for spec in specs}
+
+
+#: Labels of historic frames (single and three phase meters), by label.
+LABELS: dict[str, LabelSpec] = _specs(
+    LabelSpec("ADCO", str, None, "Meter address"),
+    LabelSpec("OPTARIF", _enum_converter(TariffOption), None, "Tariff option"),
+    LabelSpec("ISOUSC", int, "A", "Subscribed current"),
+    LabelSpec("BASE", int, "Wh", "Base option index"),
+    LabelSpec("HCHC", int, "Wh", "Off-peak hours index"),
+    LabelSpec("HCHP", int, "Wh", "Peak hours index"),
+    LabelSpec("EJPHN", int, "Wh", "EJP normal hours index"),
+    LabelSpec("EJPHPM", int, "Wh", "EJP mobile peak hours index"),
+    LabelSpec("BBRHCJB", int, "Wh", "Tempo off-peak hours index, blue days"),
+    LabelSpec("BBRHPJB", int, "Wh", "Tempo peak hours index, blue days"),
+    LabelSpec("BBRHCJW", int, "Wh", "Tempo off-peak hours index, white days"),
+    LabelSpec("BBRHPJW", int, "Wh", "Tempo peak hours index, white days"),
+    LabelSpec("BBRHCJR", int, "Wh", "Tempo off-peak hours index, red days"),
+    LabelSpec("BBRHPJR", int, "Wh", "Tempo peak hours index, red days"),
+    LabelSpec("PEJP", int, "min", "EJP start notice"),
+    LabelSpec("PTEC", _enum_converter(TariffPeriod), None, "Current tariff period"),
+    LabelSpec("DEMAIN", _enum_converter(TomorrowColor), None, "Tomorrow color"),
+    LabelSpec("IINST", int, "A", "Instantaneous current"),
+    LabelSpec("IINST1", int, "A", "Instantaneous current, phase 1"),
+    LabelSpec("IINST2", int, "A", "Instantaneous current, phase 2"),
+    LabelSpec("IINST3", int, "A", "Instantaneous current, phase 3"),
+    LabelSpec("ADPS", int, "A", "Subscribed power overrun warning"),
+    LabelSpec("ADIR1", int, "A", "Subscribed current overrun warning, phase 1"),
+    LabelSpec("ADIR2", int, "A", "Subscribed current overrun warning, phase 2"),
+    LabelSpec("ADIR3", int, "A", "Subscribed current overrun warning, phase 3"),
+    LabelSpec("IMAX", int, "A", "Maximum current"),
+    LabelSpec("IMAX1", int, "A", "Maximum current, phase 1"),
+    LabelSpec("IMAX2", int, "A", "Maximum current, phase 2"),
+    LabelSpec("IMAX3", int, "A", "Maximum current, phase 3"),
+    LabelSpec("PMAX", int, "W", "Maximum three phase power"),
+    LabelSpec("PAPP", int, "VA", "Apparent power"),
+    LabelSpec("HHPHC", str, None, "Peak/off-peak hours schedule"),
+    LabelSpec("MOTDETAT", str, None, "Meter status word"),
+    LabelSpec("PPOT", str, None, "Potentials presence"),
+    LabelSpec("GAZ", int, "dal", "Gas index"),
+    LabelSpec("AUTRE", int, "dal", "Third meter index"),
+)
+
+#: Labels of standard mode frames (Linky meters), by label.
+STANDARD_LABELS: dict[str, LabelSpec] = _specs(
+    LabelSpec("ADSC", str, None, "Meter secondary address"),
+    LabelSpec("VTIC", str, None, "Teleinfo version"),
+    LabelSpec("DATE", str, None, "Current date and time"),
+    LabelSpec("NGTF", str, None, "Supplier tariff calendar name"),
+    LabelSpec("LTARF", str, None, "Current supplier tariff label"),
+    LabelSpec("EAST", int, "Wh", "Total active energy withdrawn"),
+    LabelSpec("EASF01", int, "Wh", "Active energy withdrawn, supplier index 1"),
+    LabelSpec("EASF02", int, "Wh", "Active energy withdrawn, supplier index 2"),
+    LabelSpec("EASF03", int, "Wh", "Active energy withdrawn, supplier index 3"),
+    LabelSpec("EASF04", int, "Wh", "Active energy withdrawn, supplier index 4"),
+    LabelSpec("EASF05", int, "Wh", "Active energy withdrawn, supplier index 5"),
+    LabelSpec("EASF06", int, "Wh", "Active energy withdrawn, supplier index 6"),
+    LabelSpec("EASF07", int, "Wh", "Active energy withdrawn, supplier index 7"),
+    LabelSpec("EASF08", int, "Wh", "Active energy withdrawn, supplier index 8"),
+    LabelSpec("EASF09", int, "Wh", "Active energy withdrawn, supplier index 9"),
+    LabelSpec("EASF10", int, "Wh", "Active energy withdrawn, supplier index 10"),
+    LabelSpec("EASD01", int, "Wh", "Active energy withdrawn, distributor index 1"),
+    LabelSpec("EASD02", int, "Wh", "Active energy withdrawn, distributor index 2"),
+    LabelSpec("EASD03", int, "Wh", "Active energy withdrawn, distributor index 3"),
+    LabelSpec("EASD04", int, "Wh", "Active energy withdrawn, distributor index 4"),
+    LabelSpec("EAIT", int, "Wh", "Total active energy injected"),
+    LabelSpec("ERQ1", int, "VArh", "Total reactive energy, quadrant 1"),
+    LabelSpec("ERQ2", int, "VArh", "Total reactive energy, quadrant 2"),
+    LabelSpec("ERQ3", int, "VArh", "Total reactive energy, quadrant 3"),
+    LabelSpec("ERQ4", int, "VArh", "Total reactive energy, quadrant 4"),
+    LabelSpec("IRMS1", int, "A", "RMS current, phase 1"),
+    LabelSpec("IRMS2", int, "A", "RMS current, phase 2"),
+    LabelSpec("IRMS3", int, "A", "RMS current, phase 3"),
+    LabelSpec("URMS1", int, "V", "RMS voltage, phase 1"),
+    LabelSpec("URMS2", int, "V", "RMS voltage, phase 2"),
+    LabelSpec("URMS3", int, "V", "RMS voltage, phase 3"),
+    LabelSpec("PREF", int, "kVA", "Reference apparent power"),
+    LabelSpec("PCOUP", int, "kVA", "Cut-off apparent power"),
+    LabelSpec("SINSTS", int, "VA", "Instantaneous apparent power withdrawn"),
+    LabelSpec("SINSTS1", int, "VA", "Instantaneous apparent power withdrawn, phase 1"),
+    LabelSpec("SINSTS2", int, "VA", "Instantaneous apparent power withdrawn, phase 2"),
+    LabelSpec("SINSTS3", int, "VA", "Instantaneous apparent power withdrawn, phase 3"),
+    LabelSpec("SMAXSN", int, "VA", "Max apparent power withdrawn of the day"),
+    LabelSpec("SMAXSN1", int, "VA", "Max apparent power withdrawn of the day, phase 1"),
+    LabelSpec("SMAXSN2", int, "VA", "Max apparent power withdrawn of the day, phase 2"),
+    LabelSpec("SMAXSN3", int, "VA", "Max apparent power withdrawn of the day, phase 3"),
+    LabelSpec("SMAXSN-1", int, "VA", "Max apparent power withdrawn of the previous day"),
+    LabelSpec("SMAXSN1-1", int, "VA", "Max apparent power withdrawn of the previous day, phase 1"),
+    LabelSpec("SMAXSN2-1", int, "VA", "Max apparent power withdrawn of the previous day, phase 2"),
+    LabelSpec("SMAXSN3-1", int, "VA", "Max apparent power withdrawn of the previous day, phase 3"),
+    LabelSpec("SINSTI", int, "VA", "Instantaneous apparent power injected"),
+    LabelSpec("SMAXIN", int, "VA", "Max apparent power injected of the day"),
+    LabelSpec("SMAXIN-1", int, "VA", "Max apparent power injected of the previous day"),
+    LabelSpec("CCASN", int, "W", "Active load curve point withdrawn"),
+    LabelSpec("CCASN-1", int, "W", "Previous active load curve point withdrawn"),
+    LabelSpec("CCAIN", int, "W", "Active load curve point injected"),
+    LabelSpec("CCAIN-1", int, "W", "Previous active load curve point injected"),
+    LabelSpec("UMOY1", int, "V", "Mean voltage, phase 1"),
+    LabelSpec("UMOY2", int, "V", "Mean voltage, phase 2"),
+    LabelSpec("UMOY3", int, "V", "Mean voltage, phase 3"),
+    LabelSpec("STGE", str, None, "Status register"),
+    LabelSpec("DPM1", str, None, "Start of mobile peak 1"),
+    LabelSpec("FPM1", str, None, "End of mobile peak 1"),
+    LabelSpec("DPM2", str, None, "Start of mobile peak 2"),
+    LabelSpec("FPM2", str, None, "End of mobile peak 2"),
+    LabelSpec("DPM3", str, None, "Start of mobile peak 3"),
+    LabelSpec("FPM3", str, None, "End of mobile peak 3"),
+    LabelSpec("MSG1", str, None, "Short message"),
+    LabelSpec("MSG2", str, None, "Very short message"),
+    LabelSpec("PRM", str, None, "Delivery point reference"),
+    LabelSpec("RELAIS", int, None, "Relays status"),
+    LabelSpec("NTARF", int, None, "Current tariff index"),
+    LabelSpec("NJOURF", int, None, "Current day number in the supplier calendar"),
+    LabelSpec("NJOURF+1", int, None, "Next day number in the supplier calendar"),
+    LabelSpec("PJOURF+1", str, None, "Profile of the next day"),
+    LabelSpec("PPOINTE", str, None, "Profile of the next peak day"),
+)
+
+# Converter of each label, looked up once per info group by decode_typed()
+_CONVERTERS: dict[str, Callable[[str], Any]] = {
+    spec.label: spec.converter for spec in LABELS.values() if spec.converter is not str
+}
+
+
+def convert(label: str, data: str) -> Any:
+    """Convert the data of an info group with the converter registered for its label.
+
+    Args:
+        label: Label of the info group.
+        data: Data of the info group, as decoded.
+
+    Returns:
+        The converted value, or ``data`` for unknown and string labels.
+
+    Raises:
+        LabelValueError: ``data`` is not valid for ``label``.
+    """
+    converter = _CONVERTERS.get(label)
+    if converter is None:
+        return data
+    try:
+        return converter(data)
+    except ValueError as exception:
+        raise LabelValueError(label, data) from exception
+
+
+def decode_typed(frame, cache: InfoGroupCache | None = None) -> dict[str, Any]:
+    """Decode a frame as :func:`~teleinfo.codec.decode` does, and convert its data.
+
+    Args:
+        frame: Teleinfo frame, in string or bytes format.
+        cache: Optional cache of the info groups already decoded.
+
+    Returns:
+        A dict of (label, value) pairs, values being converted according to
+        :data:`LABELS` (unknown labels are kept as strings).
+
+    Raises:
+        TeleinfoDecodingError: The frame cannot be decoded, or a value cannot be
+            converted (:class:`~teleinfo.exceptions.LabelValueError`).
+    """
+    decoded_frame: dict[str, Any] = decode(frame, cache=cache)
+    converters = _CONVERTERS
+    for label, data in decoded_frame.items():
+        converter = converters.get(label)
+        if converter is not None:
+            try:
+                decoded_frame[label] = converter(data)
+            except ValueError as exception:
+                raise LabelValueError(label, data) from exception
+    return decoded_frame
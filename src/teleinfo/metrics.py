@@ -0,0 +1,414 @@
+"""Operational metrics of the serial readers and of decoding.
+
+The readers (:class:`~teleinfo.stream.TeleinfoStream`,
+:class:`~teleinfo.stream.TeleinfoMultiStream`, :class:`~teleinfo.serial_reader.TeleinfoReader`)
+report the frames they receive, their resyncs and their timeouts, and
+:func:`observe_decode` reports decode times and errors, to the hooks registered with
+:func:`add_hook`. Without hooks, which is the default, reporting costs a check of an
+empty list per read and per decode.
+
+:class:`TeleinfoMetrics` is a hook maintaining counters and histograms per port, in
+a :class:`MetricsRegistry` rendered in the Prometheus text format, to a file or over
+a local HTTP endpoint:
+
+.. code-block:: python
+
+    from teleinfo import metrics
+
+    teleinfo_metrics = metrics.TeleinfoMetrics()
+    metrics.add_hook(teleinfo_metrics)
+    metrics.start_http_server(teleinfo_metrics.registry, 9464)
+
+    async with TeleinfoStream("/dev/ttyUSB0") as stream:
+        async for frame in stream:
+            decoded_frame = metrics.observe_decode(stream.port, decode, frame)
+
+Frame and byte rates are derived from the ``teleinfo_frames_total`` and
+``teleinfo_bytes_total`` counters (e.g. ``rate(teleinfo_frames_total[5m])``).
+"""
+
+from __future__ import annotations
+
+import bisect
+import math
+import os
+import threading
+import time
+from collections.abc import Callable, Iterable, Sequence
+from pathlib import Path
+from typing import TypeVar
+
+from .exceptions import ChecksumError, FrameFormatError, InfoGroupFormatError, LabelValueError
+from .framing import FrameParser
+
+
+#: Default buckets of the decode time histogram, in seconds.
+DECODE_BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01)
+#: Default buckets of the histogram of the time from STX reception to decoding, in seconds.
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+#: Content type of the Prometheus text format.
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_T = TypeVar("_T")
+
+
+class MetricsHook:
+    """Receiver of the events reported by the readers and :func:`observe_decode`.
+
+    Methods do nothing by default: subclasses override the ones they need. They are
+    called in the thread (or event loop) of the reader, and should return quickly.
+    """
+
+    def frame_received(self, port: str, frame: bytes, started: float) -> None:
+        """A complete frame was received.
+
+        Args:
+            port: Port the frame was received on.
+            frame: Raw frame, from STX through ETX.
+            started: ``time.monotonic()`` when the chunk holding its STX was read.
+        """
+
+    def frames_resynced(self, port: str, count: int) -> None:
+        """Incomplete frames were dropped (see :attr:`~teleinfo.framing.FrameParser.resyncs`)."""
+
+    def read_timed_out(self, port: str) -> None:
+        """No complete frame was received within the timeout of the reader."""
+
+    def frame_decoded(self, port: str, seconds: float) -> None:
+        """A frame received on ``port`` was decoded in ``seconds``."""
+
+    def decode_failed(self, port: str, exception: Exception) -> None:
+        """A frame received on ``port`` could not be decoded."""
+
+
+_hooks: list[MetricsHook] = []
+
+
+def add_hook(hook: MetricsHook) -> None:
+    """Start reporting events to ``hook``."""
+    _hooks.append(hook)
+
+
+def remove_hook(hook: MetricsHook) -> None:
+    """Stop reporting events to ``hook``."""
+    _hooks.remove(hook)
+
+
+def has_hooks() -> bool:
+    """Whether events are reported to hooks, so that they are worth observing."""
+    return bool(_hooks)
+
+
+def observe_decode(port: str, decoder: Callable[[bytes], _T], frame: bytes) -> _T:
+    """Decode a frame, reporting the decode time or the error to the hooks.
+
+    Args:
+        port: Port the frame was received on.
+        decoder: Decoding function, e.g. :func:`~teleinfo.codec.decode`.
+        frame: Raw frame.
+
+    Returns:
+        The result of ``decoder(frame)``, whose exceptions are propagated.
+    """
+    if not _hooks:
+        return decoder(frame)
+    start = time.perf_counter()
+    try:
+        result = decoder(frame)
+    except Exception as exception:
+        for hook in _hooks:
+            hook.decode_failed(port, exception)
+        raise
+    seconds = time.perf_counter() - start
+    for hook in _hooks:
+        hook.frame_decoded(port, seconds)
+    return result
+
+
+def read_timed_out(port: str) -> None:
+    """Report a read timeout of ``port`` to the hooks."""
+    for hook in _hooks:
+        hook.read_timed_out(port)
+
+
+class PortObserver:
+    """Feeds a :class:`~teleinfo.framing.FrameParser` and reports its frames and resyncs.
+
+    Used by the readers in place of :meth:`FrameParser.feed` while hooks are registered.
+    The STX of a frame is dated by the read of the chunk it arrived in.
+
+    Args:
+        port: Port the chunks are read from.
+        parser: Parser of the port.
+    """
+
+    __slots__ = ("port", "parser", "_resyncs", "_frame_started")
+
+    def __init__(self, port: str, parser: FrameParser) -> None:
+        self.port = port
+        self.parser = parser
+        self._resyncs = parser.resyncs
+        self._frame_started: float | None = None
+
+    def feed(self, data: bytes) -> list[bytes]:
+        """Same as :meth:`FrameParser.feed`, reporting the events to the hooks."""
+        now = time.monotonic()
+        parser = self.parser
+        was_in_frame = parser.in_frame
+        frames = parser.feed(data)
+        resyncs = parser.resyncs - self._resyncs
+        if resyncs:
+            self._resyncs = parser.resyncs
+            for hook in _hooks:
+                hook.frames_resynced(self.port, resyncs)
+        for index, frame in enumerate(frames):
+            # Only the first frame can have started in a previous chunk
+            started = self._frame_started if index == 0 and was_in_frame and not resyncs else None
+            for hook in _hooks:
+                hook.frame_received(self.port, frame, now if started is None else started)
+        if parser.in_frame and (frames or resyncs or not was_in_frame):
+            self._frame_started = now
+        return frames
+
+
+class Counter:
+    """Monotonic counter, by label values."""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *labelvalues: str, amount: float = 1) -> None:
+        """Add ``amount`` to the counter of ``labelvalues``."""
+        self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def value(self, *labelvalues: str) -> float:
+        """Value of the counter of ``labelvalues``, 0 if it was never incremented."""
+        return self._values.get(labelvalues, 0)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        for labelvalues, value in list(self._values.items()):
+            lines.append(f"{self.name}{_labels(self.labelnames, labelvalues)} {_number(value)}")
+        return lines
+
+
+class Histogram:
+    """Distribution of observed values in buckets, by label values."""
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Iterable[float] = DECODE_BUCKETS
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label values: count of each bucket (not cumulative) and of +Inf, then sum
+        self._values: dict[tuple[str, ...], list[float]] = {}
+
+    def observe(self, value: float, *labelvalues: str) -> None:
+        """Add ``value`` to the distribution of ``labelvalues``."""
+        counts = self._values.get(labelvalues)
+        if counts is None:
+            counts = self._values[labelvalues] = [0.0] * (len(self.buckets) + 2)
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        counts[-1] += value
+
+    def count(self, *labelvalues: str) -> int:
+        """Number of values observed for ``labelvalues``."""
+        counts = self._values.get(labelvalues)
+        return 0 if counts is None else int(sum(counts[:-1]))
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for labelvalues, counts in list(self._values.items()):
+            counts = list(counts)
+            cumulative = 0.0
+            for bound, count in zip((*self.buckets, math.inf), counts[:-1], strict=True):
+                cumulative += count
+                bucket_labels = _labels((*self.labelnames, "le"), (*labelvalues, _number(bound)))
+                lines.append(f"{self.name}_bucket{bucket_labels} {_number(cumulative)}")
+            labels = _labels(self.labelnames, labelvalues)
+            lines.append(f"{self.name}_sum{labels} {_number(counts[-1])}")
+            lines.append(f"{self.name}_count{labels} {_number(cumulative)}")
+        return lines
+
+
+class MetricsRegistry:
+    """Set of metrics rendered together in the Prometheus text format."""
+
+    def __init__(self) -> None:
+        self.metrics: list[Counter | Histogram] = []
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Create and register a counter."""
+        counter = Counter(name, documentation, labelnames)
+        self.metrics.append(counter)
+        return counter
+
+    def histogram(
+        self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Iterable[float] = DECODE_BUCKETS
+    ) -> Histogram:
+        """Create and register a histogram."""
+        histogram = Histogram(name, documentation, labelnames, buckets)
+        self.metrics.append(histogram)
+        return histogram
+
+    def render(self) -> str:
+        """Metrics in the Prometheus text exposition format."""
+        return "".join(f"{line}\n" for metric in self.metrics for line in metric.render())
+
+
+class TeleinfoMetrics(MetricsHook):
+    """Hook maintaining the teleinfo metrics of each port.
+
+    Args:
+        registry: Registry to create the metrics in, a new one by default.
+    """
+
+    def __init__(self, registry: MetricsRegistry | None = None) -> None:
+        self.registry = registry if registry is not None else MetricsRegistry()
+        self.frames = self.registry.counter("teleinfo_frames_total", "Frames received.", ["port"])
+        self.bytes = self.registry.counter("teleinfo_bytes_total", "Bytes of the frames received.", ["port"])
+        self.resyncs = self.registry.counter("teleinfo_resyncs_total", "Incomplete frames dropped.", ["port"])
+        self.timeouts = self.registry.counter("teleinfo_timeouts_total", "Reads without a frame in time.", ["port"])
+        self.checksum_errors = self.registry.counter(
+            "teleinfo_checksum_errors_total",
+            "Frames rejected for a checksum, by separator of the info group (HT in standard mode, SP in historic mode).",
+            ["port", "separator"],
+        )
+        self.format_errors = self.registry.counter(
+            "teleinfo_format_errors_total",
+            "Frames rejected for their format, by type (frame, info_group, label_value, other).",
+            ["port", "type"],
+        )
+        self.decode_seconds = self.registry.histogram(
+            "teleinfo_decode_seconds", "Time to decode a frame.", ["port"], DECODE_BUCKETS
+        )
+        self.latency_seconds = self.registry.histogram(
+            "teleinfo_frame_latency_seconds",
+            "Time from the reception of the STX to the decoded frame.",
+            ["port"],
+            LATENCY_BUCKETS,
+        )
+        # Start of the last frame received on each port
+        self._started: dict[str, float] = {}
+
+    def frame_received(self, port: str, frame: bytes, started: float) -> None:
+        self.frames.inc(port)
+        self.bytes.inc(port, amount=len(frame))
+        self._started[port] = started
+
+    def frames_resynced(self, port: str, count: int) -> None:
+        self.resyncs.inc(port, amount=count)
+
+    def read_timed_out(self, port: str) -> None:
+        self.timeouts.inc(port)
+
+    def frame_decoded(self, port: str, seconds: float) -> None:
+        self.decode_seconds.observe(seconds, port)
+        started = self._started.pop(port, None)
+        if started is not None:
+            self.latency_seconds.observe(time.monotonic() - started, port)
+
+    def decode_failed(self, port: str, exception: Exception) -> None:
+        self._started.pop(port, None)
+        if isinstance(exception, ChecksumError):
+            # Both checksum methods failed: only the separator tells the mode of the meter
+            self.checksum_errors.inc(port, "HT" if "\t" in exception.label_data_and_separators else "SP")
+        elif isinstance(exception, FrameFormatError):
+            self.format_errors.inc(port, "frame")
+        elif isinstance(exception, InfoGroupFormatError):
+            self.format_errors.inc(port, "info_group")
+        elif isinstance(exception, LabelValueError):
+            self.format_errors.inc(port, "label_value")
+        else:
+            self.format_errors.inc(port, "other")
+
+
+def write_textfile(registry: MetricsRegistry, path: str | os.PathLike) -> None:
+    """Write the metrics to ``path`` atomically, e.g. for the textfile collector of node_exporter."""
+    path = Path(path)
+    temporary_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    temporary_path.write_text(registry.render())
+    temporary_path.replace(path)
+
+
+class TextfileWriter:
+    """Thread writing the metrics to a file periodically, and once more when stopped.
+
+    Args:
+        registry: Metrics to write.
+        path: File to write them to (see :func:`write_textfile`).
+        interval: Seconds between two writes.
+    """
+
+    def __init__(self, registry: MetricsRegistry, path: str | os.PathLike, interval: float = 15.0) -> None:
+        self.registry = registry
+        self.path = path
+        self.interval = interval
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="teleinfo-metrics-writer", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._thread.join()
+        write_textfile(self.registry, self.path)
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            write_textfile(self.registry, self.path)
+
+
+def start_http_server(registry: MetricsRegistry, port: int, address: str = "127.0.0.1"):
+    """Serve the metrics over HTTP (any path), from a daemon thread.
+
+    Args:
+        registry: Metrics to serve.
+        port: TCP port to listen on, 0 for any free port.
+        address: Address to listen on, local only by default.
+
+    Returns:
+        The :class:`http.server.ThreadingHTTPServer`, to ``shutdown()`` and find the
+        actual port (``server_address``).
+    """
+    # Imported on demand, to keep the import of the package fast
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer  # pylint: disable=import-outside-toplevel
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):  # noqa: N802
+            body = registry.render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+            pass
+
+    server = ThreadingHTTPServer((address, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="teleinfo-metrics-server", daemon=True).start()
+    return server
+
+
+def _labels(labelnames: Sequence[str], labelvalues: Sequence[str]) -> str:
+    if not labelnames:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(labelnames, labelvalues, strict=True))
+    return f"{{{pairs}}}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(int(value)) if float(value).is_integer() else repr(float(value))
@@ -0,0 +1,254 @@
+"""Parallel decoding of large raw capture files.
+
+The capture file is split into shards of about ``shard_size`` bytes that end right
+after an ETX (see :meth:`~teleinfo.replay.CaptureReader.chunks`), so that no frame is
+split. Shards are decoded by the processes of a
+:class:`~concurrent.futures.ProcessPoolExecutor`, each reading its own byte range of
+the file: only the offsets of the shards and the decoded frames cross process
+boundaries. At most ``window`` shards are in flight, and results are returned in file
+order as the shards complete:
+
+.. code-block:: python
+
+    from teleinfo.parallel import decode_file
+
+    with open("captured_frames.ndjson", "wb") as output:
+        stats = decode_file("captured_frames.bin", output)
+
+Frames that cannot be decoded are skipped, and counted in the statistics.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import sys
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, BinaryIO, Literal, NamedTuple
+
+from .codec import InfoGroupCache, decode
+from .exceptions import LabelValueError, TeleinfoDecodingError
+from .framing import FrameParser
+from .recorder import FrameRecorder
+from .replay import CaptureReader
+from .standard import StandardInfoGroupCache, decode_standard
+
+
+#: Default size of the shards of the capture file, in bytes.
+DEFAULT_SHARD_SIZE = 1 << 22
+
+
+class DecodedShard(NamedTuple):
+    """Frames decoded from a shard of a capture file."""
+
+    #: Offset of the shard in the file.
+    start: int
+    #: Offset of the end of the shard in the file (excluded).
+    end: int
+    #: Decoded frames, in order, label to data (empty with ``ndjson=True``).
+    frames: list[dict[str, Any]]
+    #: NDJSON lines of the decoded frames (``ndjson=True``), else empty.
+    lines: bytes
+    #: Number of frames decoded.
+    num_of_frames: int
+    #: Number of frames that could not be decoded.
+    num_of_errors: int
+
+
+class DecodeFileStats(NamedTuple):
+    """Statistics of :func:`decode_file`."""
+
+    #: Number of frames decoded.
+    frames: int
+    #: Number of frames that could not be decoded.
+    errors: int
+    #: Size of the capture file, in bytes.
+    bytes: int
+    #: Duration of the decoding, in seconds.
+    elapsed: float
+
+
+def decode_shards(
+    path: str | os.PathLike,
+    mode: Literal["historic", "standard"] = "historic",
+    ndjson: bool = False,
+    shard_size: int = DEFAULT_SHARD_SIZE,
+    workers: int | None = None,
+    window: int | None = None,
+) -> Iterator[DecodedShard]:
+    """Decode the shards of a capture file in parallel, in file order.
+
+    Args:
+        path: Capture file of concatenated raw frames.
+        mode: Teleinfo mode of the frames. In standard mode, decoded frames map each
+            label to its ``{"horodate", "data"}``, as printed by the ``port`` command.
+        ndjson: Return the frames of each shard as NDJSON lines
+            (:attr:`DecodedShard.lines`), serialized by the worker processes, instead
+            of dicts.
+        shard_size: Approximate size of the shards, in bytes.
+        workers: Number of processes, the number of CPUs by default.
+        window: Max number of shards submitted and not yet returned, twice the number
+            of processes by default. Bounds the memory used by results waiting for an
+            earlier shard.
+
+    Yields:
+        The decoded shards.
+    """
+    workers = workers if workers is not None else os.cpu_count() or 1
+    window = window if window is not None else 2 * workers
+    if window < 1:
+        raise ValueError(f"window should be at least 1, not {window}")
+    with CaptureReader(path) as capture:
+        spans = []
+        start = 0
+        for chunk in capture.chunks(shard_size):
+            spans.append((start, start + len(chunk)))
+            start += len(chunk)
+            chunk.release()
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending: deque[Future[DecodedShard]] = deque()
+        remaining_spans = iter(spans)
+        try:
+            for shard_start, shard_end in remaining_spans:
+                pending.append(executor.submit(_decode_shard, str(path), shard_start, shard_end, mode, ndjson))
+                if len(pending) >= window:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def decode_file(
+    path: str | os.PathLike,
+    output: BinaryIO | str | os.PathLike[str],
+    output_format: Literal["ndjson", "columnar"] = "ndjson",
+    mode: Literal["historic", "standard"] = "historic",
+    shard_size: int = DEFAULT_SHARD_SIZE,
+    workers: int | None = None,
+    window: int | None = None,
+    progress: Callable[[int, int, int], None] | None = None,
+) -> DecodeFileStats:
+    """Decode a capture file in parallel, and write its frames in order.
+
+    Args:
+        path: Capture file of concatenated raw frames.
+        output: Binary file or path of the file to write NDJSON lines to, or path of
+            the directory of the recording (:class:`~teleinfo.recorder.FrameRecorder`)
+            in columnar format. Capture files do not store reception times: the
+            timestamps of the recording are NaN.
+        output_format: ``"ndjson"`` or ``"columnar"``.
+        mode: Teleinfo mode of the frames. In columnar format, only the data of
+            standard info groups is recorded.
+        shard_size: Approximate size of the shards, in bytes.
+        workers: Number of processes, the number of CPUs by default.
+        window: Max number of shards in flight, twice the number of processes by default.
+        progress: Called after each shard with the number of bytes decoded, the size of
+            the file and the number of frames decoded.
+
+    Returns:
+        The number of frames decoded and skipped, the size of the file and the duration.
+
+    Raises:
+        TypeError: ``output`` is a file in columnar format.
+    """
+    start_time = time.perf_counter()
+    size = Path(path).stat().st_size
+    ndjson = output_format == "ndjson"
+    shards = decode_shards(path, mode, ndjson, shard_size, workers, window)
+    if not ndjson:
+        if not isinstance(output, (str, os.PathLike)):
+            raise TypeError("The output of the columnar format should be the path of a directory")
+        frames, errors = _record_shards(shards, Path(output), mode, size, progress)
+    elif isinstance(output, (str, os.PathLike)):
+        with open(output, "wb") as file:
+            frames, errors = _write_shards(shards, file, size, progress)
+    else:
+        frames, errors = _write_shards(shards, output, size, progress)
+    return DecodeFileStats(frames, errors, size, time.perf_counter() - start_time)
+
+
+def _write_shards(
+    shards: Iterator[DecodedShard], output: BinaryIO, size: int, progress: Callable[[int, int, int], None] | None
+) -> tuple[int, int]:
+    """Write the NDJSON lines of the shards, and return the number of frames decoded and skipped."""
+    frames = errors = 0
+    for shard in shards:
+        output.write(shard.lines)
+        frames, errors = frames + shard.num_of_frames, errors + shard.num_of_errors
+        if progress is not None:
+            progress(shard.end, size, frames)
+    return frames, errors
+
+
+def _record_shards(
+    shards: Iterator[DecodedShard],
+    directory: Path,
+    mode: Literal["historic", "standard"],
+    size: int,
+    progress: Callable[[int, int, int], None] | None,
+) -> tuple[int, int]:
+    """Record the frames of the shards, and return the number of frames recorded and skipped."""
+    frames = errors = 0
+    with FrameRecorder(directory, mode=mode) as recorder:
+        for shard in shards:
+            shard_errors = 0
+            for frame in shard.frames:
+                if mode == "standard":
+                    frame = {label: info_group["data"] for label, info_group in frame.items()}
+                try:
+                    recorder.append(frame, timestamp=math.nan)
+                except LabelValueError:
+                    shard_errors += 1
+            frames += shard.num_of_frames - shard_errors
+            errors += shard.num_of_errors + shard_errors
+            if progress is not None:
+                progress(shard.end, size, frames)
+    return frames, errors
+
+
+def print_progress(decoded_bytes: int, size: int, frames: int) -> None:
+    """Progress callback of :func:`decode_file` printing to stderr."""
+    percent = 100 * decoded_bytes / size if size else 100
+    print(f"\r{percent:5.1f}% {decoded_bytes / 1e6:.1f}/{size / 1e6:.1f} MB, {frames} frames", end="", file=sys.stderr)
+
+
+def _decode_shard(path: str, start: int, end: int, mode: str, ndjson: bool) -> DecodedShard:
+    """Decode the frames of ``path`` from offset ``start`` to ``end``, in a worker process."""
+    with open(path, "rb") as file:
+        file.seek(start)
+        data = file.read(end - start)
+    if mode == "standard":
+        standard_cache = StandardInfoGroupCache()
+
+        def decode_frame(frame):
+            return {
+                label: {"horodate": info_group.horodate, "data": info_group.data}
+                for label, info_group in decode_standard(frame, cache=standard_cache).items()
+            }
+
+    else:
+        cache = InfoGroupCache()
+
+        def decode_frame(frame):
+            return decode(frame, cache=cache)
+
+    decoded_frames = []
+    errors = 0
+    for frame in FrameParser().feed(data):
+        try:
+            decoded_frames.append(decode_frame(frame))
+        except (TeleinfoDecodingError, UnicodeDecodeError):
+            # Non ASCII bytes fail to decode before the frame is verified
+            errors += 1
+    if ndjson:
+        lines = "".join(f"{json.dumps(decoded_frame)}\n" for decoded_frame in decoded_frames).encode()
+        return DecodedShard(start, end, [], lines, len(decoded_frames), errors)
+    return DecodedShard(start, end, decoded_frames, b"", len(decoded_frames), errors)
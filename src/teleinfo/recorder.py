@@ -0,0 +1,491 @@
+"""Append-only columnar storage of decoded frames.
+
+A recording is a directory of segment files. Each segment holds the frames appended
+to it in chunks, each chunk storing one fixed-width column per label:
+
+* ``timestamp``: reception time of the frames, in seconds since the epoch (``double``),
+* numeric labels (converted to ``int`` in :data:`~teleinfo.labels.LABELS`, or
+  :data:`~teleinfo.labels.STANDARD_LABELS` for standard mode frames: indexes, currents,
+  powers): 32 bits signed integers,
+* other labels (``ADCO``, ``OPTARIF``, ``PTEC``...): 16 bits codes of a dictionary of
+  the strings of the label, per segment.
+
+A frame of a historic meter takes 40 to 65 bytes depending on its tariff option, 4 to 5
+times less than its JSON line (see ``benchmarks/bench_recorder.py``).
+
+.. code-block:: python
+
+    with FrameRecorder("recordings/meter-1") as recorder:
+        async for frame in stream:
+            recorder.append(decode(frame))
+
+    with Recording("recordings/meter-1") as recording:
+        papp = recording.column("PAPP")
+        for frame in recording.frames():
+            ...
+
+Chunk layout (after the :data:`MAGIC` of the segment)::
+
+    "CHNK" | header length (uint32 LE) | JSON header | padding | columns (each padded)
+
+The JSON header gives the number of rows, the byte order, and the label, type code,
+offset and new dictionary strings of each column. Columns start on 8 bytes
+boundaries, so that they are mapped as ``memoryview`` (or NumPy arrays) without copy.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import struct
+import sys
+import time
+from array import array
+from collections.abc import Iterator, Mapping
+from pathlib import Path
+from types import TracebackType
+from typing import Any, BinaryIO, Literal, NamedTuple
+
+from .exceptions import LabelValueError
+from .labels import LABELS, STANDARD_LABELS, LabelSpec
+
+
+#: First bytes of a segment file.
+MAGIC = b"TICREC01"
+#: Suffix of the segment files.
+SEGMENT_SUFFIX = ".ticrec"
+#: Name of the column of the reception times.
+TIMESTAMP_COLUMN = "timestamp"
+#: Value of a numeric label missing from a frame.
+MISSING_NUMBER = -(2**31)
+#: Code of a string label missing from a frame.
+MISSING_CODE = 0xFFFF
+
+_TIMESTAMP_TYPECODE = "d"
+_NUMBER_TYPECODE = "i"
+_CODE_TYPECODE = "H"
+_MISSING_VALUES = {_NUMBER_TYPECODE: MISSING_NUMBER, _CODE_TYPECODE: MISSING_CODE}
+_CHUNK_TAG = b"CHNK"
+_CHUNK_PREFIX = struct.Struct("<4sI")
+_ALIGNMENT = 8
+
+
+def _padding(size: int) -> int:
+    return -size % _ALIGNMENT
+
+
+def _typecode(label: str, labels: Mapping[str, LabelSpec] = LABELS) -> str:
+    spec = labels.get(label)
+    return _NUMBER_TYPECODE if spec is not None and spec.converter is int else _CODE_TYPECODE
+
+
+class _DictionaryFull(Exception):
+    """The dictionary of a string label has no code left in the segment."""
+
+
+class FrameRecorder:
+    """Appends decoded frames to a recording directory.
+
+    Frames are buffered in memory and written as a chunk every ``chunk_rows`` frames,
+    or on :meth:`flush`. A new segment file is started every ``segment_rows`` frames,
+    or when the dictionary of a string label is full (65535 distinct strings).
+
+    Args:
+        directory: Directory of the recording, created if needed. Segments are added
+            after the existing ones.
+        chunk_rows: Number of frames buffered before being written.
+        segment_rows: Max number of frames of a segment file.
+        mode: Teleinfo mode of the frames, which tells the numeric labels. Standard
+            mode frames are appended as label to data dicts.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        chunk_rows: int = 1024,
+        segment_rows: int = 1 << 20,
+        mode: Literal["historic", "standard"] = "historic",
+    ) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.chunk_rows = chunk_rows
+        self.segment_rows = segment_rows
+        self._labels = STANDARD_LABELS if mode == "standard" else LABELS
+        existing_segments = _segment_paths(self.directory)
+        self._segment_index = int(existing_segments[-1].stem) + 1 if existing_segments else 0
+        #: Path of the current segment file, once opened.
+        self.path: Path | None = None
+        self._file: BinaryIO | None = None
+        self._new_segment()
+
+    def _new_segment(self) -> None:
+        self._timestamps: array[float] = array(_TIMESTAMP_TYPECODE)
+        self._columns: dict[str, array] = {}
+        self._dictionaries: dict[str, dict[str, int]] = {}
+        self._new_strings: dict[str, list[str]] = {}
+        self._rows = 0
+
+    def append(self, frame: Mapping[str, Any], timestamp: float | None = None) -> None:
+        """Append a decoded frame.
+
+        Args:
+            frame: Decoded frame, with string (:func:`~teleinfo.codec.decode`) or typed
+                (:func:`~teleinfo.labels.decode_typed`) values.
+            timestamp: Reception time of the frame. Defaults to the current time.
+
+        Raises:
+            LabelValueError: The value of a numeric label is not an integer.
+        """
+        if self._rows >= self.segment_rows:
+            self.rotate()
+        row = len(self._timestamps)
+        try:
+            self._append_row(frame, row)
+        except _DictionaryFull:
+            self._truncate(row)
+            self.rotate()
+            row = 0
+            self._append_row(frame, row)
+        except LabelValueError:
+            self._truncate(row)
+            raise
+        self._timestamps.append(time.time() if timestamp is None else timestamp)
+        self._rows += 1
+        if row + 1 >= self.chunk_rows:
+            self._write_chunk()
+
+    def _append_row(self, frame: Mapping[str, Any], row: int) -> None:
+        columns = self._columns
+        for label, value in frame.items():
+            column = columns.get(label)
+            if column is None:
+                column = self._add_column(label, row)
+            if column.typecode == _NUMBER_TYPECODE:
+                try:
+                    column.append(int(value))
+                except (ValueError, OverflowError) as exception:
+                    raise LabelValueError(label, value) from exception
+            else:
+                column.append(self._code(label, str(value)))
+        if len(frame) < len(columns):
+            for column in columns.values():
+                if len(column) == row:
+                    column.append(_MISSING_VALUES[column.typecode])
+
+    def _add_column(self, label: str, rows: int) -> array:
+        typecode = _typecode(label, self._labels)
+        column = self._columns[label] = array(typecode, [_MISSING_VALUES[typecode]]) * rows
+        if typecode == _CODE_TYPECODE:
+            self._dictionaries.setdefault(label, {})
+            self._new_strings.setdefault(label, [])
+        return column
+
+    def _code(self, label: str, value: str) -> int:
+        codes = self._dictionaries[label]
+        code = codes.get(value)
+        if code is None:
+            code = len(codes)
+            if code >= MISSING_CODE:
+                raise _DictionaryFull(label)
+            codes[value] = code
+            self._new_strings[label].append(value)
+        return code
+
+    def _truncate(self, rows: int) -> None:
+        for column in self._columns.values():
+            del column[rows:]
+
+    def flush(self) -> None:
+        """Write the buffered frames, and flush the segment file."""
+        self._write_chunk()
+        if self._file is not None:
+            self._file.flush()
+
+    def _write_chunk(self) -> None:
+        rows = len(self._timestamps)
+        if not rows:
+            return
+        if self._file is None:
+            self.path = self.directory / f"{self._segment_index:06d}{SEGMENT_SUFFIX}"
+            self._file = open(self.path, "xb")  # pylint: disable=consider-using-with
+            self._file.write(MAGIC)
+
+        columns = [(TIMESTAMP_COLUMN, self._timestamps), *self._columns.items()]
+        descriptors = []
+        offset = 0
+        for label, column in columns:
+            descriptor = {"label": label, "typecode": column.typecode, "offset": offset}
+            new_strings = self._new_strings.get(label)
+            if new_strings:
+                descriptor["dictionary"] = new_strings
+                self._new_strings[label] = []
+            descriptors.append(descriptor)
+            size = len(column) * column.itemsize
+            offset += size + _padding(size)
+        header = json.dumps(
+            {"rows": rows, "byteorder": sys.byteorder, "size": offset, "columns": descriptors},
+            separators=(",", ":"),
+        ).encode()
+        prefix = _CHUNK_PREFIX.pack(_CHUNK_TAG, len(header))
+        parts: list[bytes | memoryview] = [prefix, header, bytes(_padding(len(prefix) + len(header)))]
+        for _, column in columns:
+            size = len(column) * column.itemsize
+            parts += [memoryview(column).cast("B"), bytes(_padding(size))]
+        # A chunk is written at once, so that readers of the segment see complete chunks
+        self._file.write(b"".join(parts))
+
+        self._timestamps = array(_TIMESTAMP_TYPECODE)
+        self._columns = {label: array(column.typecode) for label, column in self._columns.items()}
+
+    def rotate(self) -> None:
+        """Write the buffered frames and start a new segment file."""
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._segment_index += 1
+        self._new_segment()
+
+    def close(self) -> None:
+        """Write the buffered frames and close the segment file."""
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> FrameRecorder:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+
+class RecordedChunk(NamedTuple):
+    """Chunk of a segment file, its columns mapped from the file."""
+
+    #: Number of frames of the chunk.
+    rows: int
+    #: Columns of the chunk by label, as ``memoryview`` of their type code.
+    columns: dict[str, memoryview]
+
+
+class RecordingSegment:
+    """Memory-mapped segment file of a recording.
+
+    Columns are ``memoryview`` on the mapping of the file: they are only valid until
+    the segment is closed. A segment being written can be read: only its complete
+    chunks are mapped.
+
+    Args:
+        path: Path of the segment file.
+
+    Raises:
+        ValueError: The file is not a segment file.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        #: Chunks of the segment.
+        self.chunks: list[RecordedChunk] = []
+        #: Strings of each string label, by code.
+        self.dictionaries: dict[str, list[str]] = {}
+        #: Type code of the column of each label.
+        self.typecodes: dict[str, str] = {TIMESTAMP_COLUMN: _TIMESTAMP_TYPECODE}
+        self._mmap: mmap.mmap | None = None
+        self._views: list[memoryview] = []
+        with open(self.path, "rb") as file:
+            if file.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"'{self.path}' is not a recording segment")
+            if file.seek(0, 2) > len(MAGIC):
+                self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap is not None:
+            self._map_chunks(self._mmap)
+
+    def _map_chunks(self, mapping: mmap.mmap) -> None:
+        data = memoryview(mapping)
+        self._views.append(data)
+        position = len(MAGIC)
+        while position + _CHUNK_PREFIX.size <= len(data):
+            tag, header_size = _CHUNK_PREFIX.unpack_from(data, position)
+            if tag != _CHUNK_TAG:
+                raise ValueError(f"Invalid chunk at {position} in '{self.path}'")
+            header_end = position + _CHUNK_PREFIX.size + header_size
+            start = header_end + _padding(header_end - position)
+            if start > len(data):
+                break
+            header = json.loads(bytes(data[position + _CHUNK_PREFIX.size : header_end]))
+            if start + header["size"] > len(data):
+                # Chunk being written
+                break
+            self.chunks.append(self._map_chunk(header, data, start))
+            position = start + header["size"]
+
+    def _map_chunk(self, header: dict, data: memoryview, start: int) -> RecordedChunk:
+        rows = header["rows"]
+        columns = {}
+        for descriptor in header["columns"]:
+            label, typecode = descriptor["label"], descriptor["typecode"]
+            offset = start + descriptor["offset"]
+            view = data[offset : offset + rows * array(typecode).itemsize]
+            if header["byteorder"] == sys.byteorder:
+                view = view.cast(typecode)
+            else:
+                # Recorded on a machine of the other endianness: copy
+                swapped = array(typecode, view.tobytes())
+                swapped.byteswap()
+                view = memoryview(swapped)
+            self._views.append(view)
+            columns[label] = view
+            self.typecodes.setdefault(label, typecode)
+            if "dictionary" in descriptor:
+                self.dictionaries.setdefault(label, []).extend(descriptor["dictionary"])
+        return RecordedChunk(rows, columns)
+
+    @property
+    def rows(self) -> int:
+        """Number of frames of the segment."""
+        return sum(chunk.rows for chunk in self.chunks)
+
+    @property
+    def labels(self) -> list[str]:
+        """Labels recorded in the segment, in order of appearance."""
+        return list(dict.fromkeys(label for chunk in self.chunks for label in chunk.columns))
+
+    def column(self, label: str) -> array:
+        """Return the raw column of a label over the segment.
+
+        Args:
+            label: Label, or :data:`TIMESTAMP_COLUMN`.
+
+        Returns:
+            Timestamps (``d``), numbers (``i``, :data:`MISSING_NUMBER` where missing) or
+            dictionary codes (``H``, :data:`MISSING_CODE` where missing).
+        """
+        return self._column(label, self.typecodes.get(label) or _typecode(label))
+
+    def _column(self, label: str, typecode: str) -> array:
+        column = array(typecode)
+        for chunk in self.chunks:
+            view = chunk.columns.get(label)
+            if view is not None:
+                column.frombytes(view.cast("B"))
+            else:
+                column.extend(array(typecode, [_MISSING_VALUES[typecode]]) * chunk.rows)
+        return column
+
+    def values(self, label: str) -> list:
+        """Return the values of a label over the segment, ``None`` where missing."""
+        column = self.column(label)
+        if column.typecode == _CODE_TYPECODE:
+            strings = self.dictionaries.get(label, [])
+            return [strings[code] if code != MISSING_CODE else None for code in column]
+        if column.typecode == _NUMBER_TYPECODE:
+            return [value if value != MISSING_NUMBER else None for value in column]
+        return column.tolist()
+
+    def frames(self) -> Iterator[dict[str, Any]]:
+        """Iterate over the frames of the segment.
+
+        Yields:
+            Dicts of the labels of each frame (numbers as ``int``), and its
+            :data:`TIMESTAMP_COLUMN`.
+        """
+        for chunk in self.chunks:
+            columns: list[tuple[str, memoryview, int | None, list[str] | None]] = []
+            for label, view in chunk.columns.items():
+                if view.format == _CODE_TYPECODE:
+                    columns.append((label, view, MISSING_CODE, self.dictionaries[label]))
+                else:
+                    columns.append((label, view, _MISSING_VALUES.get(view.format), None))
+            for row in range(chunk.rows):
+                frame = {}
+                for label, view, missing, strings in columns:
+                    value = view[row]
+                    if value != missing:
+                        frame[label] = strings[value] if strings is not None else value
+                yield frame
+
+    def close(self) -> None:
+        """Release the columns and unmap the file."""
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self.chunks = []
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self) -> RecordingSegment:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+
+class Recording:
+    """All the segments of a recording directory, in order.
+
+    Args:
+        directory: Directory of the recording.
+    """
+
+    def __init__(self, directory: str | Path) -> None:
+        self.directory = Path(directory)
+        #: Segments of the recording, memory-mapped.
+        self.segments = [RecordingSegment(path) for path in _segment_paths(self.directory)]
+
+    @property
+    def rows(self) -> int:
+        """Number of frames of the recording."""
+        return sum(segment.rows for segment in self.segments)
+
+    def column(self, label: str) -> array:
+        """Return the raw column of a label over all segments (see :meth:`RecordingSegment.column`).
+
+        Dictionary codes are specific to each segment: use :meth:`values` for string labels.
+        """
+        typecodes = (segment.typecodes[label] for segment in self.segments if label in segment.typecodes)
+        typecode = next(typecodes, None) or _typecode(label)
+        column = array(typecode)
+        for segment in self.segments:
+            column.extend(segment._column(label, typecode))  # pylint: disable=protected-access
+        return column
+
+    def values(self, label: str) -> list:
+        """Return the values of a label over all segments, ``None`` where missing."""
+        return [value for segment in self.segments for value in segment.values(label)]
+
+    def frames(self) -> Iterator[dict[str, Any]]:
+        """Iterate over the frames of all segments (see :meth:`RecordingSegment.frames`)."""
+        for segment in self.segments:
+            yield from segment.frames()
+
+    def close(self) -> None:
+        """Unmap all segments."""
+        for segment in self.segments:
+            segment.close()
+
+    def __enter__(self) -> Recording:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+
+def _segment_paths(directory: Path) -> list[Path]:
+    return sorted(path for path in directory.glob(f"*{SEGMENT_SUFFIX}") if path.stem.isdigit())
@@ -0,0 +1,169 @@
+"""Compact records of decoded frames, one class per tariff option.
+
+A frame decoded by :func:`~teleinfo.codec.decode` is a dict of freshly allocated label
+and data strings, 1.2 to 1.9 KB per frame depending on the tariff option. Services keeping thousands of frames in
+memory can decode them with :func:`decode_record` instead, into a
+:class:`FrameRecord` subclass of the tariff option of the frame (:class:`BaseRecord`,
+:class:`OffPeakRecord`, :class:`EjpRecord` or :class:`TempoRecord`), which:
+
+* stores the value of each label of the option in a slot (``__slots__``): no dict, and
+  no label string per frame,
+* converts values as :func:`~teleinfo.labels.decode_typed` does: indexes, currents
+  and powers are ``int``, tariff options and periods are enum members, shared by all
+  records,
+* interns the remaining strings (``ADCO``, ``HHPHC``, ``MOTDETAT``), so that records of
+  the same meter share them.
+
+.. code-block:: python
+
+    >>> record = decode_record(frame)
+    >>> record
+    OffPeakRecord(ADCO='050022120078', OPTARIF=<TariffOption.OFF_PEAK: 'HC..'>, ...)
+    >>> record.PAPP, record["HCHC"]
+    (2160, 94939439)
+
+Labels missing from the frame read as ``None``. Labels that have no slot in the
+record class (e.g. the labels of three phase meters) are kept in the :attr:`extra`
+dict. Records use 190 to 400 bytes per frame, as measured by
+``benchmarks/bench_records.py``.
+"""
+
+from __future__ import annotations
+
+import sys
+from typing import Any, ClassVar
+
+from .codec import InfoGroupCache, decode
+from .labels import TariffOption, convert
+
+
+# Labels of the frames of every tariff option (single phase meters)
+_COMMON_LABELS = ("ADCO", "OPTARIF", "ISOUSC", "PTEC", "IINST", "ADPS", "IMAX", "PAPP", "HHPHC", "MOTDETAT")
+
+
+class FrameRecord:
+    """Decoded frame, with a slot per label.
+
+    Records of this class are returned by :func:`decode_record` for frames without
+    tariff option; subclasses add the slots of the labels of each option.
+    """
+
+    __slots__ = (*_COMMON_LABELS, "extra")
+
+    #: Tariff option of the records of the class, ``None`` for any other option.
+    option: ClassVar[TariffOption | None] = None
+    #: Labels stored in slots.
+    labels: ClassVar[tuple[str, ...]] = _COMMON_LABELS
+    #: Label to value of the labels without slot, ``None`` if there are none.
+    extra: dict[str, Any] | None
+
+    # Slots are left unset for the labels missing from the frame
+    def __getattr__(self, name: str) -> Any:
+        if name in type(self).labels or name == "extra":
+            return None
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+    def __getitem__(self, label: str) -> Any:
+        value = getattr(self, label, None) if label in self.labels else None
+        if value is None:
+            extra = self.extra
+            if extra is None or label not in extra:
+                raise KeyError(label)
+            value = extra[label]
+        return value
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the labels of the frame and their values, as :func:`~teleinfo.labels.decode_typed` does.
+
+        Labels stored in slots come first, in the order of :attr:`labels`.
+        """
+        frame = {label: value for label in self.labels if (value := getattr(self, label)) is not None}
+        if self.extra is not None:
+            frame.update(self.extra)
+        return frame
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, FrameRecord) or type(other) is not type(self):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        values = ", ".join(f"{label}={value!r}" for label, value in self.to_dict().items())
+        return f"{type(self).__name__}({values})"
+
+
+class BaseRecord(FrameRecord):
+    """Decoded frame of the base option."""
+
+    __slots__ = ("BASE",)
+    option = TariffOption.BASE
+    labels = (*_COMMON_LABELS, *__slots__)
+
+
+class OffPeakRecord(FrameRecord):
+    """Decoded frame of the off-peak hours option."""
+
+    __slots__ = ("HCHC", "HCHP")
+    option = TariffOption.OFF_PEAK
+    labels = (*_COMMON_LABELS, *__slots__)
+
+
+class EjpRecord(FrameRecord):
+    """Decoded frame of the EJP option."""
+
+    __slots__ = ("EJPHN", "EJPHPM", "PEJP")
+    option = TariffOption.EJP
+    labels = (*_COMMON_LABELS, *__slots__)
+
+
+class TempoRecord(FrameRecord):
+    """Decoded frame of the Tempo option."""
+
+    __slots__ = ("BBRHCJB", "BBRHPJB", "BBRHCJW", "BBRHPJW", "BBRHCJR", "BBRHPJR", "DEMAIN")
+    option = TariffOption.TEMPO
+    labels = (*_COMMON_LABELS, *__slots__)
+
+
+#: Record class of each tariff option.
+RECORD_TYPES: dict[TariffOption, type[FrameRecord]] = {
+    record_type.option: record_type for record_type in (BaseRecord, OffPeakRecord, EjpRecord, TempoRecord)
+}
+
+# Slot labels of each record class, for constant time lookups
+_RECORD_CLASSES: tuple[type[FrameRecord], ...] = (FrameRecord, *RECORD_TYPES.values())
+_SLOT_LABELS = {record_type: frozenset(record_type.labels) for record_type in _RECORD_CLASSES}
+
+
+def decode_record(frame, cache: InfoGroupCache | None = None) -> FrameRecord:
+    """Decode a frame into the record class of its tariff option (``OPTARIF``).
+
+    Args:
+        frame: Teleinfo frame, in string or bytes format.
+        cache: Optional cache of the info groups already decoded.
+
+    Returns:
+        A :class:`FrameRecord` subclass instance, or a :class:`FrameRecord` if the
+        frame has no ``OPTARIF``.
+
+    Raises:
+        TeleinfoDecodingError: The frame cannot be decoded, or a value cannot be
+            converted (:class:`~teleinfo.exceptions.LabelValueError`).
+    """
+    decoded_frame = decode(frame, cache=cache)
+    option = decoded_frame.get("OPTARIF")
+    record_type = FrameRecord if option is None else RECORD_TYPES[convert("OPTARIF", option)]
+    slot_labels = _SLOT_LABELS[record_type]
+    record = record_type()
+    extra = None
+    for label, data in decoded_frame.items():
+        value = convert(label, data)
+        if type(value) is str:  # pylint: disable=unidiomatic-typecheck
+            # Not enum members, which are str instances but cannot be interned
+            value = sys.intern(value)
+        if label in slot_labels:
+            setattr(record, label, value)
+        else:
+            if extra is None:
+                extra = record.extra = {}
+            extra[sys.intern(label)] = value
+    return record
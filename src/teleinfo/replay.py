@@ -0,0 +1,212 @@
+"""Zero-copy reading of raw capture files, such as ``captured_frames.bin``.
+
+:class:`CaptureReader` memory-maps the capture file instead of reading it: the pages of
+the file are loaded by the OS as they are accessed, and dropped under memory pressure,
+so that captures much larger than the available memory can be replayed. Frame
+boundaries are located with :meth:`mmap.mmap.find`, and frames are returned as
+:class:`memoryview` slices of the mapping, which can be passed as is to
+:func:`~teleinfo.codec.decode` or :class:`~teleinfo.frame.TeleinfoFrame`:
+
+.. code-block:: python
+
+    from teleinfo import decode
+    from teleinfo.replay import CaptureReader
+
+    with CaptureReader("captured_frames.bin") as capture:
+        for frame in capture.frames(start=1000):
+            decoded_frame = decode(frame)
+
+Only the offset of every :data:`INDEX_INTERVAL`-th frame is remembered, so that
+:meth:`CaptureReader.seek` does not rescan the whole file while the index stays small
+(8 bytes per 1024 frames).
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+from array import array
+from collections.abc import Iterator
+from pathlib import Path
+
+from .const import ENCODING, EOT_TOKEN, ETX_TOKEN, STX_TOKEN
+
+
+#: Number of frames between two offsets of the seek index.
+INDEX_INTERVAL = 1024
+#: Default size of the slices yielded by :meth:`CaptureReader.chunks`, in bytes.
+DEFAULT_CHUNK_SIZE = 1 << 23
+
+_STX = STX_TOKEN.encode(ENCODING)
+_ETX = ETX_TOKEN.encode(ENCODING)
+_EOT = EOT_TOKEN.encode(ENCODING)
+
+
+class CaptureReader:
+    """Memory-mapped reader of a capture file of concatenated raw frames.
+
+    A frame starts at a STX and ends at the first following ETX, as for
+    :class:`~teleinfo.framing.FrameParser`: a frame interrupted by an EOT, or by a new
+    STX, is skipped, as well as the bytes between frames and an unterminated last frame.
+
+    The views returned by the reader stay valid once the reader is closed: the file is
+    then unmapped when the last of them is released (or dropped).
+
+    Args:
+        path: Path of the capture file.
+        index_interval: Number of frames between two offsets of the seek index.
+    """
+
+    def __init__(self, path: str | os.PathLike, index_interval: int = INDEX_INTERVAL):
+        if index_interval < 1:
+            raise ValueError(f"index_interval should be at least 1, not {index_interval}")
+        self.path = Path(path)
+        self.index_interval = index_interval
+        with open(self.path, "rb") as file:
+            # Empty files cannot be mapped
+            self._mmap = (
+                mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if os.fstat(file.fileno()).st_size else None
+            )
+        self._view = memoryview(self._mmap if self._mmap is not None else b"")
+        # Offsets where the scan for frames 0, index_interval, 2 * index_interval... starts
+        self._index = array("Q", [0])
+        self._length: int | None = None
+        self._position = 0
+
+    @property
+    def size(self) -> int:
+        """Size of the capture file, in bytes."""
+        return len(self._view)
+
+    def __len__(self) -> int:
+        """Number of frames of the capture (the whole file is scanned the first time)."""
+        if self._length is None:
+            index, offset = len(self._index) - 1, self._index[-1]
+            count = index * self.index_interval
+            while (span := self._scan(offset, count)) is not None:
+                offset = span[1]
+                count += 1
+            self._length = count
+        return self._length
+
+    def __getitem__(self, index: int) -> memoryview:
+        """Frame ``index`` of the capture (negative indexes count from the end)."""
+        if index < 0:
+            index += len(self)
+        span = self._span(index) if index >= 0 else None
+        if span is None:
+            raise IndexError(f"Frame {index} out of range")
+        return self._view[span[0] : span[1]]
+
+    def __iter__(self) -> Iterator[memoryview]:
+        """Iterate on the frames from the current position (see :meth:`seek`)."""
+        return self.frames(self._position)
+
+    def seek(self, index: int):
+        """Set the frame the next iteration on the reader starts from."""
+        if index < 0:
+            raise ValueError(f"Frame index should be positive, not {index}")
+        self._position = index
+
+    def frames(self, start: int = 0, stop: int | None = None) -> Iterator[memoryview]:
+        """Iterate on the frames of the capture.
+
+        Args:
+            start: Index of the first frame.
+            stop: Index of the frame to stop before, the end of the capture by default.
+
+        Yields:
+            Views of the frames, from STX to ETX included.
+        """
+        span = self._span(start)
+        index = start
+        while span is not None and (stop is None or index < stop):
+            yield self._view[span[0] : span[1]]
+            index += 1
+            span = self._scan(span[1], index)
+
+    def chunks(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[memoryview]:
+        """Iterate on slices of the capture file that do not split frames.
+
+        Slices end right after an ETX (the last one at the end of the file), so that
+        each can be decoded on its own, e.g. with :func:`teleinfo.batch.decode_many` or
+        by another process.
+
+        Args:
+            chunk_size: Approximate size of the slices, in bytes.
+        """
+        if chunk_size < 1:
+            raise ValueError(f"chunk_size should be at least 1, not {chunk_size}")
+        mapping = self._mmap
+        if mapping is None:
+            return
+        size = self.size
+        start = 0
+        while start < size:
+            end = start + chunk_size
+            if end >= size:
+                end = size
+            else:
+                etx = mapping.rfind(_ETX, start, end)
+                if etx < 0:
+                    # Frame larger than a chunk
+                    etx = mapping.find(_ETX, end)
+                end = size if etx < 0 else etx + 1
+            yield self._view[start:end]
+            start = end
+
+    def close(self):
+        """Unmap the capture file, or let the views of frames still alive unmap it."""
+        self._view.release()
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                # Views of frames keep a reference to the mapping, closed with the last of them
+                pass
+            self._mmap = None
+
+    def __enter__(self) -> CaptureReader:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _span(self, index: int) -> tuple[int, int] | None:
+        """Offsets of frame ``index``, found from the closest offset of the index."""
+        if self._length is not None and index >= self._length:
+            return None
+        checkpoint = min(index // self.index_interval, len(self._index) - 1)
+        count = checkpoint * self.index_interval
+        span = self._scan(self._index[checkpoint], count)
+        while span is not None and count < index:
+            count += 1
+            span = self._scan(span[1], count)
+        return span
+
+    def _scan(self, offset: int, index: int) -> tuple[int, int] | None:
+        """Offsets of the first frame after ``offset``, which is frame ``index``.
+
+        Records ``offset`` in the seek index when ``index`` is the next multiple of the
+        index interval.
+        """
+        if self._mmap is None:
+            return None
+        if index == len(self._index) * self.index_interval:
+            self._index.append(offset)
+        find = self._mmap.find
+        rfind = self._mmap.rfind
+        while True:
+            start = find(_STX, offset)
+            if start < 0:
+                return None
+            end = find(_ETX, start + 1)
+            if end < 0:
+                return None
+            eot = rfind(_EOT, start + 1, end)
+            if eot >= 0:
+                offset = eot + 1
+                continue
+            # The frame starts at the last STX before its ETX
+            restart = rfind(_STX, start + 1, end)
+            return (start if restart < 0 else restart), end + 1
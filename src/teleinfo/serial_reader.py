@@ -2,19 +2,360 @@
 
 from __future__ import annotations
 
+import threading
 import time
+from collections import deque
+from collections.abc import Iterator
+from contextlib import ExitStack
+from types import TracebackType
+from typing import Any, NamedTuple
 
 import serial
 
-from .const import ENCODING, ETX_TOKEN, STX_TOKEN
+from . import metrics
+from .codec import InfoGroupCache, decode
+from .exceptions import TeleinfoDecodingError
+from .framing import FrameParser
 from .settings import TeleinfoSettings
+from .standard import StandardInfoGroupCache, decode_standard
+
+
+#: Default number of frames kept by :class:`BackgroundReader`.
+DEFAULT_BUFFER_SIZE = 64
+
+
+class TeleinfoReader:
+    """Synchronous reader of the frames received on a serial port.
+
+    The port is opened once (when entering the context, or on the first read) and
+    kept open until :meth:`close`, so that frames received between two reads are
+    kept, instead of being lost to a resync on each reopening. Everything waiting on
+    the port is read at once, and split into frames by a
+    :class:`~teleinfo.framing.FrameParser` bounded by ``settings.max_frame_size``.
+
+    Example:
+        .. code-block:: python
+
+            with TeleinfoReader("/dev/ttyUSB0") as reader:
+                for frame in reader:
+                    print(decode(frame))
+
+    Args:
+        port: Serial device path (e.g. ``"/dev/ttyUSB0"``).
+        settings: Serial and timeout configuration. Defaults to
+            :class:`~teleinfo.settings.TeleinfoSettings` when ``None``.
+    """
+
+    def __init__(self, port: str, settings: TeleinfoSettings | None = None) -> None:
+        self.port = port
+        self.settings = settings if settings is not None else TeleinfoSettings()
+        self.parser = FrameParser(max_frame_size=self.settings.max_frame_size)
+        self._observer = metrics.PortObserver(port, self.parser)
+        self._frames: deque[bytes] = deque()
+        self._serial: serial.Serial | None = None
+        self._exit_stack = ExitStack()
+
+    @property
+    def is_open(self) -> bool:
+        """Whether the serial port is open."""
+        return self._serial is not None
+
+    def open(self) -> None:
+        """Open the serial port, if not already open.
+
+        Raises:
+            serial.SerialException: The port could not be opened.
+        """
+        self._open_serial()
+
+    def _open_serial(self) -> serial.Serial:
+        if self._serial is None:
+            self._serial = self._exit_stack.enter_context(
+                serial.Serial(
+                    port=self.port,
+                    baudrate=self.settings.baudrate,
+                    bytesize=self.settings.bytesize,
+                    parity=self.settings.parity,
+                    stopbits=self.settings.stopbits,
+                    rtscts=self.settings.rtscts,
+                    timeout=self.settings.timeout,
+                )
+            )
+        return self._serial
+
+    def close(self) -> None:
+        """Close the serial port and drop any frame received but not read yet."""
+        self._serial = None
+        self.parser.reset()
+        self._frames.clear()
+        self._exit_stack.close()
+
+    def cancel_read(self) -> None:
+        """Interrupt a read blocked in another thread (POSIX only), if the port is open."""
+        ser = self._serial
+        if ser is not None and hasattr(ser, "cancel_read"):
+            ser.cancel_read()
+
+    def read_frame(self) -> bytes:
+        """Wait for the next complete frame, opening the port if needed.
+
+        Bytes before STX are silently discarded. An overall deadline of
+        ``settings.timeout`` seconds prevents blocking indefinitely.
+
+        Returns:
+            Raw frame bytes from STX through ETX (inclusive).
+
+        Raises:
+            TimeoutError: Deadline exceeded waiting for STX/ETX, or no data received.
+            serial.SerialException: I/O failures (propagated directly).
+        """
+        ser = self._open_serial()
+        if not self._frames:
+            try:
+                self._read_frames(ser)
+            except TimeoutError:
+                metrics.read_timed_out(self.port)
+                raise
+        return self._frames.popleft()
+
+    def _read_frames(self, ser: serial.Serial) -> None:
+        deadline = time.monotonic() + self.settings.timeout
+        while not self._frames:
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"Overall timeout waiting for {'ETX' if self.parser.in_frame else 'STX'}")
+            # Read everything already waiting, or block for at least one byte
+            chunk = ser.read(ser.in_waiting or 1)
+            if not chunk:
+                if self.parser.in_frame:
+                    raise TimeoutError("Incomplete frame: no ETX received")
+                raise TimeoutError("No data received from serial port")
+            self._frames.extend(self._feed(chunk))
+
+    def _feed(self, chunk: bytes) -> list[bytes]:
+        # Only report to metrics hooks when there are some
+        return self._observer.feed(chunk) if metrics.has_hooks() else self.parser.feed(chunk)
+
+    def latest(self) -> bytes:
+        """Most recent complete frame, for pollers that only need the current values.
+
+        Everything waiting on the port is read without blocking, and frames older than
+        the last complete one are dropped. If no frame was completed since the last
+        read, waits for the next one as :meth:`read_frame` does.
+
+        Returns:
+            Raw frame bytes from STX through ETX (inclusive).
+        """
+        ser = self._open_serial()
+        waiting = ser.in_waiting
+        if waiting:
+            self._frames.extend(self._feed(ser.read(waiting)))
+        if not self._frames:
+            return self.read_frame()
+        frame = self._frames.pop()
+        self._frames.clear()
+        return frame
+
+    def frames(self) -> Iterator[bytes]:
+        """Iterate on the frames received, until a read times out (``TimeoutError``)."""
+        while True:
+            yield self.read_frame()
+
+    def __iter__(self) -> Iterator[bytes]:
+        return self.frames()
+
+    def __enter__(self) -> TeleinfoReader:
+        self.open()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+
+class ReceivedFrame(NamedTuple):
+    """Frame received by a :class:`BackgroundReader`."""
+
+    #: Reception time, in seconds since the epoch.
+    timestamp: float
+    #: Raw frame bytes from STX through ETX (inclusive).
+    raw: bytes
+    #: Decoded frame: label to data (:func:`~teleinfo.codec.decode`) in historic
+    #: mode, or to :class:`~teleinfo.standard.StandardInfoGroup` in standard mode.
+    data: dict[str, Any]
+
+
+class BackgroundReader:
+    """Reader of a serial port running in a daemon thread, for pollers.
+
+    A :class:`TeleinfoReader` reads and decodes the frames in the background, and
+    keeps the last ``buffer_size`` ones in a ring buffer: :meth:`latest` returns the
+    most recent frame without blocking, instead of waiting up to a frame time (1 to 2
+    seconds at 1200 bauds) as :meth:`TeleinfoReader.read_frame` does. Frames that
+    cannot be decoded are skipped, and counted in :attr:`decode_errors`. Read timeouts
+    do not stop the thread; serial errors do, and are raised by :meth:`wait_next`.
+
+    Example:
+        .. code-block:: python
+
+            with BackgroundReader("/dev/ttyUSB0") as reader:
+                frame = reader.wait_next(timeout=5)
+                ...
+                papp = reader.latest().data["PAPP"]
+
+    Args:
+        port: Serial device path (e.g. ``"/dev/ttyUSB0"``).
+        settings: Serial, timeout and mode configuration. Defaults to
+            :class:`~teleinfo.settings.TeleinfoSettings` when ``None``.
+        buffer_size: Number of frames kept.
+    """
+
+    def __init__(
+        self, port: str, settings: TeleinfoSettings | None = None, buffer_size: int = DEFAULT_BUFFER_SIZE
+    ) -> None:
+        self.port = port
+        self.reader = TeleinfoReader(port, settings)
+        self.settings = self.reader.settings
+        #: Number of frames that could not be decoded.
+        self.decode_errors = 0
+        #: Serial error that stopped the thread, if any.
+        self.error: BaseException | None = None
+        self._frames: deque[ReceivedFrame] = deque(maxlen=buffer_size)
+        self._latest: ReceivedFrame | None = None
+        self._num_of_frames = 0
+        self._done = True
+        self._condition = threading.Condition()
+        self._stopping = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the thread is reading the port."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Open the port, and start reading it in a daemon thread.
+
+        Raises:
+            serial.SerialException: The port could not be opened.
+        """
+        if self.running:
+            return
+        self.reader.open()
+        self._stopping.clear()
+        self.error = None
+        self._done = False
+        self._thread = threading.Thread(target=self._run, name=f"teleinfo-reader-{self.port}", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the thread and close the port. Received frames are kept."""
+        thread = self._thread
+        if thread is None:
+            return
+        self._stopping.set()
+        # Instead of waiting up to settings.timeout for the current read
+        self.reader.cancel_read()
+        thread.join()
+        self._thread = None
+
+    def _run(self) -> None:
+        if self.settings.mode == "standard":
+            standard_cache = StandardInfoGroupCache()
+
+            def decode_frame(frame):
+                return decode_standard(frame, cache=standard_cache)
+
+        else:
+            cache = InfoGroupCache()
+
+            def decode_frame(frame):
+                return decode(frame, cache=cache)
+
+        try:
+            while not self._stopping.is_set():
+                try:
+                    raw = self.reader.read_frame()
+                except TimeoutError:
+                    continue
+                try:
+                    data = metrics.observe_decode(self.port, decode_frame, raw)
+                except (TeleinfoDecodingError, UnicodeDecodeError):
+                    # Noise on the line may also garble bytes out of the ASCII range
+                    self.decode_errors += 1
+                    continue
+                received_frame = ReceivedFrame(time.time(), raw, data)
+                with self._condition:
+                    self._frames.append(received_frame)
+                    self._latest = received_frame
+                    self._num_of_frames += 1
+                    self._condition.notify_all()
+        except Exception as exception:  # pylint: disable=broad-exception-caught
+            # Serial errors stop the thread, and are raised to the callers of wait_next()
+            self.error = exception
+        finally:
+            self.reader.close()
+            with self._condition:
+                self._done = True
+                self._condition.notify_all()
+
+    def latest(self) -> ReceivedFrame | None:
+        """Most recent frame, without blocking, or ``None`` if none was received yet."""
+        return self._latest
+
+    def frames(self) -> list[ReceivedFrame]:
+        """Frames of the ring buffer, oldest first."""
+        with self._condition:
+            return list(self._frames)
+
+    def wait_next(self, timeout: float | None = None) -> ReceivedFrame:
+        """Wait for the next frame received.
+
+        Args:
+            timeout: Max number of seconds to wait, or ``None`` to wait forever.
+
+        Returns:
+            The first frame received after the call.
+
+        Raises:
+            TimeoutError: No frame received within ``timeout`` seconds.
+            serial.SerialException: The thread stopped on a serial error.
+            RuntimeError: The reader is not running.
+        """
+        with self._condition:
+            num_of_frames = self._num_of_frames
+            if not self._condition.wait_for(lambda: self._num_of_frames > num_of_frames or self._done, timeout):
+                raise TimeoutError(f"No frame received for {timeout} secs")
+            if self._num_of_frames > num_of_frames:
+                # First frame received since the call, if still in the buffer
+                return self._frames[max(num_of_frames - self._num_of_frames, -len(self._frames))]
+        if self.error is not None:
+            raise self.error
+        raise RuntimeError("The reader is not running")
+
+    def __enter__(self) -> BackgroundReader:
+        self.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.stop()
 
 
 def read_frame(port: str, settings: TeleinfoSettings | None = None) -> bytes:
     """Open *port* and read one complete Teleinfo frame synchronously.
 
-    Bytes before STX are silently discarded. Enforces an overall deadline
-    to prevent blocking indefinitely.
+    Bytes before STX are silently discarded. Reads everything waiting on the
+    port at once (see :class:`~teleinfo.framing.FrameParser`) and enforces an
+    overall deadline to prevent blocking indefinitely. To read several frames, a
+    :class:`TeleinfoReader` keeps the port open between reads.
 
     Args:
         port: Serial device path (e.g. ``"/dev/ttyUSB0"``).
@@ -28,42 +369,5 @@ def read_frame(port: str, settings: TeleinfoSettings | None = None) -> bytes:
         TimeoutError: Deadline exceeded waiting for STX/ETX, or no data received.
         serial.SerialException: Port-open or I/O failures (propagated directly).
     """
-    if settings is None:
-        settings = TeleinfoSettings()
-
-    stx = STX_TOKEN.encode(ENCODING)
-    etx = ETX_TOKEN.encode(ENCODING)
-    deadline = time.monotonic() + settings.timeout
-
-    with serial.Serial(
-        port=port,
-        baudrate=settings.baudrate,
-        bytesize=settings.bytesize,
-        parity=settings.parity,
-        stopbits=settings.stopbits,
-        rtscts=settings.rtscts,
-        timeout=settings.timeout,
-    ) as ser:
-        # Read until we find STX (start of frame)
-        while True:
-            if time.monotonic() >= deadline:
-                raise TimeoutError("Overall timeout waiting for STX")
-            byte = ser.read(1)
-            if not byte:
-                raise TimeoutError("No data received from serial port")
-            if byte == stx:
-                break
-
-        # Read until ETX (end of frame)
-        frame = bytearray(stx)
-        while True:
-            if time.monotonic() >= deadline:
-                raise TimeoutError("Overall timeout waiting for ETX")
-            byte = ser.read(1)
-            if not byte:
-                raise TimeoutError("Incomplete frame: no ETX received")
-            frame.append(byte[0])
-            if byte == etx:
-                break
-
-    return bytes(frame)
+    with TeleinfoReader(port, settings) as reader:
+        return reader.read_frame()
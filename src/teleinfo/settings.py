@@ -1,17 +1,33 @@
-import serial
-from pydantic import Field
+from typing import Literal
+
+from pydantic import Field, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
+#: Line rate of each teleinfo mode, in bauds.
+MODE_BAUDRATES = {"historic": 1200, "standard": 9600}
+
+
 class TeleinfoSettings(BaseSettings):
     """Teleinfo serial communication and operational settings."""
 
     model_config = SettingsConfigDict(env_prefix="TELEINFO_")
 
-    baudrate: int = Field(default=1200, description="Serial baud rate")
-    bytesize: int = Field(default=serial.SEVENBITS, description="Serial byte size")
-    parity: str = Field(default=serial.PARITY_EVEN, description="Serial parity")
-    stopbits: int | float = Field(default=serial.STOPBITS_ONE, description="Serial stop bits")
+    mode: Literal["historic", "standard"] = Field(
+        default="historic", description="Teleinfo mode of the meter: historic, or standard (Linky)"
+    )
+    baudrate: int = Field(default=1200, description="Serial baud rate, 9600 by default in standard mode")
+    # pyserial SEVENBITS, PARITY_EVEN and STOPBITS_ONE, not imported to load settings without pyserial
+    bytesize: int = Field(default=7, description="Serial byte size")
+    parity: str = Field(default="E", description="Serial parity")
+    stopbits: int | float = Field(default=1, description="Serial stop bits")
     rtscts: int = Field(default=1, description="RTS/CTS flow control")
     max_frames: int = Field(default=3, description="Max frames to read when checking a port")
     timeout: float = Field(default=5.0, description="Read timeout in seconds")
+    max_frame_size: int = Field(default=4096, description="Max size of a frame in bytes, larger frames are dropped")
+
+    @model_validator(mode="after")
+    def _default_mode_baudrate(self) -> "TeleinfoSettings":
+        if "baudrate" not in self.model_fields_set:
+            self.baudrate = MODE_BAUDRATES[self.mode]
+        return self
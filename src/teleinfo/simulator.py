@@ -0,0 +1,327 @@
+"""Teleinfo meter simulator streaming frames over pseudo-terminals (POSIX only).
+
+Each simulated meter gets a pseudo-terminal pair: frames are written on the master
+side, at the line rate of the meter (or a multiple of it), and the slave side is a
+regular serial device path (e.g. ``/dev/pts/4``) that
+:func:`~teleinfo.serial_reader.read_frame`, :class:`~teleinfo.stream.TeleinfoStream`
+or the ``teleinfo port`` command can read with their default settings.
+
+.. code-block:: python
+
+    meters = [SimulatedMeter(TariffOption.OFF_PEAK, seed=index) for index in range(100)]
+    with MeterSimulator(meters, speedup=10) as simulator:
+        print(simulator.ports)
+        asyncio.run(simulator.run(duration=60))
+
+Pseudo-terminals ignore the speed, character size and parity of the serial settings.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import random
+import termios
+import tty
+from collections.abc import Iterable, Sequence
+from datetime import datetime, timedelta
+from types import TracebackType
+from typing import Protocol
+
+from .codec import FrameEncoder
+from .const import ENCODING, ETX_TOKEN
+from .labels import TariffOption, TomorrowColor
+
+
+#: Bits per character on the line: start bit, 7 data bits, parity bit and stop bit.
+BITS_PER_CHAR = 10
+#: Silence between two frames, in seconds (16.7 to 33.4 ms according to the specification).
+FRAME_INTERVAL = 0.025
+
+# Index labels, by tariff option and (off-peak, day color) for Tempo
+_INDEX_LABELS = {
+    TariffOption.BASE: {"TH..": "BASE"},
+    TariffOption.OFF_PEAK: {"HC..": "HCHC", "HP..": "HCHP"},
+    TariffOption.EJP: {"HN..": "EJPHN", "PM..": "EJPHPM"},
+    TariffOption.TEMPO: {
+        f"H{hours}J{color}": f"BBRH{hours}J{color}" for color in ("B", "W", "R") for hours in ("C", "P")
+    },
+}
+_TEMPO_COLORS = {"B": TomorrowColor.BLUE, "W": TomorrowColor.WHITE, "R": TomorrowColor.RED}
+
+
+class Meter(Protocol):
+    """Source of the raw frames of a simulated meter."""
+
+    def next_frame(self) -> bytes:
+        """Return the next frame to transmit, from STX through ETX."""
+
+
+class SimulatedMeter:
+    """Meter in historic mode, generating realistic frames for its tariff option.
+
+    The apparent power (``PAPP``) follows a random walk, the instantaneous current
+    (``IINST``) follows it, and the index of the current tariff period grows with the
+    energy consumed. The simulated clock advances by the transmission time of each
+    frame, so tariff periods switch (off-peak hours from 22:00 to 06:00, EJP mobile
+    peak and Tempo day colors) as they would on a real meter, possibly faster when the
+    simulator is sped up.
+
+    Args:
+        option: Tariff option of the meter.
+        adco: Meter address. Generated from ``seed`` when ``None``.
+        subscribed_current: Subscribed current (``ISOUSC``) in amperes.
+        seed: Seed of the random generator, for reproducible frames.
+        start: Initial date of the simulated clock. Defaults to the current date.
+        baudrate: Line rate of the meter, used to advance the simulated clock.
+    """
+
+    def __init__(
+        self,
+        option: TariffOption = TariffOption.OFF_PEAK,
+        adco: str | None = None,
+        subscribed_current: int = 30,
+        seed: int | None = None,
+        start: datetime | None = None,
+        baudrate: int = 1200,
+    ) -> None:
+        self._random = random.Random(seed)
+        self.option = option
+        self.adco = adco if adco is not None else f"{self._random.randrange(10**12):012d}"
+        self.subscribed_current = subscribed_current
+        self.baudrate = baudrate
+        #: Current date of the simulated clock.
+        self.clock = start if start is not None else datetime.now()
+        #: Energy consumed on each index, in Wh.
+        self.indexes = dict.fromkeys(_INDEX_LABELS[option].values(), 0.0)
+        for label in self.indexes:
+            self.indexes[label] = float(self._random.randrange(10**6, 10**8))
+        self.apparent_power = self._random.randrange(200, 3000)
+        self.max_current = 0
+        self._encoder = FrameEncoder()
+
+    def _period(self, date: datetime) -> str:
+        off_peak = date.hour >= 22 or date.hour < 6
+        if self.option == TariffOption.BASE:
+            return "TH.."
+        if self.option == TariffOption.OFF_PEAK:
+            return "HC.." if off_peak else "HP.."
+        if self.option == TariffOption.EJP:
+            # Mobile peak from 07:00 to 01:00 on about one day out of 16
+            day = date - timedelta(hours=7)
+            return "PM.." if day.timetuple().tm_yday % 16 == 0 and day.hour < 18 else "HN.."
+        # Tempo days start at 06:00
+        return f"H{'C' if off_peak else 'P'}J{self._tempo_color(date - timedelta(hours=6))}"
+
+    @staticmethod
+    def _tempo_color(date: datetime) -> str:
+        day = date.timetuple().tm_yday
+        if day % 16 == 0:
+            return "R"
+        return "W" if day % 8 == 0 else "B"
+
+    def next_info_groups(self) -> dict[str, str]:
+        """Advance the simulated clock by one frame and return its info groups."""
+        maximum_power = self.subscribed_current * 240
+        self.apparent_power = min(max(self.apparent_power + self._random.randint(-150, 150), 0), maximum_power)
+        current = round(self.apparent_power / 230)
+        self.max_current = max(self.max_current, current)
+        period = self._period(self.clock)
+
+        info_groups = {"ADCO": self.adco, "OPTARIF": _optarif(self.option), "ISOUSC": f"{self.subscribed_current:02d}"}
+        info_groups.update({label: f"{int(energy):09d}" for label, energy in self.indexes.items()})
+        if self.option == TariffOption.EJP and period == "PM..":
+            info_groups["PEJP"] = "30"
+        info_groups["PTEC"] = period
+        if self.option == TariffOption.TEMPO:
+            tomorrow = self.clock - timedelta(hours=6) + timedelta(days=1)
+            info_groups["DEMAIN"] = _TEMPO_COLORS[self._tempo_color(tomorrow)].value
+        info_groups["IINST"] = f"{current:03d}"
+        if current > self.subscribed_current:
+            info_groups["ADPS"] = f"{current:03d}"
+        info_groups["IMAX"] = f"{self.max_current:03d}"
+        info_groups["PAPP"] = f"{self.apparent_power:05d}"
+        info_groups["HHPHC"] = "A"
+        info_groups["MOTDETAT"] = "000000"
+
+        # Transmission time of the frame, LF/SP/SP/checksum/CR around label and data
+        num_of_chars = 2 + sum(len(label) + len(data) + 5 for label, data in info_groups.items())
+        elapsed = timedelta(seconds=num_of_chars * BITS_PER_CHAR / self.baudrate + FRAME_INTERVAL)
+        self.indexes[_INDEX_LABELS[self.option][period]] += self.apparent_power * elapsed.total_seconds() / 3600
+        self.clock += elapsed
+        return info_groups
+
+    def next_frame(self) -> bytes:
+        """Advance the simulated clock by one frame and return it, from STX through ETX."""
+        return self._encoder.encode(self.next_info_groups())
+
+
+def _optarif(option: TariffOption) -> str:
+    return "BBR(" if option == TariffOption.TEMPO else option.value
+
+
+class ReplayMeter:
+    """Meter replaying raw frames verbatim, in a loop.
+
+    Args:
+        frames: Raw frames, from STX through ETX.
+        offset: Index of the first frame to replay, so that meters replaying the same
+            frames are not all in sync.
+    """
+
+    def __init__(self, frames: Sequence[bytes], offset: int = 0) -> None:
+        if not frames:
+            raise ValueError("No frame to replay")
+        self.frames = frames
+        self._index = offset % len(frames)
+
+    @classmethod
+    def from_capture(cls, data: bytes, offset: int = 0) -> ReplayMeter:
+        """Replay the frames of a capture file, such as ``captured_frames.bin``.
+
+        Args:
+            data: Concatenated raw frames. Bytes after the last ETX are ignored.
+            offset: Index of the first frame to replay.
+        """
+        etx = ETX_TOKEN.encode(ENCODING)
+        return cls([frame + etx for frame in data.split(etx)[:-1]], offset)
+
+    def next_frame(self) -> bytes:
+        frame = self.frames[self._index]
+        self._index = (self._index + 1) % len(self.frames)
+        return frame
+
+
+class MeterSimulator:
+    """Streams the frames of simulated meters over pseudo-terminal pairs.
+
+    Frames are written by chunks of ``chunk_duration`` seconds of transmission, at
+    ``speedup`` times the line rate, with a silence between frames, so that readers get
+    frames split across reads as they would from a real meter. Frames that do not fit
+    in the pseudo-terminal buffer (no reader, or a reader too slow) are dropped and
+    counted in :attr:`frames_dropped`.
+
+    Args:
+        meters: Meters to simulate, one pseudo-terminal pair each.
+        baudrate: Line rate of the meters.
+        speedup: Multiple of the line rate to write at.
+        chunk_duration: Transmission time of the chunks written at once, in seconds.
+    """
+
+    def __init__(
+        self,
+        meters: Iterable[Meter],
+        baudrate: int = 1200,
+        speedup: float = 1.0,
+        chunk_duration: float = 0.05,
+    ) -> None:
+        self.meters = list(meters)
+        self.baudrate = baudrate
+        self.speedup = speedup
+        self.chunk_duration = chunk_duration
+        #: Slave device path of each meter, once open.
+        self.ports: list[str] = []
+        #: Number of frames written, and dropped.
+        self.frames_sent = 0
+        self.frames_dropped = 0
+        self._pairs: list[tuple[int, int]] = []
+
+    @property
+    def chars_per_second(self) -> float:
+        """Characters written per second on each pseudo-terminal."""
+        return self.speedup * self.baudrate / BITS_PER_CHAR
+
+    def open(self) -> None:
+        """Open one pseudo-terminal pair per meter, if not already open."""
+        if self._pairs:
+            return
+        try:
+            for _ in self.meters:
+                master_fd, slave_fd = os.openpty()
+                self._pairs.append((master_fd, slave_fd))
+                tty.setraw(slave_fd)
+                os.set_blocking(master_fd, False)
+        except BaseException:
+            self.close()
+            raise
+        self.ports = [os.ttyname(slave_fd) for _, slave_fd in self._pairs]
+
+    def close(self) -> None:
+        """Close all pseudo-terminal pairs."""
+        for master_fd, slave_fd in self._pairs:
+            os.close(slave_fd)
+            os.close(master_fd)
+        self._pairs = []
+        self.ports = []
+
+    async def run(self, duration: float | None = None) -> None:
+        """Stream frames on all pseudo-terminals, opening them if needed.
+
+        Args:
+            duration: Duration of the simulation in seconds, ``None`` to run until cancelled.
+        """
+        self.open()
+        tasks = [
+            asyncio.create_task(self._stream(meter, master_fd, slave_fd))
+            for meter, (master_fd, slave_fd) in zip(self.meters, self._pairs, strict=True)
+        ]
+        try:
+            await asyncio.wait_for(asyncio.gather(*tasks), duration)
+        except TimeoutError:
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _stream(self, meter: Meter, master_fd: int, slave_fd: int) -> None:
+        chunk_size = max(1, round(self.chars_per_second * self.chunk_duration))
+        loop = asyncio.get_running_loop()
+        next_write = loop.time()
+        while True:
+            frame = meter.next_frame()
+            for start in range(0, len(frame), chunk_size):
+                chunk = frame[start : start + chunk_size]
+                try:
+                    written = os.write(master_fd, chunk)
+                except BlockingIOError:
+                    written = 0
+                # Before any reader gets a chance to close and reopen the port
+                _release_settings(slave_fd)
+                if written < len(chunk):
+                    self.frames_dropped += 1
+                    break
+                next_write += len(chunk) / self.chars_per_second
+                await asyncio.sleep(next_write - loop.time())
+            else:
+                self.frames_sent += 1
+            next_write += FRAME_INTERVAL / self.speedup
+            await asyncio.sleep(next_write - loop.time())
+
+    def __enter__(self) -> MeterSimulator:
+        self.open()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+
+def _release_settings(slave_fd: int) -> None:
+    """Change the speed of a pseudo-terminal after a reader configured it.
+
+    Pseudo-terminals only support 8 bits without parity, and Linux rejects (EINVAL) a
+    configuration whose only changes are unsupported: once a reader configured a port
+    in 7 bits/even parity, the next reader opening it with the same settings would
+    fail. Changing the (meaningless) speed back makes its configuration a change again.
+    Called after each write, so that readers reopening the port as soon as they receive
+    a frame find it released.
+    """
+    attributes = termios.tcgetattr(slave_fd)
+    if attributes[4] != termios.B38400:
+        attributes[4] = attributes[5] = termios.B38400
+        termios.tcsetattr(slave_fd, termios.TCSANOW, attributes)
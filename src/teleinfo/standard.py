@@ -0,0 +1,209 @@
+"""Decoding of the frames of Linky meters in standard mode.
+
+In standard mode (9600 bauds), info groups are separated by HT and some of them carry
+a timestamp (*horodate*) between their label and their data::
+
+    LF label HT data HT checksum CR
+    LF label HT horodate HT data HT checksum CR
+
+The checksum is always computed with method 2 (from the label through the last HT),
+and the data may contain spaces. :func:`~teleinfo.codec.decode` does not know about
+horodates, and would return them as part of the data: :func:`decode_standard` splits
+each info group on HT only, in a single pass, and returns its label, horodate and data.
+
+.. code-block:: python
+
+    >>> decoded_frame = decode_standard(frame)
+    >>> decoded_frame["SMAXSN"]
+    StandardInfoGroup(label='SMAXSN', horodate='H240115184310', data='05120')
+    >>> decoded_frame["SMAXSN"].timestamp
+    datetime.datetime(2024, 1, 15, 18, 43, 10, tzinfo=datetime.timezone(datetime.timedelta(seconds=3600)))
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import NamedTuple, NoReturn
+
+from .codec import _BoundedInfoGroupCache, _verify_frame_well_formed
+from .const import CR_TOKEN, ENCODING, ETX_TOKEN, HT_TOKEN, LF_TOKEN, STX_TOKEN
+from .exceptions import ChecksumError, FrameFormatError, InfoGroupFormatError
+
+
+#: Line rate of the standard mode, in bauds.
+STANDARD_BAUDRATE = 9600
+#: Length of a horodate: season and AAMMJJhhmmss.
+HORODATE_LENGTH = 13
+
+_HT_BYTES = HT_TOKEN.encode(ENCODING)
+_FRAME_START = (STX_TOKEN + LF_TOKEN).encode(ENCODING)
+_FRAME_END = (CR_TOKEN + ETX_TOKEN).encode(ENCODING)
+_EMPTY_FRAME = (STX_TOKEN + ETX_TOKEN).encode(ENCODING)
+_INFO_GROUP_SEPARATOR = (CR_TOKEN + LF_TOKEN).encode(ENCODING)
+_LF_BYTES = LF_TOKEN.encode(ENCODING)
+_CR_BYTES = CR_TOKEN.encode(ENCODING)
+# UTC offset by season of the horodate (lower case when the clock of the meter is degraded)
+_SEASON_TIMEZONES = {
+    "E": timezone(timedelta(hours=2)),
+    "H": timezone(timedelta(hours=1)),
+}
+
+
+class StandardInfoGroup(NamedTuple):
+    """Info group of a standard mode frame."""
+
+    #: Label of the info group.
+    label: str
+    #: Horodate of the info group (e.g. ``"H240115184310"``), ``None`` if it has none.
+    horodate: str | None
+    #: Data of the info group, possibly empty (e.g. ``DATE``) or containing spaces.
+    data: str
+
+    @property
+    def timestamp(self) -> datetime | None:
+        """Horodate of the info group as a datetime (see :func:`parse_horodate`)."""
+        return parse_horodate(self.horodate) if self.horodate is not None else None
+
+
+def parse_horodate(horodate: str) -> datetime:
+    """Parse the horodate of an info group.
+
+    Args:
+        horodate: Season (``E`` for summer, ``H`` for winter, in lower case if the clock
+            of the meter is degraded, space if unknown) followed by ``AAMMJJhhmmss``.
+
+    Returns:
+        The date, aware (UTC+2 in summer, UTC+1 in winter) unless the season is unknown.
+
+    Raises:
+        ValueError: ``horodate`` is not a valid horodate.
+    """
+    digits = horodate[1:]
+    if len(horodate) != HORODATE_LENGTH or not digits.isdigit():
+        raise ValueError(f"Invalid horodate '{horodate}'")
+    date = datetime(
+        2000 + int(digits[0:2]),
+        int(digits[2:4]),
+        int(digits[4:6]),
+        int(digits[6:8]),
+        int(digits[8:10]),
+        int(digits[10:12]),
+    )
+    return date.replace(tzinfo=_SEASON_TIMEZONES.get(horodate[0].upper()))
+
+
+class StandardInfoGroupCache(_BoundedInfoGroupCache[StandardInfoGroup]):
+    """Bounded LRU cache of the info groups decoded by :func:`decode_standard`.
+
+    The equivalent of :class:`~teleinfo.codec.InfoGroupCache`, which it cannot be mixed
+    with: most info groups of consecutive standard frames are identical (indexes of the
+    inactive periods, identifiers, horodates of the daily maximums...).
+
+    Args:
+        maxsize: Max number of info groups kept.
+    """
+
+    __slots__ = ()
+
+    def _decode(self, info_group_core: bytes) -> StandardInfoGroup | None:
+        return _decode_standard_info_group_bytes(info_group_core)
+
+
+def decode_standard(frame, cache: StandardInfoGroupCache | None = None) -> dict[str, StandardInfoGroup]:
+    """Decode a standard mode frame.
+
+    Well formed frames are split into info groups at once, and each info group is split
+    on HT: the number of fields tells whether it has a horodate. Only invalid frames
+    are analyzed further, to raise the error describing their first problem.
+
+    Args:
+        frame: Teleinfo frame, in string or bytes format.
+        cache: Optional cache of the info groups already decoded.
+
+    Returns:
+        A dict of :class:`StandardInfoGroup`, by label.
+
+    Raises:
+        FrameFormatError: The frame is not well formed.
+        InfoGroupFormatError: An info group does not have 3 or 4 fields separated by HT.
+        ChecksumError: The checksum of an info group does not match (method 2).
+        TypeError: ``cache`` is not a :class:`StandardInfoGroupCache`.
+    """
+    if cache is not None and not isinstance(cache, StandardInfoGroupCache):
+        raise TypeError(f"cache should be a StandardInfoGroupCache, not {type(cache).__name__}")
+    if isinstance(frame, str):
+        # Non ASCII characters are kept non ASCII, and rejected below
+        frame = frame.encode("utf-8")
+    elif not isinstance(frame, bytes):
+        frame = bytes(frame)
+
+    if frame == _EMPTY_FRAME:
+        return {}
+    if not frame.startswith(_FRAME_START) or not frame.endswith(_FRAME_END) or not frame.isascii():
+        _raise_frame_error(frame)
+    info_group_cores = frame[2:-2].split(_INFO_GROUP_SEPARATOR)
+    # Any other LF or CR is misplaced
+    num_of_info_groups = len(info_group_cores)
+    if frame.count(_LF_BYTES) != num_of_info_groups or frame.count(_CR_BYTES) != num_of_info_groups:
+        _raise_frame_error(frame)
+
+    decode_info_group_bytes = _decode_standard_info_group_bytes if cache is None else cache.decode_info_group_bytes
+    decoded_frame: dict[str, StandardInfoGroup] = {}
+    for info_group_core in info_group_cores:
+        info_group = decode_info_group_bytes(info_group_core)
+        if info_group is None:
+            _raise_info_group_error(info_group_core)
+        decoded_frame[info_group.label] = info_group
+    return decoded_frame
+
+
+def _decode_standard_info_group_bytes(info_group_core: bytes) -> StandardInfoGroup | None:
+    """Verify and decode the core of a standard info group (without its LF and CR).
+
+    Returns:
+        The info group, or None if it is malformed or its checksum does not match.
+    """
+    fields = info_group_core.split(_HT_BYTES)
+    num_of_fields = len(fields)
+    if num_of_fields == 3:
+        label, data, checksum = fields
+        horodate = None
+    elif num_of_fields == 4:
+        label, raw_horodate, data, checksum = fields
+        if len(raw_horodate) != HORODATE_LENGTH:
+            return None
+        horodate = raw_horodate.decode(ENCODING)
+    else:
+        return None
+    if not label or len(checksum) != 1 or checksum[0] != (sum(info_group_core[:-1]) & 0x3F) + 0x20:
+        return None
+    return StandardInfoGroup(label.decode(ENCODING), horodate, data.decode(ENCODING))
+
+
+def _raise_frame_error(frame: bytes) -> NoReturn:
+    frame_string = frame.decode(ENCODING, errors="replace")
+    _verify_frame_well_formed(frame_string)
+    if not frame.isascii():
+        raise FrameFormatError(frame_string, "Should only contain ASCII characters")
+    raise FrameFormatError(frame_string, "Should only contain LF, CR pairs delimiting info groups")
+
+
+def _raise_info_group_error(info_group_core: bytes) -> NoReturn:
+    info_group = f"{LF_TOKEN}{info_group_core.decode(ENCODING)}{CR_TOKEN}"
+    fields = info_group_core.split(_HT_BYTES)
+    if len(fields) not in (3, 4) or not fields[0] or len(fields[-1]) != 1:
+        raise InfoGroupFormatError(info_group, f"Should contain 3 or 4 fields separated by HT but has '{len(fields)}'")
+    if len(fields) == 4 and len(fields[1]) != HORODATE_LENGTH:
+        raise InfoGroupFormatError(
+            info_group, f"Horodate should have {HORODATE_LENGTH} chars but has '{len(fields[1])}'"
+        )
+    label_data_and_separators = info_group_core[:-1].decode(ENCODING)
+    checksum = chr((sum(info_group_core[:-1]) & 0x3F) + 0x20)
+    raise ChecksumError(
+        label_data_and_separators,
+        None,
+        msg=(
+            f"Needed checksum '{info_group_core[-1:].decode(ENCODING)}' to validate the info group "
+            f"'{label_data_and_separators}', but method 2 checksum is '{checksum}'"
+        ),
+    )
@@ -0,0 +1,284 @@
+"""Asynchronous Teleinfo frame stream over a long-lived serial connection."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+from collections import deque
+from collections.abc import Iterable
+from types import TracebackType
+
+import serial
+
+from . import metrics
+from .framing import FrameParser
+from .settings import TeleinfoSettings
+
+
+_READ_CHUNK_SIZE = 1024
+_PORT_DONE = object()
+
+
+class TeleinfoStream:
+    """Asynchronous iterator over the frames received on a serial port.
+
+    The port is opened once (when entering the context, or on the first read) and
+    kept open until :meth:`close`, so that no frame is lost between two reads.
+    Frames are extracted by a :class:`~teleinfo.framing.FrameParser` bounded by
+    ``settings.max_frame_size``, and each frame must be received within
+    ``settings.timeout`` seconds.
+
+    Example:
+        .. code-block:: python
+
+            async with TeleinfoStream("/dev/ttyUSB0") as stream:
+                async for frame in stream:
+                    print(decode(frame))
+
+    Args:
+        port: Serial device path (e.g. ``"/dev/ttyUSB0"``).
+        settings: Serial and timeout configuration. Defaults to
+            :class:`~teleinfo.settings.TeleinfoSettings` when ``None``.
+    """
+
+    def __init__(self, port: str, settings: TeleinfoSettings | None = None) -> None:
+        self.port = port
+        self.settings = settings if settings is not None else TeleinfoSettings()
+        self.parser = FrameParser(max_frame_size=self.settings.max_frame_size)
+        self._observer = metrics.PortObserver(port, self.parser)
+        self._frames: deque[bytes] = deque()
+        self._reader: asyncio.StreamReader | None = None
+        self._transport: asyncio.BaseTransport | None = None
+
+    @property
+    def is_open(self) -> bool:
+        """Whether the serial connection is open."""
+        return self._reader is not None
+
+    async def open(self) -> None:
+        """Open the serial connection, if not already open.
+
+        Raises:
+            OSError: The port could not be opened (``serial.SerialException`` is a subclass).
+        """
+        await self._open_reader()
+
+    async def _open_reader(self) -> asyncio.StreamReader:
+        if self._reader is None:
+            self._reader, self._transport = await _open_serial_reader(self.port, self.settings)
+        return self._reader
+
+    async def close(self) -> None:
+        """Close the serial connection and drop any frame received but not read yet."""
+        transport, self._reader, self._transport = self._transport, None, None
+        self.parser.reset()
+        self._frames.clear()
+        if transport is not None:
+            transport.close()
+            # Let the transport release the port
+            await asyncio.sleep(0)
+
+    async def read_frame(self) -> bytes:
+        """Wait for the next complete frame, opening the connection if needed.
+
+        Returns:
+            Raw frame bytes from STX through ETX (inclusive).
+
+        Raises:
+            TimeoutError: No complete frame received within ``settings.timeout`` seconds.
+            EOFError: The serial connection was closed.
+        """
+        reader = await self._open_reader()
+        if not self._frames:
+            try:
+                async with asyncio.timeout(self.settings.timeout):
+                    while not self._frames:
+                        chunk = await reader.read(_READ_CHUNK_SIZE)
+                        if not chunk:
+                            raise EOFError(f"Serial connection to '{self.port}' closed")
+                        # Only report to metrics hooks when there are some
+                        feed = self._observer.feed if metrics.has_hooks() else self.parser.feed
+                        self._frames.extend(feed(chunk))
+            except TimeoutError:
+                metrics.read_timed_out(self.port)
+                raise
+        return self._frames.popleft()
+
+    async def __aenter__(self) -> TeleinfoStream:
+        await self.open()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        await self.close()
+
+    def __aiter__(self) -> TeleinfoStream:
+        return self
+
+    async def __anext__(self) -> bytes:
+        try:
+            return await self.read_frame()
+        except EOFError:
+            await self.close()
+            raise StopAsyncIteration from None
+
+
+async def _open_serial_reader(
+    port: str, settings: TeleinfoSettings
+) -> tuple[asyncio.StreamReader, asyncio.BaseTransport]:
+    """Open *port* for reading with the running event loop.
+
+    On POSIX systems, pyserial only opens and configures the port, whose file
+    descriptor is then watched by the event loop itself (epoll/kqueue), like a pipe.
+    Unlike ``serial_asyncio``, whose reads go through ``select()``, this works with
+    any number of ports and costs a single system call per read. Other systems use
+    ``serial_asyncio``.
+
+    Returns:
+        The stream reader, and the transport to close to release the port.
+    """
+    if os.name != "posix":
+        import serial_asyncio  # pylint: disable=import-outside-toplevel
+
+        reader, writer = await serial_asyncio.open_serial_connection(
+            url=port,
+            baudrate=settings.baudrate,
+            bytesize=settings.bytesize,
+            parity=settings.parity,
+            stopbits=settings.stopbits,
+            rtscts=settings.rtscts,
+        )
+        return reader, writer.transport
+
+    ser = serial.Serial(
+        port=port,
+        baudrate=settings.baudrate,
+        bytesize=settings.bytesize,
+        parity=settings.parity,
+        stopbits=settings.stopbits,
+        rtscts=settings.rtscts,
+        timeout=0,
+    )
+    reader = asyncio.StreamReader()
+    try:
+        transport, _ = await asyncio.get_running_loop().connect_read_pipe(
+            lambda: asyncio.StreamReaderProtocol(reader), ser
+        )
+    except BaseException:
+        ser.close()
+        raise
+    return reader, transport
+
+
+class TeleinfoMultiStream:
+    """Asynchronous iterator merging the frames received on several serial ports.
+
+    Each port is read by its own :class:`TeleinfoStream` in a task of the current
+    event loop (no thread per port), and frames are yielded as ``(port, frame)``
+    tuples in the order they are received.
+
+    A port whose frame deadline expires is kept open and read again, the
+    :class:`TimeoutError` being recorded in :attr:`errors`. A port that cannot be
+    opened or read, or that fails unexpectedly, is closed, its error recorded in
+    :attr:`errors`. Iteration stops once all ports are closed.
+
+    Example:
+        .. code-block:: python
+
+            ports = ["/dev/ttyUSB0", ("/dev/ttyUSB1", TeleinfoSettings(baudrate=9600))]
+            async with TeleinfoMultiStream(ports) as streams:
+                async for port, frame in streams:
+                    print(port, decode(frame))
+
+    Args:
+        ports: Serial device paths, or ``(path, settings)`` tuples for ports needing
+            their own settings.
+        settings: Settings of the ports given without settings. Defaults to
+            :class:`~teleinfo.settings.TeleinfoSettings` when ``None``.
+        queue_size: Max number of frames received but not yet consumed.
+    """
+
+    def __init__(
+        self,
+        ports: Iterable[str | tuple[str, TeleinfoSettings]],
+        settings: TeleinfoSettings | None = None,
+        queue_size: int = 1024,
+    ) -> None:
+        default_settings = settings if settings is not None else TeleinfoSettings()
+        self.streams: dict[str, TeleinfoStream] = {}
+        for port in ports:
+            if isinstance(port, str):
+                self.streams[port] = TeleinfoStream(port, default_settings)
+            else:
+                self.streams[port[0]] = TeleinfoStream(*port)
+        #: Last error raised by each port.
+        self.errors: dict[str, BaseException] = {}
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self._tasks: list[asyncio.Task] = []
+        self._running = 0
+        self._closing = False
+
+    def start(self) -> None:
+        """Start reading all ports, if not already started."""
+        if self._tasks:
+            return
+        self._tasks = [asyncio.create_task(self._read_port(stream)) for stream in self.streams.values()]
+        self._running = len(self._tasks)
+
+    async def close(self) -> None:
+        """Stop reading and close all ports."""
+        self._closing = True
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._running = 0
+
+    async def _read_port(self, stream: TeleinfoStream) -> None:
+        try:
+            while True:
+                try:
+                    frame = await stream.read_frame()
+                except TimeoutError as exception:
+                    self.errors[stream.port] = exception
+                    continue
+                await self._queue.put((stream.port, frame))
+        except EOFError:
+            pass
+        except Exception as exception:  # pylint: disable=broad-except
+            # OSError, termios.error, or any unexpected error: end this port only
+            self.errors[stream.port] = exception
+        finally:
+            try:
+                await stream.close()
+            finally:
+                # Once closing, nothing consumes the queue any more
+                if not self._closing:
+                    await self._queue.put(_PORT_DONE)
+
+    async def __aenter__(self) -> TeleinfoMultiStream:
+        self.start()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        await self.close()
+
+    def __aiter__(self) -> TeleinfoMultiStream:
+        return self
+
+    async def __anext__(self) -> tuple[str, bytes]:
+        self.start()
+        while self._running:
+            item = await self._queue.get()
+            if item is not _PORT_DONE:
+                return item
+            self._running -= 1
+        raise StopAsyncIteration
@@ -1,4 +1,6 @@
 # pylint: disable=missing-docstring
+from pathlib import Path
+
 import pytest
 import pytest_asyncio
 
@@ -123,3 +125,21 @@ def recorded_frame_1():
 @pytest.fixture
 def recorded_frame_1_expected():
     return RECORDED_FRAME_1_EXPECTED
+
+
+CAPTURED_FRAMES_PATH = Path(__file__).parents[2] / "captured_frames.bin"
+
+
+@pytest.fixture(scope="session")
+def captured_frames_path():
+    return CAPTURED_FRAMES_PATH
+
+
+@pytest.fixture(scope="session")
+def captured_frames_bin():
+    return CAPTURED_FRAMES_PATH.read_bytes()
+
+
+@pytest.fixture(scope="session")
+def captured_frames(captured_frames_bin):
+    return [frame + ETX_TOKEN.encode() for frame in captured_frames_bin.split(ETX_TOKEN.encode())[:-1]]
@@ -0,0 +1,57 @@
+"""Tests for teleinfo.aggregate."""
+
+import random
+
+import pytest
+from hamcrest import assert_that, close_to, contains_exactly, equal_to
+
+from teleinfo.aggregate import P2Quantile, WindowAggregator, aggregate
+from teleinfo.labels import decode_typed
+
+
+@pytest.mark.parametrize("quantile", [0.05, 0.5, 0.95])
+def test_p2_quantile_estimates_quantile(quantile):
+    generator = random.Random(1)
+    values = [generator.gauss(2000, 300) for _ in range(20000)]
+    estimate = P2Quantile(quantile)
+    for value in values:
+        estimate.add(value)
+
+    assert_that(estimate.value(), close_to(sorted(values)[int(quantile * len(values))], 15))
+
+
+def test_p2_quantile_is_exact_on_few_values():
+    estimate = P2Quantile(0.5)
+    for value in (30, 10, 20):
+        estimate.add(value)
+
+    assert_that(estimate.value(), equal_to(20))
+    with pytest.raises(ValueError):
+        P2Quantile(1)
+
+
+def test_aggregator_emits_one_summary_per_window():
+    aggregator = WindowAggregator(window=10, percentiles=[0.5])
+    frames = [(1000.0 + second, {"PAPP": f"{(second % 10) * 100:05}", "IINST": second % 10}) for second in range(25)]
+
+    summaries = [summary for timestamp, frame in frames if (summary := aggregator.add(frame, timestamp))]
+    summaries.append(aggregator.flush())
+
+    assert_that(
+        [(summary.start, summary.frames) for summary in summaries], equal_to([(1000, 10), (1010, 10), (1020, 5)])
+    )
+    papp = summaries[0].labels["PAPP"]
+    assert_that((papp.num_of_values, papp.min, papp.max, papp.mean), equal_to((10, 0, 900, 450)))
+    assert_that(summaries[0].to_dict()["IINST"]["p50"], close_to(4.5, 1))
+    assert_that(list(summaries[0].labels), contains_exactly("PAPP", "IINST"))
+    assert_that(aggregator.flush(), equal_to(None))
+
+
+def test_aggregate_skips_missing_and_invalid_values(valid_frame):
+    frames = [(0.0, decode_typed(valid_frame)), (1.0, {"PAPP": "XXXXX"}), (75.0, {"ADCO": "050022120078"})]
+
+    summaries = list(aggregate(frames, window=60))
+
+    assert_that([summary.frames for summary in summaries], equal_to([2, 1]))
+    assert_that(summaries[0].labels["PAPP"].num_of_values, equal_to(1))
+    assert_that(summaries[1].to_dict(), equal_to({"start": 60, "end": 120, "frames": 1}))
@@ -0,0 +1,75 @@
+# pylint: disable=missing-docstring
+import random
+
+import pytest
+from hamcrest import assert_that, equal_to
+
+from teleinfo.codec import decode
+from teleinfo.exceptions import TeleinfoDecodingError
+
+
+np = pytest.importorskip("numpy")
+
+from teleinfo.batch import decode_many  # noqa: E402
+
+
+def _decode_or_none(frame):
+    try:
+        return decode(frame)
+    except (TeleinfoDecodingError, UnicodeDecodeError, IndexError):
+        return None
+
+
+def test_decode_many_captured_frames(captured_frames_bin, captured_frames):
+    # Given the buffer of captured frames
+    # When I decode it in batch
+    result = decode_many(captured_frames_bin)
+
+    # Then I should obtain the same frames as when decoding them one by one
+    assert_that(result.frames, equal_to([decode(frame) for frame in captured_frames]))
+    assert_that(result.errors.tolist(), equal_to([False] * len(captured_frames)))
+    assert_that(
+        [captured_frames_bin[start:end] for start, end in result.spans.tolist()],
+        equal_to(captured_frames),
+    )
+
+
+def test_decode_many_reports_errors_in_mask(captured_frames):
+    # Given a buffer starting with junk, with a corrupted checksum in the 2nd frame,
+    # and a truncated last frame
+    corrupted_frame = captured_frames[1].replace(b"ISOUSC 30 9", b"ISOUSC 30 8")
+    buffer = b"\r\n junk" + captured_frames[0] + corrupted_frame + captured_frames[2] + captured_frames[3][:50]
+
+    # When I decode it in batch
+    result = decode_many(buffer)
+
+    # Then only the corrupted and truncated frames should be flagged
+    assert_that(result.errors.tolist(), equal_to([False, True, False, True]))
+    assert_that(result.frames, equal_to([decode(captured_frames[0]), None, decode(captured_frames[2]), None]))
+
+
+def test_decode_many_matches_decode_on_corrupted_frames(captured_frames):
+    # Given many captured frames, some randomly corrupted
+    rng = random.Random(20190101)
+    frames = []
+    for _ in range(500):
+        frame = bytearray(rng.choice(captured_frames))
+        if rng.random() < 0.5:
+            position = rng.randrange(1, len(frame) - 1)
+            frame[position : position + 1] = rng.choice([b"\n", b"\r", b" ", b"\t", b"A", b"\xe9"])
+        frames.append(bytes(frame))
+
+    # When I decode them in batch, in small chunks
+    result = decode_many(b"".join(frames), chunk_size=2000)
+
+    # Then each frame should be decoded exactly as decode() does
+    expected = [_decode_or_none(frame) for frame in frames]
+    assert_that(result.frames, equal_to(expected))
+    assert_that(result.errors.tolist(), equal_to([frame is None for frame in expected]))
+
+
+def test_decode_many_empty_buffer():
+    result = decode_many(b"")
+
+    assert_that(result.frames, equal_to([]))
+    assert_that(len(result.errors), equal_to(0))
@@ -0,0 +1,86 @@
+"""Tests for teleinfo.changes."""
+
+import pytest
+from hamcrest import assert_that, equal_to
+
+from teleinfo.changes import ChangeDetector, ChangeEvent
+from teleinfo.codec import FrameEncoder, decode
+from teleinfo.exceptions import ChecksumError
+
+
+def _frame(papp, iinst="009", **info_groups):
+    return FrameEncoder().encode([("ADCO", "050022120078"), ("IINST", iinst), ("PAPP", papp), *info_groups.items()])
+
+
+def test_detector_reports_changes_beyond_deadbands():
+    detector = ChangeDetector(deadbands={"PAPP": 50}, heartbeat=None)
+
+    values = [("02160", "009"), ("02160", "009"), ("02190", "009"), ("02215", "010"), ("02150", "010")]
+
+    events = [detector.feed(_frame(papp, iinst), timestamp) for timestamp, (papp, iinst) in enumerate(values)]
+
+    assert_that(
+        events,
+        equal_to(
+            [
+                ChangeEvent(0, {"ADCO": "050022120078", "IINST": "009", "PAPP": "02160"}),
+                None,
+                None,
+                # Drift from the last reported value
+                ChangeEvent(3, {"IINST": "010", "PAPP": "02215"}),
+                ChangeEvent(4, {"PAPP": "02150"}),
+            ]
+        ),
+    )
+    assert_that(detector.state["PAPP"], equal_to("02150"))
+
+
+def test_detector_sends_heartbeats_and_removed_labels():
+    detector = ChangeDetector(heartbeat=60)
+
+    first = detector.feed(_frame("02160", ADPS="045"), 0.0)
+    removed = detector.feed(_frame("02160"), 30.0)
+    heartbeat = detector.feed(_frame("02160"), 60.0)
+
+    assert_that(first.heartbeat, equal_to(True))
+    assert_that(
+        removed.to_dict(), equal_to({"timestamp": 30.0, "heartbeat": False, "changes": {}, "removed": ["ADPS"]})
+    )
+    assert_that(heartbeat.changes, equal_to(decode(_frame("02160"))))
+    assert_that(heartbeat.heartbeat, equal_to(True))
+
+
+def test_detector_raises_on_invalid_frame_without_changing_state(valid_frame):
+    detector = ChangeDetector(heartbeat=None)
+    detector.feed(valid_frame, 0.0)
+
+    with pytest.raises(ChecksumError):
+        detector.feed(valid_frame.replace(b"PAPP 02160 *", b"PAPP 02170 *"), 1.0)
+    # Frames given as str are decoded by decode(), and compared the same
+    assert_that(detector.feed(valid_frame.decode("ascii"), 2.0), equal_to(None))
+    assert_that(detector.feed(valid_frame, 3.0), equal_to(None))
+    assert_that(detector.state, equal_to(decode(valid_frame)))
+
+
+def test_detector_keys_decoded_frames_on_raw_info_groups():
+    frame = _frame("02160", HHPHC="A")
+    detector = ChangeDetector(heartbeat=None)
+
+    detector.feed(frame.decode("ascii"), 0.0)
+    decoded_info_groups = dict(detector._info_groups)  # pylint: disable=protected-access
+    detector.reset()
+    detector.feed(frame, 0.0)
+
+    assert_that(decoded_info_groups, equal_to(detector._info_groups))  # pylint: disable=protected-access
+
+
+def test_detector_raises_on_non_ascii_bytes_between_info_groups():
+    frame = _frame("02160")
+    detector = ChangeDetector(heartbeat=None)
+    detector.feed(frame, 0.0)
+
+    with pytest.raises(UnicodeDecodeError):
+        detector.feed(_frame("02170").replace(b"\r\n", b"\r\xe9\n", 1), 1.0)
+    assert_that(detector.state, equal_to(decode(frame)))
+    # Bytes decode() accepts between info groups are ignored, as decode() does
+    assert_that(detector.feed(_frame("02260").replace(b"\r\n", b"\r \n", 1), 2.0).changes, equal_to({"PAPP": "02260"}))
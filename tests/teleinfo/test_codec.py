@@ -1,9 +1,18 @@
 # pylint: disable=missing-docstring
 
+import random
+
 import pytest
-from hamcrest import assert_that, calling, equal_to, not_, raises
+from hamcrest import assert_that, calling, equal_to, is_, not_, raises
 
 from teleinfo.codec import (
+    DecodeError,
+    DecodeErrorCode,
+    FrameEncoder,
+    InfoGroupCache,
+    _BoundedInfoGroupCache,
+    _decode_reference,
+    _decode_single_pass,
     _extract_info_groups,
     _extract_info_groups_positions,
     _extract_label_and_data,
@@ -14,6 +23,7 @@ from teleinfo.codec import (
     decode,
     decode_from_list,
     decode_info_group,
+    decode_lenient,
     encode,
     encode_info_group,
 )
@@ -553,3 +563,257 @@ def test_verify_info_group_well_formed_raises_exception_on_too_few_separators():
         ),
         "Info Group Format should have been verified as correct",
     )
+
+
+def _decode_outcome(decode_function, frame):
+    try:
+        return decode_function(frame)
+    except (BaseFormatError, ChecksumError, UnicodeDecodeError, IndexError) as exception:
+        return type(exception), str(exception)
+
+
+def test_decode_single_pass_matches_reference_on_captured_frames(captured_frames):
+    # Given the frames captured from a real meter
+    # When I decode them with both the single pass and the reference implementations
+    # Then the results should be identical
+    for frame in captured_frames:
+        result = _decode_single_pass(frame)
+        assert_that(result, not_(equal_to(None)), "Captured frame not decoded by single pass")
+        assert_that(result, equal_to(_decode_reference(frame)))
+
+
+def test_decode_accepts_bytearray_and_memoryview(valid_frame, valid_frame_json):
+    # Given the following frame as bytearray and memoryview
+    # When I decode them
+    # Then I should obtain the same result as for bytes
+    assert_that(decode(bytearray(valid_frame)), equal_to(valid_frame_json))
+    assert_that(decode(memoryview(valid_frame)), equal_to(valid_frame_json))
+
+
+def _corrupt_frames(frames, count):
+    """Return ``count`` frames randomly corrupted with protocol and regular characters."""
+    rng = random.Random(20190101)
+    alphabet = [STX_TOKEN, ETX_TOKEN, LF_TOKEN, CR_TOKEN, SP_TOKEN, HT_TOKEN, "A", "0", "\xe9"]
+    corrupted_frames = []
+    for _ in range(count):
+        frame = bytearray(rng.choice(frames))
+        for _ in range(rng.randint(1, 3)):
+            position = rng.randrange(len(frame))
+            character = rng.choice(alphabet).encode("latin-1")
+            if rng.random() < 0.5:
+                frame[position : position + 1] = character
+            else:
+                frame[position:position] = character
+        corrupted_frames.append(bytes(frame))
+    return corrupted_frames
+
+
+def test_decode_matches_reference_on_corrupted_frames(captured_frames):
+    # Given captured frames randomly corrupted with protocol and regular characters
+    corrupted_frames = _corrupt_frames(captured_frames, 2000)
+
+    # When I decode them
+    # Then the outcome (result or raised error) should be the same as the reference implementation
+    for frame in corrupted_frames:
+        assert_that(_decode_outcome(decode, frame), equal_to(_decode_outcome(_decode_reference, frame)))
+        assert_that(
+            _decode_outcome(decode, frame.decode("latin-1")),
+            equal_to(_decode_outcome(_decode_reference, frame.decode("latin-1"))),
+        )
+
+
+def test_decode_with_cache_skips_info_groups_already_seen(captured_frames):
+    # Given a cache
+    cache = InfoGroupCache()
+
+    # When I decode the captured frames twice with it
+    results = [decode(frame, cache=cache) for frame in captured_frames * 2]
+
+    # Then the result should be the same as without cache
+    assert_that(results, equal_to([decode(frame) for frame in captured_frames * 2]))
+    # And only the distinct info groups should have been decoded
+    distinct_info_groups = {info_group for frame in captured_frames for info_group in frame[2:-2].split(b"\r\n")}
+    assert_that(cache.misses, equal_to(len(distinct_info_groups)))
+    assert_that(cache.hits + cache.misses, equal_to(sum(len(result) for result in results)))
+
+
+def test_info_group_cache_evicts_least_recently_used_info_groups(valid_frame, valid_frame_json):
+    # Given a cache smaller than the number of info groups of a frame
+    cache = InfoGroupCache(maxsize=4)
+
+    # When I decode a frame (from a bytearray) twice with it
+    # Then the cache should never exceed its size, and the groups should be decoded again
+    for _ in range(2):
+        assert_that(decode(bytearray(valid_frame), cache=cache), equal_to(valid_frame_json))
+        assert_that(len(cache), equal_to(4))
+    assert_that((cache.hits, cache.misses), equal_to((0, 2 * len(valid_frame_json))))
+
+    cache.clear()
+    assert_that((len(cache), cache.hits, cache.misses), equal_to((0, 0, 0)))
+
+
+def test_bounded_info_group_cache_is_abstract():
+    assert_that(calling(_BoundedInfoGroupCache), raises(TypeError))
+
+
+def test_decode_with_cache_raises_same_errors_for_corrupted_frames(captured_frames):
+    # Given a cache filled with the info groups of the captured frames
+    cache = InfoGroupCache()
+    for frame in captured_frames:
+        decode(frame, cache=cache)
+
+    # When I decode corrupted frames with it
+    # Then the outcome should be the same as without cache
+    for frame in captured_frames:
+        corrupted_frame = frame.replace(b"ADCO ", b"ADCO  ")
+        assert_that(
+            _decode_outcome(lambda frame_: decode(frame_, cache=cache), corrupted_frame),
+            equal_to(_decode_outcome(decode, corrupted_frame)),
+        )
+
+
+def test_frame_encoder_encodes_like_encode(valid_frame, valid_frame_json, captured_frames):
+    # Given a frame encoder
+    encoder = FrameEncoder()
+
+    # When I encode frames with it
+    # Then the result should be the same as encode()
+    assert_that(encoder.encode(valid_frame_json), equal_to(valid_frame))
+    assert_that(encoder.encode(list(valid_frame_json.items())), equal_to(valid_frame))
+    for frame in captured_frames:
+        assert_that(decode(encoder.encode(decode(frame))), equal_to(decode(frame)))
+
+
+def test_frame_encoder_supports_ht_separator_and_checksum_methods():
+    # Given frame encoders with HT separator and both checksum methods
+    info_groups = {"ADSC": "041876097138", "IRMS1": "005"}
+    for checksum_method, expected_checksums in ((1, b":*"), (2, b"C3")):
+        encoder = FrameEncoder(HT_TOKEN, checksum_method)
+
+        # When I encode a frame
+        frame = encoder.encode(info_groups)
+
+        # Then the info groups should be separated by HT, and have the expected checksums
+        assert_that(
+            frame, equal_to(b"\x02\nADSC\t041876097138\t%c\r\nIRMS1\t005\t%c\r\x03" % tuple(expected_checksums))
+        )
+        assert_that(decode(frame), equal_to(info_groups))
+
+
+def test_frame_encoder_writes_frames_into_buffers(valid_frame, valid_frame_json):
+    # Given a frame encoder with a small cache, and preallocated buffers
+    encoder = FrameEncoder(cache_size=4)
+    buffer = bytearray(len(valid_frame) + 1)
+
+    # When I write frames into the buffers
+    # Then the buffers should hold the frames
+    assert_that(encoder.encode_into(valid_frame_json, buffer, 1), equal_to(len(buffer)))
+    assert_that(bytes(buffer[1:]), equal_to(valid_frame))
+    assert_that(bytes(encoder.encode_many([valid_frame_json] * 3, buffer)), equal_to(valid_frame * 3))
+    assert_that(len(buffer), equal_to(3 * len(valid_frame)))
+    assert_that(
+        calling(encoder.encode_many).with_args([valid_frame_json] * 4, memoryview(buffer)),
+        raises(ValueError, "Buffer too small"),
+    )
+    assert_that(calling(FrameEncoder).with_args(sep="-"), raises(ValueError))
+
+
+def test_frame_encoder_reuses_buffer_of_live_views(valid_frame, valid_frame_json):
+    # Given a view on the frames written into a buffer, kept alive
+    encoder = FrameEncoder()
+    buffer = bytearray()
+    previous_frames = encoder.encode_many([valid_frame_json] * 2, buffer)
+
+    # When I write as many frames into the buffer
+    short_frame = encoder.encode({"ADCO": "050022120078"})
+    frames = encoder.encode_many([valid_frame_json, {"ADCO": "050022120078"}], buffer)
+
+    # Then they should overwrite the previous frames in place
+    assert_that(frames.obj, is_(buffer))
+    assert_that(bytes(frames), equal_to(valid_frame + short_frame))
+    assert_that(bytes(previous_frames[: len(frames)]), equal_to(valid_frame + short_frame))
+    # And the buffer should only be enlarged once the views are released
+    assert_that(
+        calling(encoder.encode_many).with_args([valid_frame_json] * 3, buffer),
+        raises(BufferError, "views on it are alive"),
+    )
+    previous_frames.release()
+    frames.release()
+    assert_that(bytes(encoder.encode_many([valid_frame_json] * 3, buffer)), equal_to(valid_frame * 3))
+
+
+def test_decode_lenient_matches_decode_on_valid_frames(captured_frames, valid_frame, valid_frame_json):
+    result = decode_lenient(valid_frame.decode())
+
+    assert_that(result.valid, equal_to(True))
+    assert_that(result.info_groups, equal_to(valid_frame_json))
+    cache = InfoGroupCache()
+    for frame in captured_frames:
+        assert_that(decode_lenient(frame, cache=cache).info_groups, equal_to(decode(frame)))
+
+
+def test_decode_lenient_salvages_valid_info_groups(valid_frame, valid_frame_json):
+    # Given a frame without STX, with a corrupted checksum, a non ASCII and an unterminated info group
+    frame = (
+        valid_frame[1:]
+        .replace(b"HCHC 094939439 8", b"HCHC 094939439 9")
+        .replace(b"PAPP", b"PA\xe9P")
+        .replace(b"IMAX 049 L\r", b"IMAX 049 L")
+    )
+
+    # When I decode it leniently
+    result = decode_lenient(frame)
+
+    # Then the other info groups should be decoded, and the errors located
+    expected = {label: data for label, data in valid_frame_json.items() if label not in ("HCHC", "PAPP", "IMAX")}
+    assert_that(result.info_groups, equal_to(expected))
+    assert_that(
+        result.error_codes,
+        equal_to(
+            [
+                DecodeErrorCode.MISSING_STX,
+                DecodeErrorCode.CHECKSUM,
+                DecodeErrorCode.UNTERMINATED_INFO_GROUP,
+                DecodeErrorCode.NON_ASCII,
+            ]
+        ),
+    )
+    checksum_error = result.errors[1]
+    assert_that(frame[checksum_error.start : checksum_error.end], equal_to(b"\nHCHC 094939439 9\r"))
+    assert_that(
+        result.error_messages[1],
+        equal_to("Info group checksum should match method 1 or method 2: b'\\nHCHC 094939439 9\\r' at 50"),
+    )
+
+
+def test_decode_lenient_reports_frame_errors():
+    assert_that(
+        decode_lenient(b"\x02\nADCO 050022120078 2\r\r").errors,
+        equal_to([DecodeError(DecodeErrorCode.STRAY_CR, 22, 23), DecodeError(DecodeErrorCode.MISSING_ETX, 22, 23)]),
+    )
+    assert_that(decode_lenient(b"\x02\nADCO\r\x03").error_codes, equal_to([DecodeErrorCode.INFO_GROUP_FORMAT]))
+    assert_that(
+        decode_lenient(b"\x02\nADCO 050022120078 2\r\xe9\nPAPP 02160 *\r\x03").errors,
+        equal_to([DecodeError(DecodeErrorCode.STRAY_NON_ASCII, 22, 23)]),
+    )
+    # The byte before the checksum should be a separator
+    assert_that(
+        decode_lenient(b"\x02\nADCO 0500 22120078X2\r\x03").error_codes, equal_to([DecodeErrorCode.INFO_GROUP_FORMAT])
+    )
+    assert_that(decode_lenient(b"").error_codes, equal_to([DecodeErrorCode.MISSING_STX, DecodeErrorCode.MISSING_ETX]))
+
+
+def test_decode_lenient_is_valid_when_decode_succeeds(captured_frames):
+    # Given captured frames randomly corrupted
+    for frame in _corrupt_frames(captured_frames, 2000):
+        # When I decode them with both decode and decode_lenient
+        result = decode_lenient(frame)
+        outcome = _decode_outcome(decode, frame)
+
+        # Then the result should be valid, and identical, when decode succeeds
+        if isinstance(outcome, dict):
+            assert_that(result.valid, equal_to(True))
+            assert_that(result.info_groups, equal_to(outcome))
+        # And invalid when decode raises
+        else:
+            assert_that(result.valid, equal_to(False))
@@ -0,0 +1,133 @@
+"""Tests for teleinfo.discovery."""
+
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+import pytest_asyncio
+from hamcrest import assert_that, contains_string, equal_to, has_length, less_than
+
+from teleinfo.discovery import PortProbe, discover_ports, probe_port
+from teleinfo.settings import TeleinfoSettings
+
+
+FRAME_1 = b"\x02\nADCO 050022120078 2\r\x03"
+SETTINGS = TeleinfoSettings(max_frames=2, timeout=0.5)
+
+
+@pytest_asyncio.fixture
+async def serial_ports(mocker):
+    """Patch the opening of serial ports: ports map to a StreamReader, or an exception to raise."""
+    ports = {}
+
+    async def open_serial_reader(port, settings):
+        connection = ports[port]
+        if isinstance(connection, BaseException):
+            raise connection
+        return connection, MagicMock()
+
+    mocker.patch("teleinfo.stream._open_serial_reader", new=open_serial_reader)
+    return ports
+
+
+@pytest.mark.asyncio
+async def test_probe_port_decodes_max_frames(serial_ports):
+    serial_ports["/dev/ttyUSB0"] = reader = asyncio.StreamReader()
+    reader.feed_data(FRAME_1 * 3)
+
+    probe = await probe_port("/dev/ttyUSB0", SETTINGS)
+
+    assert_that(probe.success, equal_to(True))
+    assert_that(probe.frames, equal_to([{"ADCO": "050022120078"}] * 2))
+
+
+@pytest.mark.asyncio
+async def test_probe_port_reports_errors(serial_ports):
+    serial_ports["/dev/ttyS0"] = OSError("Permission denied")
+    serial_ports["/dev/ttyS1"] = asyncio.StreamReader()
+
+    probes = [await probe_port(port, SETTINGS) for port in ("/dev/ttyS0", "/dev/ttyS1")]
+
+    assert_that([probe.success for probe in probes], equal_to([False, False]))
+    assert_that(probes[0].error, contains_string("Permission denied"))
+    assert_that(probes[1].error, contains_string("No frame received"))
+
+
+@pytest.mark.asyncio
+async def test_discover_ports_reports_noisy_ports(serial_ports):
+    serial_ports["/dev/ttyS0"] = noisy_reader = asyncio.StreamReader()
+    noisy_reader.feed_data(FRAME_1.replace(b"0078", b"0\xe98"))
+    serial_ports["/dev/ttyUSB0"] = reader = asyncio.StreamReader()
+    reader.feed_data(FRAME_1 * 2)
+
+    result = await discover_ports(["/dev/ttyS0", "/dev/ttyUSB0"], SETTINGS, find_all=True)
+
+    assert_that(result.teleinfo_ports, equal_to(["/dev/ttyUSB0"]))
+    probes = {probe.port: probe for probe in result.probes}
+    assert_that(probes["/dev/ttyS0"].success, equal_to(False))
+    assert_that(probes["/dev/ttyS0"].error, contains_string("UnicodeDecodeError"))
+
+
+@pytest.mark.asyncio
+async def test_discover_ports_stops_at_first_teleinfo_port(serial_ports):
+    serial_ports["/dev/ttyS0"] = asyncio.StreamReader()  # never receives anything
+    serial_ports["/dev/ttyUSB0"] = reader = asyncio.StreamReader()
+    reader.feed_data(FRAME_1 * 2)
+
+    result = await discover_ports(["/dev/ttyS0", "/dev/ttyUSB0"], SETTINGS)
+
+    assert_that(result.teleinfo_ports, equal_to(["/dev/ttyUSB0"]))
+    assert_that(result.probes, has_length(1))
+    assert_that(result.elapsed, less_than(SETTINGS.timeout))
+
+
+@pytest.mark.asyncio
+async def test_discover_ports_finds_all_teleinfo_ports(serial_ports):
+    ports = ["/dev/ttyS0", "/dev/ttyUSB0", "/dev/ttyUSB1"]
+    serial_ports["/dev/ttyS0"] = OSError("Permission denied")
+    for port in ports[1:]:
+        serial_ports[port] = reader = asyncio.StreamReader()
+        reader.feed_data(FRAME_1 * 2)
+
+    result = await discover_ports(ports, SETTINGS, find_all=True)
+
+    assert_that(sorted(result.teleinfo_ports), equal_to(ports[1:]))
+    assert_that(result.probes, has_length(3))
+    assert_that(result.model_dump()["teleinfo_ports"], equal_to(result.teleinfo_ports))
+
+
+@pytest.mark.asyncio
+async def test_discover_ports_limits_concurrency(mocker):
+    running = []
+    max_running = 0
+
+    async def probe(port, settings):
+        nonlocal max_running
+        running.append(port)
+        max_running = max(max_running, len(running))
+        await asyncio.sleep(0.01)
+        running.remove(port)
+        return PortProbe(port=port, success=False, error="Timeout", elapsed=0.01)
+
+    mocker.patch("teleinfo.discovery.probe_port", new=probe)
+
+    result = await discover_ports([f"/dev/ttyS{index}" for index in range(10)], SETTINGS, concurrency=3)
+
+    assert_that(result.probes, has_length(10))
+    assert_that(max_running, equal_to(3))
+
+
+@pytest.mark.asyncio
+async def test_discover_ports_rejects_invalid_concurrency():
+    with pytest.raises(ValueError):
+        await discover_ports([], SETTINGS, concurrency=0)
+
+
+@pytest.mark.asyncio
+async def test_probe_port_decodes_standard_frames(serial_ports):
+    serial_ports["/dev/ttyUSB0"] = reader = asyncio.StreamReader()
+    reader.feed_data(b"\x02\nDATE\tH240115184310\t\t?\r\nSINSTS\t00350\tN\r\x03" * 2)
+
+    probe = await probe_port("/dev/ttyUSB0", TeleinfoSettings(mode="standard", max_frames=2, timeout=0.5))
+
+    assert_that(probe.frames, equal_to([{"DATE": "", "SINSTS": "00350"}] * 2))
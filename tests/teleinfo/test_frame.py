@@ -0,0 +1,83 @@
+"""Tests for teleinfo.frame."""
+
+import pytest
+from hamcrest import assert_that, equal_to, has_length
+
+from teleinfo.codec import decode, encode_info_group
+from teleinfo.const import ETX_TOKEN, HT_TOKEN, STX_TOKEN
+from teleinfo.exceptions import ChecksumError, FrameFormatError
+from teleinfo.frame import TeleinfoFrame
+
+
+def test_frame_gives_access_to_each_label(valid_frame, valid_frame_json):
+    frame = TeleinfoFrame(valid_frame)
+
+    assert_that(frame["PAPP"], equal_to("02160"))
+    assert_that(frame["IINST"], equal_to("009"))
+    assert_that(frame.get("BASE"), equal_to(None))
+    assert_that("PAPP" in frame, equal_to(True))
+    assert_that(frame, has_length(len(valid_frame_json)))
+
+
+def test_frame_matches_decode_on_captured_frames(captured_frames):
+    for raw in captured_frames:
+        frame = TeleinfoFrame(raw)
+        expected = decode(raw)
+
+        assert_that({label: frame[label] for label in expected}, equal_to(expected))
+        assert_that(list(frame), equal_to(list(expected)))
+        assert_that(frame.to_dict(), equal_to(expected))
+
+
+def test_frame_does_not_confuse_labels_sharing_a_prefix():
+    frame = TeleinfoFrame(b"\x02\nHCHC 094939439 8\r\nHCHP 127970334 7\r\x03")
+
+    assert_that(frame.get("HC"), equal_to(None))
+    assert_that(frame["HCHC"], equal_to("094939439"))
+
+
+def test_frame_supports_ht_separator():
+    info_groups = encode_info_group("ADSC", "041876097138", HT_TOKEN) + encode_info_group("SINSTS", "00350", HT_TOKEN)
+    raw = f"{STX_TOKEN}{info_groups}{ETX_TOKEN}".encode()
+    frame = TeleinfoFrame(raw)
+
+    assert_that(dict(frame), equal_to(decode(raw)))
+
+
+def test_frame_verifies_info_groups_on_access():
+    frame = TeleinfoFrame(b"\x02\nADCO 050022120078 X\r\nPAPP 02160 *\r\x03")
+
+    assert_that(frame["PAPP"], equal_to("02160"))
+    with pytest.raises(ChecksumError):
+        frame["ADCO"]  # pylint: disable=pointless-statement
+    with pytest.raises(ChecksumError):
+        frame.to_dict()
+
+
+@pytest.mark.parametrize(
+    "raw",
+    [
+        b"\nADCO 050022120078 2\r\x03",
+        b"\x02\nADCO 050022120078 2\r",
+        b"\x02\nADCO 050022120078 2\x03",
+        b"\x02\rADCO 050022120078 2\n\x03",
+    ],
+)
+def test_frame_rejects_malformed_frames(raw):
+    with pytest.raises(FrameFormatError):
+        TeleinfoFrame(raw)
+
+
+@pytest.mark.parametrize(
+    "raw",
+    [
+        b"\x02 \nIINST 009  \r\nPAPP 02160 *\r\x03",
+        b"\x02\nIINST 009  \r \nPAPP 02160 *\r\x03",
+        b"\x02\nIINST 009  \r\nPAPP 02160 *\r \x03",
+    ],
+)
+def test_frame_accepts_frames_decode_accepts(raw):
+    frame = TeleinfoFrame(raw)
+
+    assert_that(frame.to_dict(), equal_to(decode(raw)))
+    assert_that({label: frame[label] for label in frame}, equal_to(decode(raw)))
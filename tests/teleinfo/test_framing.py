@@ -0,0 +1,66 @@
+"""Tests for teleinfo.framing."""
+
+from hamcrest import assert_that, equal_to, is_
+
+from teleinfo.framing import FrameParser
+
+
+FRAME_1 = b"\x02\nADCO 050022120078 2\r\x03"
+FRAME_2 = b"\x02\nADCO 021861348497 L\r\nISOUSC 30 9\r\x03"
+
+
+def _feed_in_chunks(parser: FrameParser, data: bytes, size: int) -> list[bytes]:
+    frames = []
+    for start in range(0, len(data), size):
+        frames.extend(parser.feed(data[start : start + size]))
+    return frames
+
+
+def test_feed_returns_frames_whatever_the_chunk_size():
+    stream = b"\r\nPAPP 02830 .\r\x03" + FRAME_1 + b"\x00\xff" + FRAME_2 + FRAME_1[:10]
+
+    for size in (1, 2, 3, 7, 64, len(stream)):
+        parser = FrameParser()
+
+        frames = _feed_in_chunks(parser, stream, size)
+
+        assert_that(frames, equal_to([FRAME_1, FRAME_2]), f"chunk size {size}")
+        assert_that(parser.in_frame, is_(True))
+        assert_that(parser.discarded_bytes, equal_to(18))
+
+
+def test_feed_restarts_frame_on_new_stx():
+    parser = FrameParser()
+
+    frames = parser.feed(FRAME_1[:10] + FRAME_2)
+
+    assert_that(frames, equal_to([FRAME_2]))
+    assert_that(parser.resyncs, equal_to(1))
+
+
+def test_feed_drops_frame_interrupted_by_eot():
+    parser = FrameParser()
+
+    frames = parser.feed(FRAME_1[:10] + b"\x04" + b"\r\x03" + FRAME_2)
+
+    assert_that(frames, equal_to([FRAME_2]))
+    assert_that(parser.resyncs, equal_to(1))
+
+
+def test_feed_drops_oversized_frames():
+    parser = FrameParser(max_frame_size=len(FRAME_1))
+
+    frames = _feed_in_chunks(parser, FRAME_2 + FRAME_1 + FRAME_2[:-1] + FRAME_1, 5)
+
+    assert_that(frames, equal_to([FRAME_1, FRAME_1]))
+    assert_that(parser.resyncs, equal_to(2))
+
+
+def test_reset_drops_frame_in_progress():
+    parser = FrameParser()
+    parser.feed(FRAME_1[:10])
+
+    parser.reset()
+
+    assert_that(parser.in_frame, is_(False))
+    assert_that(parser.feed(FRAME_1[10:] + FRAME_2), equal_to([FRAME_2]))
@@ -0,0 +1,63 @@
+"""Tests for teleinfo.labels."""
+
+import pytest
+from hamcrest import assert_that, equal_to, instance_of
+
+from teleinfo.codec import InfoGroupCache, decode, encode_info_group
+from teleinfo.const import ETX_TOKEN, STX_TOKEN
+from teleinfo.exceptions import LabelValueError
+from teleinfo.labels import LABELS, TariffOption, TariffPeriod, TomorrowColor, convert, decode_typed
+
+
+def _frame(*info_groups):
+    encoded_info_groups = "".join(encode_info_group(label, data) for label, data in info_groups)
+    return f"{STX_TOKEN}{encoded_info_groups}{ETX_TOKEN}".encode()
+
+
+def test_decode_typed_converts_recorded_frame(valid_frame):
+    decoded_frame = decode_typed(valid_frame)
+
+    assert_that(
+        decoded_frame,
+        equal_to(
+            {
+                "ADCO": "050022120078",
+                "OPTARIF": TariffOption.OFF_PEAK,
+                "ISOUSC": 45,
+                "HCHC": 94939439,
+                "HCHP": 127970334,
+                "PTEC": TariffPeriod.PEAK,
+                "IINST": 9,
+                "IMAX": 49,
+                "PAPP": 2160,
+                "HHPHC": "E",
+                "MOTDETAT": "400000",
+            }
+        ),
+    )
+
+
+def test_decode_typed_converts_tempo_labels(captured_frames):
+    for frame in captured_frames:
+        decoded_frame = decode_typed(frame, cache=InfoGroupCache())
+
+        assert_that(decoded_frame["OPTARIF"], equal_to(TariffOption.TEMPO))
+        assert_that(decoded_frame["DEMAIN"], instance_of(TomorrowColor))
+        assert_that(decoded_frame["BBRHCJB"], equal_to(int(decode(frame)["BBRHCJB"])))
+
+
+def test_decode_typed_keeps_unknown_labels_as_strings():
+    assert_that(decode_typed(_frame(("NEWLABEL", "0123"))), equal_to({"NEWLABEL": "0123"}))
+
+
+def test_decode_typed_raises_on_invalid_values():
+    with pytest.raises(LabelValueError, match="'PAPP'"):
+        decode_typed(_frame(("PAPP", "ABCDE")))
+    with pytest.raises(LabelValueError, match="'PTEC'"):
+        decode_typed(_frame(("PTEC", "XX..")))
+
+
+def test_convert_uses_registered_converter():
+    assert_that(convert("DEMAIN", "BLEU"), equal_to(TomorrowColor.BLUE))
+    assert_that(convert("ADCO", "050022120078"), equal_to("050022120078"))
+    assert_that(LABELS["BASE"].unit, equal_to("Wh"))
@@ -0,0 +1,136 @@
+"""Tests for teleinfo.metrics."""
+
+import urllib.request
+from unittest.mock import MagicMock, PropertyMock
+
+import pytest
+from hamcrest import assert_that, contains_string, equal_to, has_item
+
+from teleinfo import metrics
+from teleinfo.codec import FrameEncoder, decode
+from teleinfo.const import HT_TOKEN
+from teleinfo.exceptions import ChecksumError, FrameFormatError, LabelValueError
+from teleinfo.framing import FrameParser
+from teleinfo.labels import decode_typed
+from teleinfo.serial_reader import TeleinfoReader
+from teleinfo.standard import decode_standard
+
+
+PORT = "/dev/ttyUSB0"
+
+
+@pytest.fixture
+def teleinfo_metrics():
+    hook = metrics.TeleinfoMetrics()
+    metrics.add_hook(hook)
+    yield hook
+    metrics.remove_hook(hook)
+
+
+def test_registry_renders_prometheus_text_format():
+    registry = metrics.MetricsRegistry()
+    counter = registry.counter("frames_total", "Frames received.", ["port"])
+    histogram = registry.histogram("decode_seconds", "Decode time.", ["port"], buckets=[0.5, 1])
+    counter.inc('/dev/tty"0')
+    counter.inc('/dev/tty"0', amount=2)
+    histogram.observe(0.25, "a")
+    histogram.observe(1.5, "a")
+
+    assert_that(
+        registry.render(),
+        equal_to(
+            "# HELP frames_total Frames received.\n"
+            "# TYPE frames_total counter\n"
+            'frames_total{port="/dev/tty\\"0"} 3\n'
+            "# HELP decode_seconds Decode time.\n"
+            "# TYPE decode_seconds histogram\n"
+            'decode_seconds_bucket{port="a",le="0.5"} 1\n'
+            'decode_seconds_bucket{port="a",le="1"} 1\n'
+            'decode_seconds_bucket{port="a",le="+Inf"} 2\n'
+            'decode_seconds_sum{port="a"} 1.75\n'
+            'decode_seconds_count{port="a"} 2\n'
+        ),
+    )
+
+
+def test_observe_decode_without_hooks_only_decodes(valid_frame):
+    assert_that(metrics.has_hooks(), equal_to(False))
+    assert_that(metrics.observe_decode(PORT, decode, valid_frame), equal_to(decode(valid_frame)))
+
+
+def test_metrics_count_decode_times_and_errors(teleinfo_metrics, valid_frame):
+    assert_that(metrics.has_hooks(), equal_to(True))
+    standard_frame = FrameEncoder(HT_TOKEN).encode([("SINSTS", "00350")])
+    invalid_value_frame = FrameEncoder().encode([("ISOUSC", "4X")])
+
+    metrics.observe_decode(PORT, decode, valid_frame)
+    with pytest.raises(ChecksumError):
+        metrics.observe_decode(PORT, decode, valid_frame.replace(b"HC.. <", b"HC.. ="))
+    with pytest.raises(ChecksumError):
+        metrics.observe_decode(PORT, decode_standard, standard_frame.replace(b"\tN\r", b"\tO\r"))
+    with pytest.raises(FrameFormatError):
+        metrics.observe_decode(PORT, decode, valid_frame[1:])
+    with pytest.raises(LabelValueError):
+        metrics.observe_decode(PORT, decode_typed, invalid_value_frame)
+
+    assert_that(teleinfo_metrics.decode_seconds.count(PORT), equal_to(1))
+    assert_that(teleinfo_metrics.checksum_errors.value(PORT, "SP"), equal_to(1))
+    assert_that(teleinfo_metrics.checksum_errors.value(PORT, "HT"), equal_to(1))
+    assert_that(teleinfo_metrics.format_errors.value(PORT, "frame"), equal_to(1))
+    assert_that(teleinfo_metrics.format_errors.value(PORT, "label_value"), equal_to(1))
+
+
+def test_port_observer_reports_frames_and_resyncs(teleinfo_metrics, valid_frame, mocker):
+    mocker.patch("teleinfo.metrics.time.monotonic", side_effect=[10.0, 11.0, 12.0])
+    observer = metrics.PortObserver(PORT, FrameParser())
+
+    observer.feed(valid_frame[:10])
+    frames = observer.feed(valid_frame[10:] + valid_frame[:20] + valid_frame)
+    observer.feed(b"")
+
+    assert_that(frames, equal_to([valid_frame, valid_frame]))
+    assert_that(teleinfo_metrics.frames.value(PORT), equal_to(2))
+    assert_that(teleinfo_metrics.bytes.value(PORT), equal_to(2 * len(valid_frame)))
+    assert_that(teleinfo_metrics.resyncs.value(PORT), equal_to(1))
+    # STX to decoded latency of the last frame, which started in the second chunk
+    mocker.patch("teleinfo.metrics.time.monotonic", return_value=11.5)
+    metrics.observe_decode(PORT, decode, frames[-1])
+    assert_that(
+        teleinfo_metrics.latency_seconds.render(),
+        has_item(f'teleinfo_frame_latency_seconds_sum{{port="{PORT}"}} 0.5'),
+    )
+
+
+def test_reader_reports_frames_and_timeouts(teleinfo_metrics, valid_frame, mocker):
+    mock_ser = MagicMock()
+    mocker.patch("teleinfo.serial_reader.serial.Serial").return_value.__enter__.return_value = mock_ser
+    type(mock_ser).in_waiting = PropertyMock(return_value=0)
+    mock_ser.read.side_effect = [valid_frame, b""]
+
+    with TeleinfoReader(PORT) as reader:
+        reader.read_frame()
+        with pytest.raises(TimeoutError):
+            reader.read_frame()
+
+    assert_that(teleinfo_metrics.frames.value(PORT), equal_to(1))
+    assert_that(teleinfo_metrics.timeouts.value(PORT), equal_to(1))
+
+
+def test_metrics_are_exported_over_http_and_to_file(teleinfo_metrics, tmp_path):
+    teleinfo_metrics.frames.inc(PORT)
+    server = metrics.start_http_server(teleinfo_metrics.registry, 0)
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{server.server_address[1]}/metrics") as response:
+            body = response.read().decode()
+            content_type = response.headers["Content-Type"]
+    finally:
+        server.shutdown()
+        server.server_close()
+    writer = metrics.TextfileWriter(teleinfo_metrics.registry, tmp_path / "teleinfo.prom", interval=60)
+    writer.start()
+    writer.stop()
+
+    assert_that(body, contains_string(f'teleinfo_frames_total{{port="{PORT}"}} 1\n'))
+    assert_that(content_type, equal_to(metrics.CONTENT_TYPE))
+    assert_that((tmp_path / "teleinfo.prom").read_text(), equal_to(teleinfo_metrics.registry.render()))
+    assert_that(len(list(tmp_path.iterdir())), equal_to(1))
@@ -0,0 +1,81 @@
+"""Tests for teleinfo.parallel."""
+
+import io
+import json
+import math
+from unittest.mock import MagicMock
+
+import pytest
+from hamcrest import assert_that, equal_to
+
+from teleinfo.codec import FrameEncoder, decode
+from teleinfo.console.commands import DecodeFileCommand
+from teleinfo.parallel import DecodeFileStats, decode_file, decode_shards
+from teleinfo.recorder import Recording
+
+
+@pytest.fixture
+def capture_path(tmp_path):
+    frames = [FrameEncoder().encode([("ADCO", str(index).zfill(12)), ("PAPP", "00350")]) for index in range(40)]
+    # Corrupted frames, skipped and counted
+    frames[17] = frames[17].replace(b"00350", b"00351")
+    frames[23] = frames[23].replace(b"00350", b"0035\xe9")
+    path = tmp_path / "capture.bin"
+    path.write_bytes(b"".join(frames))
+    return path, frames
+
+
+def test_decode_file_writes_ndjson_in_order(capture_path):
+    path, frames = capture_path
+    output = io.BytesIO()
+    progress = MagicMock()
+
+    stats = decode_file(path, output, shard_size=500, workers=2, window=2, progress=progress)
+
+    expected = [decode(frame) for index, frame in enumerate(frames) if index not in (17, 23)]
+    assert_that([json.loads(line) for line in output.getvalue().splitlines()], equal_to(expected))
+    assert_that((stats.frames, stats.errors, stats.bytes), equal_to((38, 2, path.stat().st_size)))
+    assert_that(progress.call_args.args, equal_to((path.stat().st_size, path.stat().st_size, 38)))
+    assert_that(progress.call_count, equal_to(len(list(decode_shards(path, shard_size=500, workers=1)))))
+
+
+def test_decode_file_writes_columnar_recording(capture_path, tmp_path):
+    path, frames = capture_path
+
+    stats = decode_file(path, tmp_path / "recording", output_format="columnar", shard_size=1000, workers=2)
+
+    with Recording(tmp_path / "recording") as recording:
+        assert_that(recording.rows, equal_to(38))
+        assert_that(recording.values("ADCO")[18], equal_to(decode(frames[19])["ADCO"]))
+        assert_that(math.isnan(recording.column("timestamp")[0]), equal_to(True))
+    assert_that((stats.frames, stats.errors), equal_to((38, 2)))
+    with pytest.raises(TypeError):
+        decode_file(path, io.BytesIO(), output_format="columnar")
+
+
+def test_decode_file_writes_ndjson_to_path(capture_path, tmp_path):
+    path, frames = capture_path
+
+    stats = decode_file(path, tmp_path / "frames.ndjson", workers=1)
+
+    lines = (tmp_path / "frames.ndjson").read_text().splitlines()
+    assert_that((len(lines), stats.frames), equal_to((38, 38)))
+    assert_that(json.loads(lines[-1]), equal_to(decode(frames[-1])))
+
+
+def test_decode_shards_decodes_standard_frames(captured_frames_path):
+    shards = list(decode_shards(captured_frames_path, mode="standard", workers=1))
+
+    assert_that(shards[0].num_of_frames, equal_to(0))
+    assert_that(shards[0].num_of_errors, equal_to(10))
+    with pytest.raises(ValueError):
+        list(decode_shards(captured_frames_path, window=0))
+
+
+def test_decode_file_command_prints_stats_of_instant_decoding(capture_path, tmp_path, mocker, capsys):
+    path, _ = capture_path
+    mocker.patch("teleinfo.parallel.decode_file", return_value=DecodeFileStats(0, 0, 0, 0.0))
+
+    DecodeFileCommand(path=path, output=tmp_path / "frames.ndjson").cli_cmd()
+
+    assert_that(capsys.readouterr().err, equal_to("0 frames decoded, 0 invalid frames skipped, 0.0 MB/s\n"))
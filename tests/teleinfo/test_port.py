@@ -0,0 +1,140 @@
+"""Tests for teleinfo.console.port."""
+
+import asyncio
+import io
+import json
+import time
+
+import pytest
+from hamcrest import assert_that, close_to, equal_to, only_contains
+
+from teleinfo.aggregate import WindowAggregator
+from teleinfo.changes import ChangeDetector
+from teleinfo.codec import decode
+from teleinfo.console.commands import PortCommand
+from teleinfo.console.port import follow_port
+from teleinfo.settings import TeleinfoSettings
+
+
+simulator = pytest.importorskip("teleinfo.simulator")
+
+
+async def _follow(frames, raw_flag, num_of_frames, flush_interval=0.05, aggregator=None, detector=None):
+    """Output of the follow mode reading a meter replaying ``frames``, once it has ``num_of_frames`` frames."""
+    output = io.BytesIO()
+    with simulator.MeterSimulator([simulator.ReplayMeter(frames)], speedup=20) as meter_simulator:
+        tasks = [
+            asyncio.create_task(meter_simulator.run()),
+            asyncio.create_task(
+                follow_port(
+                    meter_simulator.ports[0],
+                    TeleinfoSettings(),
+                    raw_flag=raw_flag,
+                    flush_interval=flush_interval,
+                    output=output,
+                    aggregator=aggregator,
+                    detector=detector,
+                )
+            ),
+        ]
+        try:
+            async with asyncio.timeout(10):
+                while output.getvalue().count(b"\x03" if raw_flag else b"\n") < num_of_frames:
+                    # Raise the error of a follow_port() that failed
+                    if tasks[1].done():
+                        tasks[1].result()
+                    await asyncio.sleep(0.01)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+    return output.getvalue()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("flush_interval", [0, 0.05])
+async def test_follow_streams_timestamped_json_lines(valid_frame, flush_interval):
+    lines = (await _follow([valid_frame], False, 3, flush_interval)).splitlines()
+
+    for line in lines:
+        data = json.loads(line)
+        assert_that(data.pop("timestamp"), close_to(time.time(), 5))
+        assert_that(data, equal_to(decode(valid_frame)))
+
+
+@pytest.mark.asyncio
+async def test_follow_streams_window_summaries(valid_frame):
+    lines = (await _follow([valid_frame], False, 2, aggregator=WindowAggregator(0.2))).splitlines()
+
+    summary = json.loads(lines[0])
+    assert_that(summary["end"] - summary["start"], close_to(0.2, 1e-6))
+    assert_that(summary["PAPP"]["num_of_values"], equal_to(summary["frames"]))
+    assert_that(summary["PAPP"]["p50"], equal_to(int(decode(valid_frame)["PAPP"])))
+
+
+@pytest.mark.asyncio
+async def test_follow_streams_changes(valid_frame):
+    other_frame = valid_frame.replace(b"PAPP 02160 *", b"PAPP 02260 +")
+    detector = ChangeDetector(heartbeat=60)
+
+    lines = (await _follow([valid_frame, valid_frame, other_frame], False, 2, detector=detector)).splitlines()
+
+    assert_that(json.loads(lines[0])["changes"], equal_to(decode(valid_frame)))
+    assert_that(json.loads(lines[1])["changes"], equal_to({"PAPP": "02260"}))
+
+
+@pytest.mark.asyncio
+async def test_follow_streams_raw_frames(captured_frames):
+    output = await _follow(captured_frames[:3], True, 3)
+
+    assert_that(output[: len(b"".join(captured_frames[:3]))], equal_to(b"".join(captured_frames[:3])))
+
+
+@pytest.mark.asyncio
+async def test_follow_skips_invalid_frames(valid_frame, capsys):
+    invalid_frame = valid_frame.replace(b"HC.. <", b"HC.. =")
+
+    lines = (await _follow([invalid_frame, valid_frame], False, 2)).splitlines()
+
+    assert_that([json.loads(line)["OPTARIF"] for line in lines], equal_to(["HC..", "HC.."]))
+    assert_that("ChecksumError" in capsys.readouterr().err, equal_to(True))
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("detector", [None, ChangeDetector(heartbeat=0)])
+async def test_follow_skips_non_ascii_frames(valid_frame, capsys, detector):
+    noisy_frame = valid_frame.replace(b"PAPP", b"PA\xe9P")
+
+    lines = (await _follow([valid_frame, noisy_frame, valid_frame], False, 2, detector=detector)).splitlines()
+
+    # Lines of the valid frames, or of their changes
+    outputs = [json.loads(line) for line in lines]
+    assert_that([output.get("changes", output)["PAPP"] for output in outputs], only_contains("02160"))
+    assert_that("UnicodeDecodeError" in capsys.readouterr().err, equal_to(True))
+
+
+@pytest.mark.asyncio
+async def test_follow_stops_on_closed_output(valid_frame):
+    class ClosedOutput(io.BytesIO):
+        def flush(self):
+            raise BrokenPipeError()
+
+    with simulator.MeterSimulator([simulator.ReplayMeter([valid_frame])], speedup=20) as meter_simulator:
+        simulator_task = asyncio.create_task(meter_simulator.run())
+        success = await asyncio.wait_for(
+            follow_port(meter_simulator.ports[0], TeleinfoSettings(), flush_interval=0.01, output=ClosedOutput()),
+            timeout=5,
+        )
+        simulator_task.cancel()
+        await asyncio.gather(simulator_task, return_exceptions=True)
+
+    assert_that(success, equal_to(True))
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("follow", [False, True])
+async def test_port_command_exits_with_error_on_failure(tmp_path, follow):
+    with pytest.raises(SystemExit) as exit_info:
+        await PortCommand(port=str(tmp_path / "ttyMISSING"), follow=follow).cli_cmd()
+
+    assert_that(exit_info.value.code, equal_to(1))
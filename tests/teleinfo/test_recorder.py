@@ -0,0 +1,116 @@
+"""Tests for teleinfo.recorder."""
+
+import pytest
+from hamcrest import assert_that, contains_exactly, equal_to, has_length, less_than
+
+from teleinfo.codec import decode
+from teleinfo.exceptions import LabelValueError
+from teleinfo.labels import LABELS
+from teleinfo.recorder import MISSING_NUMBER, FrameRecorder, Recording, RecordingSegment
+
+
+def _typed(frame):
+    """Values of a decoded frame as read back: numbers as int, other labels as str."""
+    return {
+        label: int(data) if label in LABELS and LABELS[label].converter is int else data
+        for label, data in decode(frame).items()
+    }
+
+
+def test_recording_reads_back_appended_frames(tmp_path, captured_frames):
+    with FrameRecorder(tmp_path, chunk_rows=4) as recorder:
+        for index, frame in enumerate(captured_frames):
+            recorder.append(decode(frame), timestamp=1000.0 + index)
+
+    with Recording(tmp_path) as recording:
+        frames = list(recording.frames())
+        papp = recording.column("PAPP")
+
+        assert_that(recording.rows, equal_to(len(captured_frames)))
+        assert_that(
+            frames,
+            equal_to([{"timestamp": 1000.0 + index, **_typed(frame)} for index, frame in enumerate(captured_frames)]),
+        )
+        assert_that(papp.tolist(), equal_to([int(decode(frame)["PAPP"]) for frame in captured_frames]))
+        assert_that(recording.segments[0].chunks, has_length(3))
+
+
+def test_recording_keeps_missing_labels_missing(tmp_path):
+    with FrameRecorder(tmp_path, chunk_rows=2) as recorder:
+        recorder.append({"PTEC": "HP..", "PAPP": "02160"}, timestamp=1.0)
+        recorder.append({"PTEC": "HC.."}, timestamp=2.0)
+        recorder.append({"IINST": "009"}, timestamp=3.0)
+
+    with Recording(tmp_path) as recording:
+        assert_that(recording.values("PAPP"), equal_to([2160, None, None]))
+        assert_that(recording.values("PTEC"), equal_to(["HP..", "HC..", None]))
+        assert_that(recording.column("IINST").tolist(), equal_to([MISSING_NUMBER, MISSING_NUMBER, 9]))
+        assert_that(list(recording.frames())[2], equal_to({"timestamp": 3.0, "IINST": 9}))
+
+
+def test_recorder_rotates_segments(tmp_path, valid_frame):
+    with FrameRecorder(tmp_path, chunk_rows=2, segment_rows=3) as recorder:
+        for index in range(7):
+            recorder.append(decode(valid_frame), timestamp=float(index))
+
+    # A new recorder adds segments after the existing ones
+    with FrameRecorder(tmp_path) as recorder:
+        recorder.append(decode(valid_frame), timestamp=7.0)
+
+    with Recording(tmp_path) as recording:
+        assert_that([segment.rows for segment in recording.segments], contains_exactly(3, 3, 1, 1))
+        assert_that(recording.values("timestamp"), equal_to([float(index) for index in range(8)]))
+        assert_that(set(recording.values("OPTARIF")), equal_to({"HC.."}))
+
+
+def test_segment_being_written_is_readable(tmp_path, valid_frame):
+    recorder = FrameRecorder(tmp_path, chunk_rows=1000)
+    for _ in range(5):
+        recorder.append(decode(valid_frame))
+    recorder.flush()
+    # Half written chunk
+    with open(recorder.path, "ab") as file:
+        file.write(b"CHNK\x10\x00")
+
+    with RecordingSegment(recorder.path) as segment:
+        assert_that(segment.rows, equal_to(5))
+        assert_that(segment.labels[:2], equal_to(["timestamp", "ADCO"]))
+    recorder.close()
+
+
+def test_recorder_stores_frames_compactly(tmp_path, captured_frames):
+    with FrameRecorder(tmp_path) as recorder:
+        for frame in captured_frames * 100:
+            recorder.append(decode(frame))
+
+    # 8 bytes of timestamp, 4 per numeric label and 2 per string label (17 labels)
+    assert_that(recorder.path.stat().st_size / (len(captured_frames) * 100), less_than(70))
+
+
+def test_recorder_rejects_invalid_numbers(tmp_path):
+    with FrameRecorder(tmp_path) as recorder:
+        recorder.append({"PAPP": "02160"}, timestamp=1.0)
+        with pytest.raises(LabelValueError):
+            recorder.append({"ADCO": "050022120078", "PAPP": "0216X"}, timestamp=2.0)
+        recorder.append({"PAPP": "02170"}, timestamp=3.0)
+
+    with Recording(tmp_path) as recording:
+        assert_that(
+            list(recording.frames()), equal_to([{"timestamp": 1.0, "PAPP": 2160}, {"timestamp": 3.0, "PAPP": 2170}])
+        )
+
+
+def test_recorder_stores_standard_numeric_labels_as_numbers(tmp_path):
+    with FrameRecorder(tmp_path, chunk_rows=2, mode="standard") as recorder:
+        recorder.append({"ADSC": "041876097138", "EAST": "012345678", "SINSTS": "00899"}, timestamp=1.0)
+        recorder.append({"ADSC": "041876097138", "IRMS1": "004"}, timestamp=2.0)
+        recorder.append({"ADSC": "041876097138", "SINSTS": "01024"}, timestamp=3.0)
+
+    with Recording(tmp_path) as recording:
+        assert_that(recording.segments[0].typecodes["SINSTS"], equal_to("i"))
+        assert_that(recording.column("SINSTS").tolist(), equal_to([899, MISSING_NUMBER, 1024]))
+        assert_that(recording.values("IRMS1"), equal_to([None, 4, None]))
+        assert_that(
+            list(recording.frames())[0],
+            equal_to({"timestamp": 1.0, "ADSC": "041876097138", "EAST": 12345678, "SINSTS": 899}),
+        )
@@ -0,0 +1,55 @@
+"""Tests for teleinfo.records."""
+
+import pickle
+from datetime import datetime
+
+import pytest
+from hamcrest import assert_that, equal_to, instance_of, same_instance
+
+from teleinfo.codec import FrameEncoder, InfoGroupCache
+from teleinfo.exceptions import LabelValueError
+from teleinfo.labels import TariffOption, TariffPeriod, decode_typed
+from teleinfo.records import RECORD_TYPES, FrameRecord, OffPeakRecord, decode_record
+
+
+simulator = pytest.importorskip("teleinfo.simulator")
+
+
+def test_decode_record_fills_record_of_tariff_option(valid_frame):
+    record = decode_record(valid_frame)
+
+    assert_that(record, instance_of(OffPeakRecord))
+    assert_that((record.PAPP, record.HCHC, record.PTEC), equal_to((2160, 94939439, TariffPeriod.PEAK)))
+    assert_that(record["MOTDETAT"], equal_to("400000"))
+    assert_that(record.ADPS, equal_to(None))
+    assert_that(record.extra, equal_to(None))
+    assert_that(record.to_dict(), equal_to(decode_typed(valid_frame)))
+    assert_that(pickle.loads(pickle.dumps(record)), equal_to(record))
+    with pytest.raises(KeyError):
+        record["ADPS"]
+    assert_that(hasattr(record, "BASE"), equal_to(False))
+
+
+@pytest.mark.parametrize("option", list(TariffOption))
+def test_decode_record_matches_decode_typed(option):
+    meter = simulator.SimulatedMeter(option, seed=1, start=datetime(2024, 1, 1))
+    frame = meter.next_frame()
+
+    record = decode_record(frame, cache=InfoGroupCache())
+
+    assert_that(type(record), same_instance(RECORD_TYPES[option]))
+    assert_that(record.to_dict(), equal_to(decode_typed(frame)))
+
+
+def test_decode_record_shares_strings_and_keeps_extra_labels():
+    encoder = FrameEncoder()
+    frames = [encoder.encode([("ADCO", "050022120078"), ("IINST1", "002"), ("PAPP", papp)]) for papp in ("1", "2")]
+
+    first, second = decode_record(frames[0]), decode_record(frames[1])
+
+    assert_that(type(first), same_instance(FrameRecord))
+    assert_that(first.ADCO, same_instance(second.ADCO))
+    assert_that(first.extra, equal_to({"IINST1": 2}))
+    assert_that(second["IINST1"], equal_to(2))
+    with pytest.raises(LabelValueError):
+        decode_record(FrameEncoder().encode([("OPTARIF", "HC.."), ("PAPP", "0036X")]))
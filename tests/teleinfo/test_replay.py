@@ -0,0 +1,79 @@
+"""Tests for teleinfo.replay."""
+
+import pytest
+from hamcrest import assert_that, contains_exactly, equal_to, has_length
+
+from teleinfo.codec import decode
+from teleinfo.frame import TeleinfoFrame
+from teleinfo.replay import CaptureReader
+
+
+def test_reader_iterates_on_captured_frames(captured_frames_path, captured_frames):
+    with CaptureReader(captured_frames_path) as capture:
+        frames = [bytes(frame) for frame in capture]
+
+        assert_that(frames, equal_to(captured_frames))
+        assert_that(len(capture), equal_to(len(captured_frames)))
+
+
+def test_reader_frames_decode_without_copy(captured_frames_path, captured_frames):
+    with CaptureReader(captured_frames_path) as capture:
+        frame = capture[1]
+
+        assert_that(frame, has_length(len(captured_frames[1])))
+        assert_that(decode(frame), equal_to(decode(captured_frames[1])))
+        assert_that(dict(TeleinfoFrame(frame)), equal_to(decode(captured_frames[1])))
+        frame.release()
+
+
+def test_reader_closes_while_frames_are_alive(captured_frames_path, captured_frames):
+    # The documented usage: the last frame of the loop is still alive when the reader closes
+    with CaptureReader(captured_frames_path) as capture:
+        for frame in capture.frames():
+            decode(frame)
+
+    assert_that(bytes(frame), equal_to(captured_frames[-1]))
+
+
+def test_reader_seeks_to_frame(tmp_path, valid_frame):
+    frames = [valid_frame.replace(b"050022120078", str(index).zfill(12).encode()) for index in range(50)]
+    path = tmp_path / "capture.bin"
+    path.write_bytes(b"".join(frames))
+
+    with CaptureReader(path, index_interval=8) as capture:
+        assert_that(bytes(capture[37]), equal_to(frames[37]))
+        assert_that(bytes(capture[-1]), equal_to(frames[-1]))
+        assert_that(bytes(capture[9]), equal_to(frames[9]))
+        capture.seek(45)
+        assert_that([bytes(frame) for frame in capture], equal_to(frames[45:]))
+        assert_that([bytes(frame) for frame in capture.frames(3, 6)], equal_to(frames[3:6]))
+        with pytest.raises(IndexError):
+            capture[50]
+
+
+def test_reader_skips_interrupted_frames(tmp_path, valid_frame):
+    path = tmp_path / "capture.bin"
+    path.write_bytes(
+        b"noise" + valid_frame[:30] + b"\x04" + valid_frame + valid_frame[:20] + valid_frame + b"\x02\nADCO"
+    )
+
+    with CaptureReader(path) as capture:
+        assert_that([bytes(frame) for frame in capture], contains_exactly(valid_frame, valid_frame))
+
+
+def test_reader_chunks_do_not_split_frames(captured_frames_path, captured_frames_bin):
+    with CaptureReader(captured_frames_path) as capture:
+        chunks = [bytes(chunk) for chunk in capture.chunks(chunk_size=1000)]
+
+        assert_that(b"".join(chunks), equal_to(captured_frames_bin))
+        assert_that(all(chunk.endswith(b"\x03") for chunk in chunks), equal_to(True))
+
+
+def test_reader_accepts_empty_file(tmp_path):
+    path = tmp_path / "capture.bin"
+    path.touch()
+
+    with CaptureReader(path) as capture:
+        assert_that(list(capture), equal_to([]))
+        assert_that(list(capture.chunks()), equal_to([]))
+        assert_that(len(capture), equal_to(0))
@@ -1,12 +1,16 @@
 """Tests for teleinfo.serial_reader."""
 
-from unittest.mock import MagicMock
+import asyncio
+import queue
+import time
+from unittest.mock import MagicMock, PropertyMock
 
 import pytest
 import serial
 from hamcrest import assert_that, equal_to
 
-from teleinfo.serial_reader import read_frame
+from teleinfo.codec import FrameEncoder, decode
+from teleinfo.serial_reader import BackgroundReader, TeleinfoReader, read_frame
 from teleinfo.settings import TeleinfoSettings
 
 
@@ -136,6 +140,20 @@ def test_read_frame_propagates_serial_exception(mocker):
         read_frame("/dev/ttyUSB0")
 
 
+# ── bulk reads ─────────────────────────────────────────────────────────────
+
+
+def test_read_frame_reads_all_waiting_bytes_at_once(mock_serial):
+    _, mock_ser = mock_serial
+    type(mock_ser).in_waiting = PropertyMock(side_effect=[0, 9, 14])
+    mock_ser.read.side_effect = [MINIMAL_FRAME[:1], MINIMAL_FRAME[1:10], MINIMAL_FRAME[10:]]
+
+    result = read_frame("/dev/ttyUSB0")
+
+    assert_that(result, equal_to(MINIMAL_FRAME))
+    assert_that([call.args for call in mock_ser.read.call_args_list], equal_to([(1,), (9,), (14,)]))
+
+
 # ── recorded frame round-trip ──────────────────────────────────────────────
 
 
@@ -155,3 +173,161 @@ def test_read_frame_with_recorded_frame(mock_serial):
     result = read_frame("/dev/ttyUSB0")
 
     assert_that(result, equal_to(RECORDED_FRAME))
+
+
+# ── TeleinfoReader ─────────────────────────────────────────────────────────
+
+
+def test_reader_keeps_port_open_between_reads(mock_serial):
+    mock_cls, mock_ser = mock_serial
+    type(mock_ser).in_waiting = PropertyMock(return_value=0)
+    mock_ser.read.side_effect = [MINIMAL_FRAME * 2 + MINIMAL_FRAME[:5], MINIMAL_FRAME[5:]]
+
+    with TeleinfoReader("/dev/ttyUSB0") as reader:
+        frames = [reader.read_frame() for _ in range(3)]
+
+    assert_that(frames, equal_to([MINIMAL_FRAME] * 3))
+    mock_cls.assert_called_once()
+    assert_that(mock_ser.read.call_count, equal_to(2))
+    mock_cls.return_value.__exit__.assert_called_once()
+
+
+def test_reader_latest_skips_older_frames(mock_serial):
+    _, mock_ser = mock_serial
+    older_frame = MINIMAL_FRAME.replace(b"ADCO", b"ADCX")
+    type(mock_ser).in_waiting = PropertyMock(side_effect=[len(older_frame) + len(MINIMAL_FRAME) + 1, 0, 0])
+    mock_ser.read.side_effect = [older_frame + MINIMAL_FRAME + b"\x02", MINIMAL_FRAME[1:]]
+
+    with TeleinfoReader("/dev/ttyUSB0") as reader:
+        latest_frames = [reader.latest(), reader.latest()]
+
+    assert_that(latest_frames, equal_to([MINIMAL_FRAME, MINIMAL_FRAME]))
+
+
+def test_reader_iterates_until_timeout(mock_serial):
+    _, mock_ser = mock_serial
+    type(mock_ser).in_waiting = PropertyMock(return_value=0)
+    mock_ser.read.side_effect = [MINIMAL_FRAME * 2, b""]
+
+    frames = []
+    with TeleinfoReader("/dev/ttyUSB0") as reader, pytest.raises(TimeoutError):
+        for frame in reader:
+            frames.append(frame)
+
+    assert_that(frames, equal_to([MINIMAL_FRAME] * 2))
+
+
+def test_reader_cancels_read_of_open_port(mock_serial):
+    _, mock_ser = mock_serial
+    reader = TeleinfoReader("/dev/ttyUSB0")
+
+    reader.cancel_read()
+    mock_ser.cancel_read.assert_not_called()
+    reader.open()
+    reader.cancel_read()
+    mock_ser.cancel_read.assert_called_once()
+
+
+def test_reader_reopens_port_after_close(mock_serial):
+    mock_cls, mock_ser = mock_serial
+    type(mock_ser).in_waiting = PropertyMock(return_value=0)
+    mock_ser.read.side_effect = [MINIMAL_FRAME + MINIMAL_FRAME[:3], MINIMAL_FRAME]
+
+    reader = TeleinfoReader("/dev/ttyUSB0")
+    reader.read_frame()
+    reader.close()
+    # The partial frame of the previous connection is dropped
+    assert_that(reader.read_frame(), equal_to(MINIMAL_FRAME))
+    reader.close()
+
+    assert_that(mock_cls.call_count, equal_to(2))
+    assert_that(reader.is_open, equal_to(False))
+
+
+@pytest.mark.asyncio
+async def test_reader_does_not_lose_frames_between_reads(captured_frames):
+    simulator = pytest.importorskip("teleinfo.simulator")
+
+    def read_frames(port):
+        with TeleinfoReader(port) as reader:
+            return [reader.read_frame() for _ in range(len(captured_frames) + 3)]
+
+    with simulator.MeterSimulator([simulator.ReplayMeter(captured_frames)], speedup=50) as meter_simulator:
+        task = asyncio.create_task(meter_simulator.run())
+        frames = await asyncio.to_thread(read_frames, meter_simulator.ports[0])
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    first = captured_frames.index(frames[0])
+    assert_that(frames, equal_to((captured_frames * 3)[first : first + len(frames)]))
+
+
+# ── BackgroundReader ───────────────────────────────────────────────────────
+
+
+@pytest.fixture
+def serial_chunks(mock_serial):
+    """Queue of the chunks read from the mocked port, which returns nothing when empty."""
+    _, mock_ser = mock_serial
+    chunks = queue.Queue()
+
+    def read(_):
+        try:
+            chunk = chunks.get(timeout=0.01)
+        except queue.Empty:
+            return b""
+        if isinstance(chunk, Exception):
+            raise chunk
+        return chunk
+
+    type(mock_ser).in_waiting = PropertyMock(return_value=0)
+    mock_ser.read.side_effect = read
+    return chunks
+
+
+def _wait_until(predicate, timeout=5.0):
+    # Poll, as frames put in serial_chunks may be read before wait_next() is called
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_background_reader_keeps_last_frames(serial_chunks):
+    frames = [FrameEncoder().encode([("ADCO", "050022120078"), ("PAPP", f"{papp:05}")]) for papp in range(5)]
+
+    with BackgroundReader("/dev/ttyUSB0", buffer_size=3) as reader:
+        assert_that(reader.latest(), equal_to(None))
+        serial_chunks.put(frames[0])
+        _wait_until(lambda: reader.latest() is not None)
+        first = reader.latest()
+        for frame in frames[1:]:
+            serial_chunks.put(frame)
+        _wait_until(lambda: reader.latest().raw == frames[-1])
+
+    assert_that(first.raw, equal_to(frames[0]))
+    assert_that(reader.latest().data, equal_to(decode(frames[-1])))
+    assert_that([frame.raw for frame in reader.frames()], equal_to(frames[2:]))
+    assert_that(reader.running, equal_to(False))
+
+
+def test_background_reader_skips_invalid_frames_and_raises_serial_errors(serial_chunks, valid_frame):
+    with BackgroundReader("/dev/ttyUSB0") as reader:
+        with pytest.raises(TimeoutError):
+            reader.wait_next(timeout=0.05)
+        serial_chunks.put(valid_frame.replace(b"HC.. <", b"HC.. ="))
+        serial_chunks.put(valid_frame.replace(b"HC.. <", b"HC\xe9. <"))
+        serial_chunks.put(valid_frame)
+        _wait_until(lambda: reader.latest() is not None)
+        assert_that(reader.latest().raw, equal_to(valid_frame))
+        assert_that(reader.running, equal_to(True))
+        serial_chunks.put(serial.SerialException("device disconnected"))
+        with pytest.raises(serial.SerialException):
+            reader.wait_next(timeout=5)
+        # The reader restarts after a serial error
+        _wait_until(lambda: not reader.running)
+        reader.start()
+        assert_that(reader.running, equal_to(True))
+
+    assert_that(reader.decode_errors, equal_to(2))
+    with pytest.raises(RuntimeError):
+        BackgroundReader("/dev/ttyUSB0").wait_next(timeout=5)
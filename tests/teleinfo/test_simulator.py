@@ -0,0 +1,84 @@
+"""Tests for teleinfo.simulator."""
+
+import asyncio
+from datetime import datetime
+
+import pytest
+from hamcrest import assert_that, equal_to, greater_than
+
+from teleinfo.codec import decode
+from teleinfo.labels import TariffOption, decode_typed
+from teleinfo.serial_reader import read_frame
+from teleinfo.stream import TeleinfoStream
+
+
+simulator = pytest.importorskip("teleinfo.simulator")
+
+
+@pytest.mark.parametrize("option", list(TariffOption))
+def test_simulated_meter_generates_valid_frames(option):
+    meter = simulator.SimulatedMeter(option, seed=1)
+
+    for _ in range(20):
+        decoded_frame = decode_typed(meter.next_frame())
+
+        assert_that(decoded_frame["OPTARIF"], equal_to(option))
+        assert_that(decoded_frame["ADCO"], equal_to(meter.adco))
+        assert_that(decoded_frame["IINST"], equal_to(round(decoded_frame["PAPP"] / 230)))
+
+
+def test_simulated_meter_switches_period_and_increments_index():
+    meter = simulator.SimulatedMeter(seed=1, start=datetime(2024, 1, 15, 21, 50))
+    first_frame = decode(meter.next_frame())
+    while meter.clock < datetime(2024, 1, 15, 22, 0, 10):
+        last_frame = decode(meter.next_frame())
+
+    assert_that(first_frame["PTEC"], equal_to("HP.."))
+    assert_that(last_frame["PTEC"], equal_to("HC.."))
+    assert_that(int(last_frame["HCHP"]), greater_than(int(first_frame["HCHP"])))
+
+
+def test_simulated_meter_is_reproducible():
+    start = datetime(2024, 1, 15, 12)
+    meters = [simulator.SimulatedMeter(TariffOption.TEMPO, seed=7, start=start) for _ in range(2)]
+
+    assert_that(meters[0].next_frame(), equal_to(meters[1].next_frame()))
+
+
+def test_replay_meter_replays_capture_verbatim(captured_frames, captured_frames_bin):
+    meter = simulator.ReplayMeter.from_capture(captured_frames_bin, offset=1)
+
+    replayed_frames = [meter.next_frame() for _ in captured_frames]
+
+    assert_that(replayed_frames, equal_to(captured_frames[1:] + captured_frames[:1]))
+
+
+@pytest.mark.asyncio
+async def test_simulator_streams_frames_to_default_settings_readers():
+    meters = [simulator.SimulatedMeter(option, seed=index) for index, option in enumerate(TariffOption)]
+
+    with simulator.MeterSimulator(meters, speedup=20) as meter_simulator:
+        task = asyncio.create_task(meter_simulator.run())
+        frames = []
+        for port in meter_simulator.ports:
+            async with TeleinfoStream(port) as stream:
+                frames.append(await stream.read_frame())
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    assert_that([decode(frame)["ADCO"] for frame in frames], equal_to([meter.adco for meter in meters]))
+
+
+@pytest.mark.asyncio
+async def test_simulator_supports_reopening_port(valid_frame):
+    meter = simulator.ReplayMeter([valid_frame])
+
+    with simulator.MeterSimulator([meter], speedup=20) as meter_simulator:
+        task = asyncio.create_task(meter_simulator.run())
+        for _ in range(3):
+            frame = await asyncio.to_thread(read_frame, meter_simulator.ports[0])
+            assert_that(frame, equal_to(valid_frame))
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    assert_that(meter_simulator.frames_dropped, equal_to(0))
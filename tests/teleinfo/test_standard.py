@@ -0,0 +1,106 @@
+"""Tests for teleinfo.standard."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from hamcrest import assert_that, equal_to
+
+from teleinfo.codec import FrameEncoder, InfoGroupCache, decode
+from teleinfo.const import HT_TOKEN
+from teleinfo.exceptions import ChecksumError, FrameFormatError, InfoGroupFormatError
+from teleinfo.settings import TeleinfoSettings
+from teleinfo.standard import StandardInfoGroup, StandardInfoGroupCache, decode_standard, parse_horodate
+
+
+def _frame(*info_groups):
+    """Encode a standard frame from (label, horodate, data) tuples."""
+    return FrameEncoder(HT_TOKEN).encode(
+        (label, data if horodate is None else f"{horodate}{HT_TOKEN}{data}") for label, horodate, data in info_groups
+    )
+
+
+STANDARD_FRAME = (
+    b"\x02"
+    b"\nADSC\t041876097138\tC\r"
+    b"\nDATE\tH240115184310\t\t?\r"
+    b"\nSMAXSN\tH240115184310\t05120\t3\r"
+    b"\nPJOURF+1\t00004001 06004002 22004001 NONUTILE\tL\r"
+    b"\nSINSTS\t00350\tN\r"
+    b"\x03"
+)
+
+
+def test_decode_standard_returns_label_horodate_and_data():
+    decoded_frame = decode_standard(STANDARD_FRAME)
+
+    assert_that(
+        decoded_frame,
+        equal_to(
+            {
+                "ADSC": StandardInfoGroup("ADSC", None, "041876097138"),
+                "DATE": StandardInfoGroup("DATE", "H240115184310", ""),
+                "SMAXSN": StandardInfoGroup("SMAXSN", "H240115184310", "05120"),
+                "PJOURF+1": StandardInfoGroup("PJOURF+1", None, "00004001 06004002 22004001 NONUTILE"),
+                "SINSTS": StandardInfoGroup("SINSTS", None, "00350"),
+            }
+        ),
+    )
+    assert_that(decode_standard(STANDARD_FRAME.decode()), equal_to(decoded_frame))
+
+
+def test_decode_standard_accepts_space_checksum():
+    # A SP checksum, that decode() takes for a separator mixed with HT
+    frame = _frame(("SINSTS", None, "00899"))
+
+    assert_that(frame, equal_to(b"\x02\nSINSTS\t00899\t \r\x03"))
+    assert_that(decode_standard(frame)["SINSTS"].data, equal_to("00899"))
+
+
+def test_decode_standard_with_cache():
+    cache = StandardInfoGroupCache()
+
+    first_frame = decode_standard(STANDARD_FRAME, cache=cache)
+    second_frame = decode_standard(bytearray(STANDARD_FRAME), cache=cache)
+
+    assert_that(second_frame, equal_to(first_frame))
+    assert_that((cache.hits, cache.misses), equal_to((5, 5)))
+
+
+def test_standard_and_historic_caches_cannot_be_mixed():
+    with pytest.raises(TypeError):
+        decode_standard(STANDARD_FRAME, cache=InfoGroupCache())
+    with pytest.raises(TypeError):
+        decode(STANDARD_FRAME, cache=StandardInfoGroupCache())
+
+
+@pytest.mark.parametrize(
+    "frame, error",
+    [
+        (STANDARD_FRAME[:-1], FrameFormatError),
+        (STANDARD_FRAME.replace(b"\nDATE", b"\rDATE"), FrameFormatError),
+        (STANDARD_FRAME.replace(b"DATE", b"DAT\xc9"), FrameFormatError),
+        (STANDARD_FRAME.replace(b"05120", b"05121"), ChecksumError),
+        (STANDARD_FRAME.replace(b"H240115184310\t05120", b"H2401151843\t05120"), InfoGroupFormatError),
+        (STANDARD_FRAME.replace(b"00350\tN", b"00350\t\tN"), InfoGroupFormatError),
+    ],
+)
+def test_decode_standard_raises_on_invalid_frames(frame, error):
+    with pytest.raises(error):
+        decode_standard(frame)
+
+
+def test_parse_horodate():
+    assert_that(
+        parse_horodate("E240615101010"),
+        equal_to(datetime(2024, 6, 15, 10, 10, 10, tzinfo=timezone(timedelta(hours=2)))),
+    )
+    assert_that(parse_horodate(" 240615101010").tzinfo, equal_to(None))
+    assert_that(StandardInfoGroup("DATE", "h240115184310", "").timestamp.utcoffset(), equal_to(timedelta(hours=1)))
+    with pytest.raises(ValueError):
+        parse_horodate("H2401151843")
+
+
+def test_settings_default_to_standard_baudrate():
+    assert_that(TeleinfoSettings(mode="standard").baudrate, equal_to(9600))
+    assert_that(TeleinfoSettings(mode="standard", baudrate=1200).baudrate, equal_to(1200))
+    assert_that(TeleinfoSettings().baudrate, equal_to(1200))
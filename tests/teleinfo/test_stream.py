@@ -0,0 +1,178 @@
+"""Tests for teleinfo.stream."""
+
+import asyncio
+import os
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+import pytest_asyncio
+import serial
+from hamcrest import assert_that, equal_to, instance_of, is_
+
+from teleinfo.settings import TeleinfoSettings
+from teleinfo.stream import TeleinfoMultiStream, TeleinfoStream
+
+
+FRAME_1 = b"\x02\nADCO 050022120078 2\r\x03"
+FRAME_2 = b"\x02\nADCO 021861348497 L\r\nISOUSC 30 9\r\x03"
+
+
+# ── fixtures ────────────────────────────────────────────────────────────────
+
+
+@pytest_asyncio.fixture
+async def serial_connection(mocker):
+    """Patch the opening of the serial port and return (open_mock, reader, transport)."""
+    reader = asyncio.StreamReader()
+    transport = MagicMock()
+    open_mock = mocker.patch(
+        "teleinfo.stream._open_serial_reader",
+        new=AsyncMock(return_value=(reader, transport)),
+    )
+    return open_mock, reader, transport
+
+
+@pytest.fixture
+def pseudo_terminal():
+    """Return (master_fd, slave_path) of a raw pseudo-terminal pair."""
+    pty = pytest.importorskip("pty")
+    tty = pytest.importorskip("tty")
+    master_fd, slave_fd = pty.openpty()
+    tty.setraw(slave_fd)
+    yield master_fd, os.ttyname(slave_fd)
+    os.close(slave_fd)
+    os.close(master_fd)
+
+
+# Pseudo-terminals do not support 7 bits/even parity
+PTY_SETTINGS = TeleinfoSettings(bytesize=serial.EIGHTBITS, parity=serial.PARITY_NONE, rtscts=0, timeout=2.0)
+
+
+# ── tests ───────────────────────────────────────────────────────────────────
+
+
+@pytest.mark.asyncio
+async def test_stream_yields_frames_from_a_single_connection(serial_connection):
+    open_mock, reader, transport = serial_connection
+    reader.feed_data(b"\r\x03" + FRAME_1 + FRAME_2[:20])
+    reader.feed_data(FRAME_2[20:] + FRAME_1)
+    reader.feed_eof()
+
+    async with TeleinfoStream("/dev/ttyUSB0") as stream:
+        frames = [frame async for frame in stream]
+
+    assert_that(frames, equal_to([FRAME_1, FRAME_2, FRAME_1]))
+    open_mock.assert_awaited_once()
+    transport.close.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_stream_opens_port_with_settings(mocker):
+    serial_mock = mocker.patch("teleinfo.stream.serial.Serial", side_effect=serial.SerialException("Port not found"))
+
+    with pytest.raises(OSError, match="Port not found"):
+        await TeleinfoStream("/dev/ttyUSB0", TeleinfoSettings(baudrate=9600)).read_frame()
+
+    _, kwargs = serial_mock.call_args
+    assert_that(kwargs["port"], equal_to("/dev/ttyUSB0"))
+    assert_that(kwargs["baudrate"], equal_to(9600))
+
+
+@pytest.mark.asyncio
+async def test_stream_reads_pseudo_terminal(pseudo_terminal):
+    master_fd, slave_path = pseudo_terminal
+
+    async with TeleinfoStream(slave_path, PTY_SETTINGS) as stream:
+        os.write(master_fd, FRAME_1[5:] + FRAME_2 + FRAME_1[:10])
+        first_frame = await stream.read_frame()
+        os.write(master_fd, FRAME_1[10:])
+        second_frame = await stream.read_frame()
+
+    assert_that((first_frame, second_frame), equal_to((FRAME_2, FRAME_1)))
+
+
+@pytest.mark.asyncio
+async def test_stream_raises_timeout_without_complete_frame(serial_connection):
+    _, reader, _ = serial_connection
+    reader.feed_data(FRAME_1[:10])
+
+    async with TeleinfoStream("/dev/ttyUSB0", TeleinfoSettings(timeout=0.01)) as stream:
+        with pytest.raises(TimeoutError):
+            await stream.read_frame()
+        assert_that(stream.is_open, is_(True))
+
+
+@pytest.mark.asyncio
+async def test_stream_drops_oversized_frames(serial_connection):
+    _, reader, _ = serial_connection
+    reader.feed_data(FRAME_2 + FRAME_1)
+
+    async with TeleinfoStream("/dev/ttyUSB0", TeleinfoSettings(max_frame_size=len(FRAME_1))) as stream:
+        frame = await stream.read_frame()
+
+    assert_that(frame, equal_to(FRAME_1))
+    assert_that(stream.parser.resyncs, equal_to(1))
+
+
+# ── multi-port stream ───────────────────────────────────────────────────────
+
+
+@pytest_asyncio.fixture
+async def serial_connections(mocker):
+    """Patch the opening of serial ports with one reader per port (or an error)."""
+    connections = {}
+
+    async def open_serial_reader(port, settings):
+        connection = connections[port]
+        if isinstance(connection, BaseException):
+            raise connection
+        return connection, MagicMock()
+
+    mocker.patch("teleinfo.stream._open_serial_reader", new=open_serial_reader)
+    return connections
+
+
+@pytest.mark.asyncio
+async def test_multi_stream_merges_frames_of_all_ports(serial_connections):
+    for port in ("/dev/ttyUSB0", "/dev/ttyUSB1"):
+        serial_connections[port] = asyncio.StreamReader()
+        serial_connections[port].feed_data(FRAME_1 + FRAME_2)
+        serial_connections[port].feed_eof()
+    serial_connections["/dev/ttyUSB2"] = OSError("No such device")
+
+    ports = ["/dev/ttyUSB0", ("/dev/ttyUSB1", TeleinfoSettings(baudrate=9600)), "/dev/ttyUSB2"]
+    async with TeleinfoMultiStream(ports) as streams:
+        received = [item async for item in streams]
+
+    for port in ("/dev/ttyUSB0", "/dev/ttyUSB1"):
+        assert_that([frame for port_, frame in received if port_ == port], equal_to([FRAME_1, FRAME_2]))
+    assert_that(len(received), equal_to(4))
+    assert_that(streams.streams["/dev/ttyUSB1"].settings.baudrate, equal_to(9600))
+    assert_that(list(streams.errors), equal_to(["/dev/ttyUSB2"]))
+
+
+@pytest.mark.asyncio
+async def test_multi_stream_records_unexpected_error(serial_connections, mocker):
+    serial_connections["/dev/ttyUSB0"] = asyncio.StreamReader()
+    serial_connections["/dev/ttyUSB1"] = asyncio.StreamReader()
+    # The first port fails unexpectedly, the second reads a frame then reaches EOF
+    mocker.patch.object(TeleinfoStream, "read_frame", side_effect=[ValueError("boom"), FRAME_1, EOFError()])
+
+    async with TeleinfoMultiStream(["/dev/ttyUSB0", "/dev/ttyUSB1"]) as streams:
+        received = [item async for item in streams]
+
+    assert_that(received, equal_to([("/dev/ttyUSB1", FRAME_1)]))
+    assert_that(streams.errors["/dev/ttyUSB0"], instance_of(ValueError))
+
+
+@pytest.mark.asyncio
+async def test_multi_stream_keeps_reading_port_after_timeout(serial_connections):
+    reader = serial_connections["/dev/ttyUSB0"] = asyncio.StreamReader()
+
+    async with TeleinfoMultiStream(["/dev/ttyUSB0"], TeleinfoSettings(timeout=0.01)) as streams:
+        await asyncio.sleep(0.05)
+        reader.feed_data(FRAME_1)
+        port, frame = await anext(streams)
+
+    assert_that((port, frame), equal_to(("/dev/ttyUSB0", FRAME_1)))
+    assert_that(streams.errors["/dev/ttyUSB0"], instance_of(TimeoutError))